@@ -11,10 +11,31 @@ pg.setConfigOption('background', '#12131C')
 pg.setConfigOption('foreground', '#E1E4EC')
 pg.setConfigOptions(antialias=True)
 
+class LineFramer:
+    # Splits bulk reads into stripped text lines; a partial line waits in the buffer for the next chunk
+    def __init__(self, max_line=4096):
+        self.buffer = bytearray()
+        self.max_line = max_line
+
+    def feed(self, data):
+        self.buffer += data
+        end = self.buffer.rfind(b"\n")
+        if end < 0:
+            if len(self.buffer) > self.max_line:
+                del self.buffer[:]
+            return []
+        chunk = self.buffer[:end].decode('utf-8', errors='ignore')
+        del self.buffer[:end + 1]
+        return [line for line in (raw.strip() for raw in chunk.split("\n")) if line]
+
+
 class SerialReaderThread(QtCore.QThread):
-    # Signals: line_received(port_name, raw_line)
-    data_received = QtCore.pyqtSignal(str, str)
+    # Signals: lines_received(port_name, [raw_line, ...]) in batches, rate_updated(port_name, bytes/s, lines/s)
+    lines_received = QtCore.pyqtSignal(str, list)
     status_changed = QtCore.pyqtSignal(str, bool, str)
+    rate_updated = QtCore.pyqtSignal(str, float, float)
+
+    BATCH_INTERVAL_S = 0.02   # Hand lines to the GUI at most 50 times per second, whatever the $DAT rate
 
     def __init__(self, port_name, baud_rate=115200):
         super().__init__()
@@ -22,6 +43,9 @@ class SerialReaderThread(QtCore.QThread):
         self.baud_rate = baud_rate
         self.running = False
         self.ser = None
+        self.framer = LineFramer()
+        self.bytes_per_s = 0.0
+        self.lines_per_s = 0.0
 
     def stop(self):
         self.running = False
@@ -46,14 +70,29 @@ class SerialReaderThread(QtCore.QThread):
             self.running = False
             return
 
+        pending = []
+        last_emit = time.monotonic()
+        rate_start, rate_bytes, rate_lines = last_emit, 0, 0
         while self.running:
             try:
-                if self.ser.in_waiting > 0:
-                    line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        self.data_received.emit(self.port_name, line)
-                else:
-                    time.sleep(0.002) # 2ms sleep for ultra-responsive 100Hz throughput
+                # Blocks until data arrives (or the 100 ms timeout), then takes everything buffered
+                data = self.ser.read(max(1, self.ser.in_waiting))
+                if data:
+                    lines = self.framer.feed(data)
+                    pending.extend(lines)
+                    rate_bytes += len(data)
+                    rate_lines += len(lines)
+
+                now = time.monotonic()
+                if pending and (not data or now - last_emit >= self.BATCH_INTERVAL_S):
+                    self.lines_received.emit(self.port_name, pending)
+                    pending = []
+                    last_emit = now
+                if now - rate_start >= 1.0:
+                    self.bytes_per_s = rate_bytes / (now - rate_start)
+                    self.lines_per_s = rate_lines / (now - rate_start)
+                    self.rate_updated.emit(self.port_name, self.bytes_per_s, self.lines_per_s)
+                    rate_start, rate_bytes, rate_lines = now, 0, 0
             except Exception as e:
                 self.status_changed.emit(self.port_name, False, f"Read error: {e}")
                 break
@@ -344,7 +383,8 @@ class PacketLossTracerUI(QtWidgets.QMainWindow):
             if not port:
                 return
             self.thread_sender = SerialReaderThread(port)
-            self.thread_sender.data_received.connect(self.handle_serial_data)
+            self.thread_sender.lines_received.connect(self.handle_serial_lines)
+            self.thread_sender.rate_updated.connect(self.handle_rate_update)
             self.thread_sender.status_changed.connect(self.handle_status_change)
             self.thread_sender.start()
             self.btn_connect_sender.setText("Disconnect Sender")
@@ -361,7 +401,8 @@ class PacketLossTracerUI(QtWidgets.QMainWindow):
             if not port:
                 return
             self.thread_receiver = SerialReaderThread(port)
-            self.thread_receiver.data_received.connect(self.handle_serial_data)
+            self.thread_receiver.lines_received.connect(self.handle_serial_lines)
+            self.thread_receiver.rate_updated.connect(self.handle_rate_update)
             self.thread_receiver.status_changed.connect(self.handle_status_change)
             self.thread_receiver.start()
             self.btn_connect_receiver.setText("Disconnect Receiver")
@@ -406,83 +447,107 @@ class PacketLossTracerUI(QtWidgets.QMainWindow):
         cmd = f"$FREQ,{hz}\n"
         self.send_command_both(cmd)
 
-    def handle_serial_data(self, port, line):
+    def handle_rate_update(self, port, bytes_per_s, lines_per_s):
+        rate = f" | {bytes_per_s / 1024.0:.1f} kB/s, {lines_per_s:.0f} lines/s"
+        if self.thread_sender and port == self.thread_sender.port_name:
+            self.lbl_status_sender.setText(f"Sender ({port}): Online{rate}")
+        if self.thread_receiver and port == self.thread_receiver.port_name:
+            self.lbl_status_receiver.setText(f"Receiver ({port}): Online{rate}")
+
+    def handle_serial_lines(self, port, lines):
+        # Parse the whole batch into the buffers, then redraw cards and plots once
+        sender_metrics = None
+        recv_metrics = None
+        for line in lines:
+            parsed = self.parse_dat_line(line)
+            if parsed is None:
+                continue
+            if parsed[0] == "SENDER":
+                sender_metrics = parsed
+            else:
+                recv_metrics = parsed
+
+        if sender_metrics:
+            self.refresh_sender_view(*sender_metrics[1:])
+        if recv_metrics:
+            self.refresh_receiver_view(*recv_metrics[1:])
+
+    def parse_dat_line(self, line):
         # Fast parsing of $DAT lines
         if not line.startswith("$DAT,"):
-            return
+            return None
 
         parts = line.split(",")
         if len(parts) < 4:
-            return
-
-        dev_type = parts[1]
+            return None
 
         dev_type = parts[1]
 
         if dev_type == "SENDER" and len(parts) >= 5:
             # $DAT,SENDER,<seq>,<rssi>,<rtt>,<sent>,<success>,<fail>
             try:
-                seq = int(parts[2])
                 rssi = int(parts[3])
                 rtt = int(parts[4])
-                
                 sent = int(parts[5]) if len(parts) >= 6 else 0
                 success = int(parts[6]) if len(parts) >= 7 else 0
-                fail = int(parts[7]) if len(parts) >= 8 else 0
-
-                self.sample_counter10 += 1
-                self.t_data10.append(self.sample_counter10)
-                self.rssi_data10.append(rssi)
-                self.rtt_data10.append(rtt)
-
-                # Update Sender Cards
-                self.card_rssi1.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
-                self.card_rtt.findChild(QtWidgets.QLabel, "val_label").setText(f"{rtt} ms")
-
-                # Update Plots
-                self.curve_rssi1.setData(list(self.t_data10), list(self.rssi_data10))
-                self.curve_rtt.setData(list(self.t_data10), list(self.rtt_data10))
-
-                # IF RECEIVER IS DISCONNECTED (Sender Only Mode), populate metrics from Sender's Wireless Echo link!
-                if self.thread_receiver is None or not self.thread_receiver.isRunning():
-                    sender_loss = ((sent - success) / sent * 100.0) if sent > 0 else 0.0
-                    self.card_rssi2.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
-                    self.card_loss.findChild(QtWidgets.QLabel, "val_label").setText(f"{sender_loss:.2f} %")
-                    
-                    self.curve_rssi2.setData(list(self.t_data10), list(self.rssi_data10))
-                    self.curve_loss.setData(list(self.t_data10), [sender_loss] * len(self.t_data10))
-
             except ValueError:
-                pass
+                return None
+
+            self.sample_counter10 += 1
+            self.t_data10.append(self.sample_counter10)
+            self.rssi_data10.append(rssi)
+            self.rtt_data10.append(rtt)
+            return ("SENDER", rssi, rtt, sent, success)
 
         elif dev_type == "RECV" and len(parts) >= 7:
             # $DAT,RECV,<seq>,<rssi>,<received>,<lost>,<loss_rate_pct>,<corrupted>
             try:
-                seq = int(parts[2])
                 rssi = int(parts[3])
                 loss_rate = float(parts[6])
                 corrupted = int(parts[7]) if len(parts) >= 8 else 0
-
-                self.sample_counter11 += 1
-                self.t_data11.append(self.sample_counter11)
-                self.rssi_data11.append(rssi)
-                self.loss_data11.append(loss_rate)
-
-                # Update Receiver Cards
-                self.card_rssi2.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
-                self.card_loss.findChild(QtWidgets.QLabel, "val_label").setText(f"{loss_rate:.2f} %")
-                
-                if corrupted > 0:
-                    self.card_stress.findChild(QtWidgets.QLabel, "val_label").setText(f"Err: {corrupted}")
-                    self.card_stress.setStyleSheet("background-color: #391424; border-radius: 8px; border-left: 4px solid #FF0055; padding: 10px;")
-                else:
-                    self.card_stress.findChild(QtWidgets.QLabel, "val_label").setText("237B / 100Hz")
-
-                # Update Plots
-                self.curve_rssi2.setData(list(self.t_data11), list(self.rssi_data11))
-                self.curve_loss.setData(list(self.t_data11), list(self.loss_data11))
             except ValueError:
-                pass
+                return None
+
+            self.sample_counter11 += 1
+            self.t_data11.append(self.sample_counter11)
+            self.rssi_data11.append(rssi)
+            self.loss_data11.append(loss_rate)
+            return ("RECV", rssi, loss_rate, corrupted)
+
+        return None
+
+    def refresh_sender_view(self, rssi, rtt, sent, success):
+        # Update Sender Cards
+        self.card_rssi1.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
+        self.card_rtt.findChild(QtWidgets.QLabel, "val_label").setText(f"{rtt} ms")
+
+        # Update Plots
+        self.curve_rssi1.setData(list(self.t_data10), list(self.rssi_data10))
+        self.curve_rtt.setData(list(self.t_data10), list(self.rtt_data10))
+
+        # IF RECEIVER IS DISCONNECTED (Sender Only Mode), populate metrics from Sender's Wireless Echo link!
+        if self.thread_receiver is None or not self.thread_receiver.isRunning():
+            sender_loss = ((sent - success) / sent * 100.0) if sent > 0 else 0.0
+            self.card_rssi2.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
+            self.card_loss.findChild(QtWidgets.QLabel, "val_label").setText(f"{sender_loss:.2f} %")
+
+            self.curve_rssi2.setData(list(self.t_data10), list(self.rssi_data10))
+            self.curve_loss.setData(list(self.t_data10), [sender_loss] * len(self.t_data10))
+
+    def refresh_receiver_view(self, rssi, loss_rate, corrupted):
+        # Update Receiver Cards
+        self.card_rssi2.findChild(QtWidgets.QLabel, "val_label").setText(f"{rssi} dBm")
+        self.card_loss.findChild(QtWidgets.QLabel, "val_label").setText(f"{loss_rate:.2f} %")
+
+        if corrupted > 0:
+            self.card_stress.findChild(QtWidgets.QLabel, "val_label").setText(f"Err: {corrupted}")
+            self.card_stress.setStyleSheet("background-color: #391424; border-radius: 8px; border-left: 4px solid #FF0055; padding: 10px;")
+        else:
+            self.card_stress.findChild(QtWidgets.QLabel, "val_label").setText("237B / 100Hz")
+
+        # Update Plots
+        self.curve_rssi2.setData(list(self.t_data11), list(self.rssi_data11))
+        self.curve_loss.setData(list(self.t_data11), list(self.loss_data11))
 
     def apply_stylesheet(self):
         self.setStyleSheet("""
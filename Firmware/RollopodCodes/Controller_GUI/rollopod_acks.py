@@ -0,0 +1,132 @@
+"""
+Rollopod Command Acknowledgements
+Sequence numbers for host commands and the bookkeeping that matches slave ACKs to them. Round-trip latency is
+measured from the sequenced command being written to the port to its "[LEFT] ACK <seq>" being read back
+(host -> bridge -> ESP-NOW -> slave -> ESP-NOW -> bridge -> host), per board, as a fixed-bin histogram plus recent
+samples for percentiles. A command with no ACK after ACK_TIMEOUT_S counts as lost; an ACK that turns up later
+counts as late (it stays in the loss count).
+"""
+
+import bisect
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+from rollopod_protocol import SEQ_MODULO
+from rollopod_gait import percentile
+
+ACK_TIMEOUT_S = 1.0
+LATENCY_BINS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]   # Bin upper edges; one more bin catches the rest
+RTT_HISTORY = 1000
+EXPIRED_MEMORY = 1024       # Recently expired (board, seq) kept to tell late ACKs from stray ones
+
+def histogram_labels():
+    edges = [0] + LATENCY_BINS_MS
+    return [f"{lo}-{hi}ms" for lo, hi in zip(edges, edges[1:])] + [f">{LATENCY_BINS_MS[-1]}ms"]
+
+class BoardAckStats:
+    def __init__(self):
+        self.sent = 0
+        self.acked = 0
+        self.lost = 0
+        self.late = 0
+        self.histogram = [0] * (len(LATENCY_BINS_MS) + 1)
+        self.rtts = deque(maxlen=RTT_HISTORY)
+
+    def add_rtt(self, rtt_s):
+        self.histogram[bisect.bisect_left(LATENCY_BINS_MS, rtt_s * 1000.0)] += 1
+        self.rtts.append(rtt_s)
+
+    def snapshot(self, pending):
+        rtts = sorted(self.rtts)
+        resolved = self.acked + self.lost
+        return {"sent": self.sent, "acked": self.acked, "lost": self.lost, "late": self.late, "pending": pending,
+                "loss_pct": 100.0 * self.lost / resolved if resolved else 0.0,
+                "p50_ms": percentile(rtts, 50) * 1000.0, "p99_ms": percentile(rtts, 99) * 1000.0,
+                "max_ms": rtts[-1] * 1000.0 if rtts else 0.0, "histogram": list(self.histogram)}
+
+class AckTracker:
+    """
+    Thread-safe: the writer registers commands as they hit the wire (on_sent callbacks), the reader matches ACKs,
+    and any thread may read stats(). Pending entries are kept in send order so expiry only looks at the oldest.
+    """
+
+    def __init__(self, timeout_s=ACK_TIMEOUT_S):
+        self.timeout_s = timeout_s
+        self.lock = threading.Lock()
+        self.seq = random.randrange(SEQ_MODULO - 1)   # Fresh per session, so a slave never mistakes a new
+                                                      # command for a retransmission of an old one
+        self.pending = OrderedDict()     # (board, seq) -> (t_wire, cmd_str)
+        self.expired = OrderedDict()     # (board, seq) -> expiry time
+        self.boards = {"L": BoardAckStats(), "R": BoardAckStats()}
+        self.unmatched = 0
+
+    def next_seq(self):
+        with self.lock:
+            self.seq = self.seq % (SEQ_MODULO - 1) + 1   # 1..65535, 0 is "not sequenced"
+            return self.seq
+
+    def sent_callback(self, seq, boards, cmd_str, on_sent=None):
+        """on_sent for the TX queue: starts the ACK clock when the command reaches the port, then chains on_sent."""
+        def sent(t_wire):
+            self.sent(seq, boards, cmd_str, t_wire)
+            if on_sent:
+                on_sent(t_wire)
+        return sent
+
+    def sent(self, seq, boards, cmd_str, t_wire):
+        with self.lock:
+            for board in boards:
+                self.pending[(board, seq)] = (t_wire, cmd_str)
+                self.boards[board].sent += 1
+
+    def on_ack(self, board, seq, t_rx=None):
+        """Matches one ACK. Returns its round-trip time in seconds, or None if it matched nothing pending."""
+        t_rx = time.monotonic() if t_rx is None else t_rx
+        key = (board, seq)
+        with self.lock:
+            entry = self.pending.pop(key, None)
+            if entry is None:
+                if self.expired.pop(key, None) is not None:
+                    self.boards[board].late += 1
+                else:
+                    self.unmatched += 1
+                return None
+            rtt = t_rx - entry[0]
+            stats = self.boards[board]
+            stats.acked += 1
+            stats.add_rtt(rtt)
+            return rtt
+
+    def expire(self, now=None):
+        """Moves commands unacknowledged for timeout_s into the loss counts. Returns the (board, seq, cmd) expired."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self.lock:
+            while self.pending:
+                key, (t_wire, cmd_str) = next(iter(self.pending.items()))
+                if now - t_wire < self.timeout_s:
+                    break
+                del self.pending[key]
+                self.boards[key[0]].lost += 1
+                self.expired[key] = now
+                expired.append((key[0], key[1], cmd_str))
+            while len(self.expired) > EXPIRED_MEMORY:
+                self.expired.popitem(last=False)
+        return expired
+
+    def stats(self):
+        """Per-board dict: sent, acked, lost, late, pending, loss_pct, p50/p99/max RTT (ms) and histogram counts."""
+        with self.lock:
+            pending = {board: 0 for board in self.boards}
+            for board, _ in self.pending:
+                pending[board] += 1
+            return {board: stats.snapshot(pending[board]) for board, stats in self.boards.items()}
+
+    def reset(self):
+        with self.lock:
+            self.pending.clear()
+            self.expired.clear()
+            self.boards = {"L": BoardAckStats(), "R": BoardAckStats()}
+            self.unmatched = 0
@@ -0,0 +1,359 @@
+"""
+Rollopod End-to-End Benchmark
+Drives the headless control core (rollopod_core.AsyncRollopod) against the bridge emulator or a real bridge and
+measures what the command path sustains: servo updates per second, submit cost, enqueue-to-wire latency,
+command round trip, loop jitter and host CPU for pose bursts, 50 / 100 / 200 Hz gait streams, slider-rate
+coalesced streams and a gait under telemetry load. Results are written as JSON so runs can be compared.
+
+    python rollopod_bench.py                                  # spawns rollopod_emulator.py on a pty
+    python rollopod_bench.py --port /dev/ttyUSB0              # real master bridge
+    python rollopod_bench.py --compare bench_results/old.json # print deltas against an earlier run
+
+Round trip uses a tag channel: every submission moves L CH 15 to a new whole-degree angle, and the slave's
+"OK: Ch 15 set to <n> deg" reply is matched back in order. The emulator runs in its own process, so the CPU
+figure is the host side only (asyncio loop, formatting, framing, reading). updates/s counts what the port accepted
+(OS buffering included); round trip is what actually reached a slave and came back, so at 115200 baud it also
+shows the slaves' per-ANGLE replies backing up the return path.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter, deque
+
+from rollopod_core import AsyncRollopod
+from rollopod_gait import percentile
+from rollopod_protocol import PROTOCOL_TEXT
+from rollopod_tx import PriorityTxQueue, PRIORITY_MOTION
+
+TAG_BOARD, TAG_CHANNEL = 'L', 15
+TAG_REPLY_PREFIX = f"[LEFT] OK: Ch {TAG_CHANNEL} set to "
+GAIT_CHANNELS = [(board, ch) for board in ('L', 'R') for ch in range(9)]    # 6 legs x 3 joints
+POSE_CHANNELS = [(board, ch) for board in ('L', 'R') for ch in range(16)]
+SCENARIOS = ["pose_burst", "gait_50hz", "gait_100hz", "gait_200hz", "slider_1khz", "gait_100hz_telemetry"]
+SETTLE_QUIET_S = 0.3
+SETTLE_MAX_S = 60.0      # At 115200 baud the per-ANGLE replies of a burst can take many seconds to drain
+REPLY_WAIT_S = 2.0
+LATENCY_HISTORY = 200000
+
+def summarize(values, scale=1.0):
+    """Mean / p50 / p95 / p99 / max of a sample list, scaled (e.g. 1000 for s -> ms)."""
+    values = sorted(v * scale for v in values)
+    if not values:
+        return {"n": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {"n": len(values), "mean": round(sum(values) / len(values), 4),
+            "p50": round(percentile(values, 50), 4), "p95": round(percentile(values, 95), 4),
+            "p99": round(percentile(values, 99), 4), "max": round(values[-1], 4)}
+
+class RoundTripTracker:
+    """Matches tag-channel ANGLE replies to the submission that carried the tag. Replies arrive in order."""
+
+    def __init__(self):
+        self.pending = deque()   # (tag, submit time)
+        self.counts = Counter()
+        self.samples = []
+        self.unmatched = 0       # Superseded (coalesced / filtered) or lost before the slave replied
+
+    def submitted(self, tag, t):
+        self.pending.append((tag, t))
+        self.counts[tag] += 1
+
+    def reply(self, tag, t):
+        if not self.counts[tag]:
+            return
+        while self.pending:
+            pending_tag, t_submit = self.pending.popleft()
+            self.counts[pending_tag] -= 1
+            if pending_tag == tag:
+                self.samples.append(t - t_submit)
+                return
+            self.unmatched += 1
+
+    def finish(self):
+        self.unmatched += len(self.pending)
+        self.pending.clear()
+        self.counts.clear()
+
+class BenchGait:
+    """Sine sweep over the 18 leg servos plus the tag channel. Times every tick and every send call."""
+
+    def __init__(self, bench, frequency=1.0, amplitude=30.0):
+        self.bench = bench
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.t = 0.0
+        self.tick_times = []
+
+    def reset(self):
+        self.t = 0.0
+        self.tick_times = []
+
+    def tick(self, dt, send_fn):
+        self.tick_times.append(time.monotonic())
+        self.t += dt
+        w = 2.0 * math.pi * self.frequency * self.t
+        pairs = [(board, ch, 90.0 + self.amplitude * math.sin(w + 0.35 * i)) for i, (board, ch) in enumerate(GAIT_CHANNELS)]
+        self.bench.submit(pairs, send_fn)
+        return {}
+
+    def jitter(self, period_s):
+        intervals = [b - a for a, b in zip(self.tick_times, self.tick_times[1:])]
+        stats = summarize([abs(i - period_s) for i in intervals], 1000.0)
+        span = self.tick_times[-1] - self.tick_times[0] if len(self.tick_times) > 1 else 0.0
+        return {"tick_rate_hz": round(len(intervals) / span, 2) if span else 0.0, "jitter_ms": stats}
+
+class Bench:
+    def __init__(self, bot, args):
+        self.bot = bot
+        self.args = args
+        self.tags = 0
+        self.submit_costs = []
+        self.submitted_updates = 0
+        self.round_trip = RoundTripTracker()
+        self.rx_lines = 0
+        self.telemetry_lines = 0
+        self.last_rx = time.monotonic()
+        bot.on_line = self.on_line
+
+    def on_line(self, line):
+        now = time.monotonic()
+        self.last_rx = now
+        self.rx_lines += 1
+        if line.startswith(TAG_REPLY_PREFIX):
+            self.round_trip.reply(int(line[len(TAG_REPLY_PREFIX):].split()[0]), now)
+        elif "MPU_DATA" in line:
+            self.telemetry_lines += 1
+
+    def next_tag(self):
+        self.tags += 1
+        return self.tags % 181
+
+    def submit(self, pairs, send_fn):
+        """Sends one batch with the tag channel appended, timing the call and registering the tag."""
+        tag = self.next_tag()
+        t0 = time.monotonic()
+        self.round_trip.submitted(tag, t0)
+        send_fn(pairs + [(TAG_BOARD, TAG_CHANNEL, float(tag))])
+        self.submit_costs.append(time.monotonic() - t0)
+        self.submitted_updates += len(pairs) + 1
+
+    async def settle(self):
+        # Let the previous scenario's replies drain so they don't count against the next one
+        await self.bot.drain(10.0)
+        start = time.monotonic()
+        while time.monotonic() - self.last_rx < SETTLE_QUIET_S and time.monotonic() - start < SETTLE_MAX_S:
+            await asyncio.sleep(0.05)
+        return time.monotonic() - start
+
+    def reset(self):
+        self.submit_costs = []
+        self.submitted_updates = 0
+        self.round_trip = RoundTripTracker()
+        self.rx_lines = 0
+        self.telemetry_lines = 0
+        self.bot.tx_queue.latencies[PRIORITY_MOTION].clear()
+        self.bot.coalescer.sent_count = self.bot.coalescer.dropped_count = 0
+
+    # ---------------------------------------------------------------------------
+    # SCENARIOS
+    # ---------------------------------------------------------------------------
+    async def pose_burst(self):
+        # Full 32-channel poses back to back, alternating between two poses so nothing is filtered
+        for i in range(self.args.poses):
+            offset = 20.0 if i % 2 else -20.0
+            pairs = [(board, ch, 90.0 + offset) for board, ch in POSE_CHANNELS if (board, ch) != (TAG_BOARD, TAG_CHANNEL)]
+            self.submit(pairs, self.bot.send_angle_batch)
+        return {"poses": self.args.poses}
+
+    async def gait(self, rate_hz):
+        gait = BenchGait(self)
+        await self.bot.run_gait(gait, 1.0 / rate_hz, self.args.duration)
+        return gait.jitter(1.0 / rate_hz)
+
+    async def slider(self, event_hz=1000.0):
+        # Slider-rate events into the coalescer; only the newest value per channel goes out at the flush rate
+        period = 1.0 / event_hz
+        events = 0
+        end = time.monotonic() + self.args.duration
+        while time.monotonic() < end:
+            tag = self.next_tag()
+            t0 = time.monotonic()
+            self.round_trip.submitted(tag, t0)
+            self.bot.queue_angle(TAG_BOARD, TAG_CHANNEL, float(tag))
+            self.submit_costs.append(time.monotonic() - t0)
+            self.submitted_updates += 1
+            events += 1
+            await asyncio.sleep(period)
+        return {"slider_events": events, "coalesced_away": self.bot.coalescer.dropped_count}
+
+    async def gait_with_telemetry(self, rate_hz):
+        self.bot.send_command("B TELEMETRY 1")
+        try:
+            return await self.gait(rate_hz)
+        finally:
+            self.bot.send_command("B TELEMETRY 0")
+
+    async def run(self, name):
+        runners = {
+            "pose_burst": self.pose_burst,
+            "gait_50hz": lambda: self.gait(50),
+            "gait_100hz": lambda: self.gait(100),
+            "gait_200hz": lambda: self.gait(200),
+            "slider_1khz": self.slider,
+            "gait_100hz_telemetry": lambda: self.gait_with_telemetry(100),
+        }
+        settle_s = await self.settle()
+        self.reset()
+        tx0_bytes, tx0_writes = self.bot.tx_rate.total_bytes, self.bot.tx_rate.total_lines
+        cpu0, t0 = time.process_time(), time.monotonic()
+        extra = await runners[name]()
+        submit_done = time.monotonic()
+        await self.bot.drain(30.0)
+        wire_done = time.monotonic()
+        deadline = wire_done + REPLY_WAIT_S
+        while self.round_trip.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        cpu = time.process_time() - cpu0
+        wall = time.monotonic() - t0
+        self.round_trip.finish()
+
+        wire_s = max(1e-9, wire_done - t0)
+        wire_bytes = self.bot.tx_rate.total_bytes - tx0_bytes
+        result = {
+            "submit_s": round(submit_done - t0, 4),
+            "wire_s": round(wire_s, 4),
+            "updates": self.submitted_updates,
+            "updates_per_s": round(self.submitted_updates / wire_s, 1),
+            "writes": self.bot.tx_rate.total_lines - tx0_writes,
+            "wire_bytes": wire_bytes,
+            "wire_bytes_per_s": round(wire_bytes / wire_s, 1),
+            "submit_us": summarize(self.submit_costs, 1e6),
+            "queue_ms": summarize(self.bot.tx_queue.latencies[PRIORITY_MOTION], 1000.0),
+            "round_trip_ms": summarize(self.round_trip.samples, 1000.0),
+            "round_trip_unmatched": self.round_trip.unmatched,
+            "rx_lines_per_s": round(self.rx_lines / wall, 1),
+            "telemetry_per_s": round(self.telemetry_lines / wall, 1),
+            "cpu_pct": round(100.0 * cpu / wall, 1),
+            "settle_before_s": round(settle_s, 2),
+        }
+        result.update(extra or {})
+        return result
+
+# -------------------------------------------------------------------------------
+# EMULATOR PROCESS, REPORTING & CLI
+# -------------------------------------------------------------------------------
+def start_emulator(args):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rollopod_emulator.py")
+    cmd = [sys.executable, "-u", script, "--baud", str(args.baud), "--telemetry-hz", str(args.telemetry_hz),
+           "--seed", "1", "--loss", str(args.loss)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    banner = proc.stdout.readline()
+    if " on " not in banner:
+        proc.kill()
+        raise RuntimeError(f"Emulator did not start: {banner.strip()}")
+    return proc, banner.split(" on ", 1)[1].split()[0]
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+async def run_bench(args, port):
+    bot = AsyncRollopod(port, args.baud or 115200, flush_hz=args.flush_hz)
+    bot.tx_queue = PriorityTxQueue(history=LATENCY_HISTORY)
+    bot.deadband.set_deadband(args.deadband)
+    async with bot:
+        if args.text:
+            bot.protocol = PROTOCOL_TEXT
+        bench = Bench(bot, args)
+        results = {}
+        for name in args.scenarios:
+            print(f"[BENCH] {name} ...", flush=True)
+            results[name] = await bench.run(name)
+            r = results[name]
+            print(f"[BENCH] {name}: {r['updates_per_s']:.0f} updates/s, queue p99 {r['queue_ms']['p99']:.2f} ms, "
+                  f"round trip p50/p99 {r['round_trip_ms']['p50']:.1f}/{r['round_trip_ms']['p99']:.1f} ms, "
+                  f"CPU {r['cpu_pct']:.0f}%", flush=True)
+        protocol = bot.protocol
+        bot.stop_motors()
+        await bot.drain()
+    return protocol, results
+
+COMPARE_KEYS = [("updates_per_s", None), ("queue_ms", "p99"), ("round_trip_ms", "p50"), ("round_trip_ms", "p99"),
+                ("cpu_pct", None)]
+
+def compare(baseline, current):
+    lines = []
+    for name, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for key, sub in COMPARE_KEYS:
+            a = old[key][sub] if sub else old[key]
+            b = result[key][sub] if sub else result[key]
+            change = f"{100.0 * (b - a) / a:+.1f}%" if a else "n/a"
+            label = f"{key}.{sub}" if sub else key
+            lines.append(f"{name:<22} {label:<18} {a:>10.2f} -> {b:>10.2f}  {change}")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end command throughput and latency benchmark")
+    parser.add_argument("--port", default=None, help="Benchmark a real bridge on this port instead of the emulator")
+    parser.add_argument("--baud", type=int, default=115200, help="Baud rate (emulator: UART model, 0 = unlimited)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per streaming scenario")
+    parser.add_argument("--poses", type=int, default=50, help="Poses in the burst scenario")
+    parser.add_argument("--telemetry-hz", type=float, default=50.0, help="Emulator MPU_DATA rate per slave")
+    parser.add_argument("--loss", type=float, default=0.0, help="Emulator ESP-NOW loss probability")
+    parser.add_argument("--flush-hz", type=float, default=100.0, help="Coalescer flush rate for the slider scenario")
+    parser.add_argument("--deadband", type=float, default=0.0, help="Servo deadband in degrees (0 = send everything)")
+    parser.add_argument("--text", action="store_true", help="Force the text protocol instead of binary frames")
+    parser.add_argument("--output", default=None, help="JSON results path (default bench_results/bench-<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to print deltas against")
+    args = parser.parse_args()
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    proc = None
+    port = args.port
+    if port is None:
+        proc, port = start_emulator(args)
+    started = time.strftime("%Y-%m-%dT%H:%M:%S")
+    try:
+        protocol, scenarios = asyncio.run(run_bench(args, port))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(5)
+
+    report = {
+        "meta": {"started": started, "revision": git_revision(), "python": platform.python_version(),
+                 "platform": platform.platform(), "target": "emulator" if proc else port, "baud": args.baud,
+                 "protocol": protocol, "deadband_deg": args.deadband, "flush_hz": args.flush_hz,
+                 "duration_s": args.duration, "telemetry_hz": args.telemetry_hz, "loss": args.loss},
+        "scenarios": scenarios,
+    }
+    output = args.output or os.path.join("bench_results", f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(baseline, report)))
+
+if __name__ == "__main__":
+    main()
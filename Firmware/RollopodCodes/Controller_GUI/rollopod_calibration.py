@@ -0,0 +1,139 @@
+"""
+Rollopod Host-Side Servo Calibration
+Per-channel angle -> PCA9685 tick lookup tables built from settings.json, so streams can send
+pre-resolved TICK values instead of degrees the slaves must convert with float math.
+
+settings.json layout ("channels" applies to both boards; "boards" holds optional per-board overrides):
+
+    {
+      "frequency": 50,
+      "channels": {"0": {"tick_min": 102, "tick_max": 512}, ...},
+      "boards": {"R": {"3": {"tick_min": 110, "tick_max": 500,
+                             "points": [[0, 110], [90, 298], [180, 500]]}}}
+    }
+
+"points" is an optional multi-point [angle, tick] curve, interpolated piecewise-linearly;
+without it a channel maps linearly from tick_min (0°) to tick_max (180°), exactly like the slave firmware.
+"""
+
+import json
+import os
+
+import numpy as np
+
+TICK_MIN_DEFAULT = 102   # ~500 us at 50 Hz, matches the slave firmware
+TICK_MAX_DEFAULT = 512   # ~2500 us at 50 Hz
+LUT_STEPS_PER_DEG = 10   # 0.1° resolution, same as the binary ANGLE_BATCH frame
+LUT_SIZE = 180 * LUT_STEPS_PER_DEG + 1
+BOARDS = ('L', 'R')
+
+def parse_points(text):
+    """Parse "angle:tick, ..." (e.g. "0:102, 90:300, 180:512") into [[angle, tick], ...]."""
+    points = []
+    for term in text.replace(";", ",").split(","):
+        term = term.strip()
+        if not term:
+            continue
+        fields = term.split(":")
+        if len(fields) != 2:
+            raise ValueError(f"Calibration point '{term}' must be angle:tick")
+        angle, tick = float(fields[0]), int(fields[1])
+        if not 0.0 <= angle <= 180.0 or not 0 <= tick <= 4095:
+            raise ValueError(f"Calibration point '{term}' out of range (0-180°, 0-4095 ticks)")
+        points.append([angle, tick])
+    if points and len(points) < 2:
+        raise ValueError("A calibration curve needs at least two points")
+    return sorted(points)
+
+def format_points(points):
+    return ", ".join(f"{a:g}:{t}" for a, t in points or [])
+
+def build_lut(tick_min, tick_max, points=None):
+    """Tick for every 0.1° from 0° to 180° (uint16 array of LUT_SIZE entries)."""
+    angles = np.arange(LUT_SIZE) / LUT_STEPS_PER_DEG
+    if points:
+        xs = np.array([p[0] for p in points], dtype=np.float64)
+        ys = np.array([p[1] for p in points], dtype=np.float64)
+        lo, hi = ys.min(), ys.max()
+    else:
+        xs = np.array([0.0, 180.0])
+        ys = np.array([tick_min, tick_max], dtype=np.float64)
+        lo, hi = min(tick_min, tick_max), max(tick_min, tick_max)
+    ticks = np.floor(np.interp(angles, xs, ys) + 0.5)
+    return np.clip(ticks, lo, hi).astype(np.uint16)
+
+class CalibrationTable:
+    def __init__(self, frequency=50):
+        self.frequency = frequency
+        self.shared = {}     # channel -> {"tick_min", "tick_max"[, "points"]} from "channels"
+        self.entries = {}    # (board, channel) -> effective entry
+        self.luts = {}       # (board, channel) -> uint16 LUT
+        for board in BOARDS:
+            for channel in range(16):
+                self.set_channel(board, channel, TICK_MIN_DEFAULT, TICK_MAX_DEFAULT)
+
+    def set_channel(self, board, channel, tick_min=None, tick_max=None, points=None):
+        """Update one channel and rebuild only its table. points=[] clears a multi-point curve."""
+        key = (board, channel)
+        entry = dict(self.entries.get(key, {"tick_min": TICK_MIN_DEFAULT, "tick_max": TICK_MAX_DEFAULT}))
+        if tick_min is not None:
+            entry["tick_min"] = int(tick_min)
+        if tick_max is not None:
+            entry["tick_max"] = int(tick_max)
+        if points is not None:
+            if points:
+                entry["points"] = [list(p) for p in points]
+            else:
+                entry.pop("points", None)
+        self.entries[key] = entry
+        self.luts[key] = build_lut(entry["tick_min"], entry["tick_max"], entry.get("points"))
+
+    def angle_to_tick(self, board, channel, angle):
+        lut = self.luts[(board, channel)]
+        idx = int(angle * LUT_STEPS_PER_DEG + 0.5)
+        return int(lut[min(LUT_SIZE - 1, max(0, idx))])
+
+    def to_ticks(self, pairs):
+        """[(board, channel, angle), ...] -> [(board, channel, tick), ...] by table lookup."""
+        return [(board, channel, self.angle_to_tick(board, channel, angle)) for board, channel, angle in pairs]
+
+    # ---------------------------------------------------------------------------
+    # settings.json
+    # ---------------------------------------------------------------------------
+    @classmethod
+    def from_settings(cls, data):
+        table = cls(int(data.get("frequency", 50)))
+        for ch_str, entry in data.get("channels", {}).items():
+            table.shared[int(ch_str)] = dict(entry)
+            for board in BOARDS:
+                table.set_channel(board, int(ch_str), entry.get("tick_min"), entry.get("tick_max"), entry.get("points"))
+        for board, channels in data.get("boards", {}).items():
+            if board not in BOARDS:
+                continue
+            for ch_str, entry in channels.items():
+                table.set_channel(board, int(ch_str), entry.get("tick_min"), entry.get("tick_max"), entry.get("points"))
+        return table
+
+    def to_settings(self):
+        # Shared "channels" stay as loaded; anything that differs per board goes under "boards"
+        data = {"frequency": self.frequency,
+                "channels": {str(ch): entry for ch, entry in sorted(self.shared.items())}}
+        boards = {}
+        for (board, channel), entry in sorted(self.entries.items()):
+            base = self.shared.get(channel, {"tick_min": TICK_MIN_DEFAULT, "tick_max": TICK_MAX_DEFAULT})
+            if entry != base:
+                boards.setdefault(board, {})[str(channel)] = entry
+        if boards:
+            data["boards"] = boards
+        return data
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_settings(json.load(f))
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_settings(), f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,68 @@
+"""
+Rollopod Console Buffer
+Bounded line buffer between serial traffic and the log widget: lines are filtered on arrival and handed to
+the widget in one batch per display tick, so console cost no longer scales with the command / telemetry rate.
+"""
+
+import threading
+from collections import deque
+
+KIND_SYSTEM = "system"
+KIND_RX = "rx"
+KIND_TX = "tx"
+KIND_TELEMETRY = "telemetry"
+
+DEFAULT_CONSOLE_LINES = 200
+DEFAULT_CONSOLE_FLUSH_MS = 50
+
+def classify_line(text):
+    if text.startswith("> "):
+        return KIND_TX
+    if "MPU_DATA" in text:
+        return KIND_TELEMETRY
+    if text.startswith("["):
+        return KIND_SYSTEM
+    return KIND_RX
+
+class ConsoleBuffer:
+    """Thread-safe ring of pending console lines. Anything older than `capacity` lines is dropped unseen."""
+
+    def __init__(self, capacity=DEFAULT_CONSOLE_LINES):
+        self.lock = threading.Lock()
+        self.lines = deque(maxlen=capacity)
+        self.hidden_kinds = set()
+        self.appended = 0
+        self.filtered = 0
+        self.overflowed = 0
+
+    def set_visible(self, kind, visible):
+        if visible:
+            self.hidden_kinds.discard(kind)
+        else:
+            self.hidden_kinds.add(kind)
+
+    def accepts(self, kind):
+        return kind not in self.hidden_kinds
+
+    def append(self, text, kind=None):
+        kind = kind or classify_line(text)
+        if kind in self.hidden_kinds:
+            self.filtered += 1
+            return
+        with self.lock:
+            if len(self.lines) == self.lines.maxlen:
+                self.overflowed += 1
+            self.lines.append(text)
+            self.appended += 1
+
+    def drain(self):
+        with self.lock:
+            if not self.lines:
+                return []
+            lines = list(self.lines)
+            self.lines.clear()
+        return lines
+
+    def clear(self):
+        with self.lock:
+            self.lines.clear()
@@ -0,0 +1,674 @@
+"""
+Rollopod Headless Control Core
+Qt-free bridge pipeline shared by the GUI and scripts, plus an asyncio controller for driving the robot
+without a GUI (batch scripts, tests, the voice brain).
+
+    BridgeLink      command formatting, coalescing, deadband, priority queue, line framing, protocol
+                    handshake, telemetry decoding, command ACK tracking, reliable delivery of stops and final
+                    poses, link-adaptive streaming rate, gait table chunks; knows nothing about how bytes
+                    reach the port
+    AsyncRollopod   BridgeLink on an asyncio serial transport: poses, gaits, motors, telemetry streams,
+                    gait tables uploaded to and played on the slaves
+
+    async with AsyncRollopod("/dev/ttyUSB0", 921600) as bot:
+        await bot.move_to({("L", 0): 90.0, ("R", 0): 90.0}, duration_s=1.0)
+        bot.set_motors(120)
+        async for sample in bot.stream_telemetry("L"):
+            ...
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import serial
+
+from rollopod_protocol import (
+    PROTO_QUERY, PROTOCOL_TEXT, PROTOCOL_BINARY, FRAME_MAX_PAIRS, TICK_BATCH_MIN_VERSION, SEQ_MIN_VERSION,
+    RELIABLE_MIN_VERSION, GAIT_TABLE_MIN_VERSION, FRAME_TYPE_SEQ_ANGLE_BATCH, FRAME_TYPE_SEQ_TICK_BATCH,
+    encode_angle_batch, encode_tick_batch, encode_seq_angle_batch, encode_seq_tick_batch, encode_table_chunk,
+    format_angle_batch_text, format_tick_batch_text, format_angle_command, format_seq_command,
+    command_boards, esp_now_packets, parse_proto_reply, parse_ack_line, LINK_FAIL_PREFIX
+)
+from rollopod_tx import (
+    CommandCoalescer, PriorityTxQueue, DeadbandFilter, classify_command, DEFAULT_FLUSH_HZ,
+    PRIORITY_SAFETY, PRIORITY_CONTROL, PRIORITY_MOTION
+)
+from rollopod_reliable import ReliableSender, command_key, servo_key
+from rollopod_linkrate import LinkRateController
+from rollopod_serial import LineFramer, RateCounter, SERIAL_READ_TIMEOUT_S
+from rollopod_telemetry import TelemetryHistory
+from rollopod_acks import AckTracker
+from rollopod_gait import WaddleGait
+from rollopod_pose import PoseTransition
+from rollopod_stabilizer import PitchStabilizer, StabilizedGait
+from rollopod_gaittable import GaitUpload
+
+STOP_COMMAND = "B MOTOR 0"
+TELEMETRY_QUEUE_SIZE = 1024
+FAILED_DELIVERY_HISTORY = 100
+
+SEQ_BATCH_ENCODERS = {FRAME_TYPE_SEQ_ANGLE_BATCH: encode_seq_angle_batch,
+                      FRAME_TYPE_SEQ_TICK_BATCH: encode_seq_tick_batch}
+
+def resolve_motor_speeds(left=None, right=None, invert_left=False, invert_right=False):
+    """
+    Raw slider / API speeds -> [(board, wire speed), ...] after direction inversion.
+    Equal speeds on both sides collapse into one "B" command; None leaves that side alone.
+    """
+    eff_l = None if left is None else (-left if invert_left else left)
+    eff_r = None if right is None else (-right if invert_right else right)
+    if eff_l is not None and eff_r is not None:
+        return [('B', eff_l)] if eff_l == eff_r else [('L', eff_l), ('R', eff_r)]
+    if eff_l is not None:
+        return [('L', eff_l)]
+    if eff_r is not None:
+        return [('R', eff_r)]
+    return []
+
+# -------------------------------------------------------------------------------
+# BRIDGE LINK (Transport-Independent Command & Receive Pipeline)
+# -------------------------------------------------------------------------------
+class BridgeLink:
+    """
+    Everything between "set this servo" and bytes on the wire, and between received bytes and decoded lines.
+    A transport calls feed() with received bytes and pump_tx() to write; subclasses override the on_* hooks.
+    """
+
+    def __init__(self, flush_hz=DEFAULT_FLUSH_HZ):
+        self.flush_hz = flush_hz        # Configured coalescer rate; the ceiling when adaptive_rate is on
+        self.protocol = PROTOCOL_TEXT  # Upgraded to binary frames if the bridge answers the handshake
+        self.protocol_version = 0
+        self.calibration = None        # CalibrationTable: angle -> tick lookups when send_ticks is on
+        self.send_ticks = False
+        self.coalescer = CommandCoalescer(flush_hz)
+        self.recorder = None           # CommandRecorder: logs every command sent
+        self.telemetry = TelemetryHistory()
+        self.console = None            # ConsoleBuffer: received lines go straight into it when set
+        self.framer = LineFramer()
+        self.rx_rate = RateCounter()
+        self.tx_rate = RateCounter()   # Bytes and writes that actually reached the port
+        self.tx_queue = PriorityTxQueue()
+        self.deadband = DeadbandFilter()
+        self.commanded = {}            # (board, channel) -> last angle requested through send_angle_batch
+        self.telemetry_callbacks = []  # fn(sample), called in the reader's context as each sample is decoded
+        self.line_callbacks = []       # fn(line) for every non-ACK line, same context (gait uploads watch these)
+        self.sequence_commands = False # Prefix L/R/B text commands with "#<seq>" (bridge v3+) and track ACKs
+        self.acks = AckTracker()
+        self.reliable_delivery = True  # Retransmit stops and final poses until ACKed (bridge v4+)
+        self.reliable = ReliableSender()
+        self.link_rate = LinkRateController(max_hz=flush_hz)
+        self.adaptive_rate = False     # Let link_rate throttle the coalescer and gait loops
+        self.telemetry_callbacks.append(self.link_rate.on_sample)
+
+    # Hooks for the transport / front end
+    def on_line(self, line):
+        pass
+
+    def on_protocol(self, protocol, version):
+        pass
+
+    def on_telemetry(self, sample):
+        pass
+
+    def on_delivery_failed(self, entry):
+        print(entry.describe())
+
+    def notify_writer(self):
+        self.tx_queue.wake()
+
+    # ---------------------------------------------------------------------------
+    # TRANSMIT
+    # ---------------------------------------------------------------------------
+    def write_bytes(self, data, priority=PRIORITY_MOTION, on_sent=None):
+        # Every write from any thread goes through the queue; only the transport's writer touches the port
+        self.tx_queue.put(data, priority, on_sent)
+
+    def reliable_active(self):
+        return self.reliable_delivery and self.protocol_version >= RELIABLE_MIN_VERSION
+
+    def send_command(self, cmd_str, priority=None, on_sent=None, reliable=None, stop=False):
+        """
+        Queues one text command. stop=True marks an explicit stop (motor stop button, end of a gait): it goes
+        out safety class, drops servo frames not yet sent, and reliable=None makes it reliable, re-sent under
+        the same seq until every addressed board ACKs. Anything else is fire-and-forget unless reliable=True.
+        Returns the [(board, seq), ...] a reliable send is tracked under (empty otherwise).
+        """
+        if self.recorder:
+            self.recorder.record(cmd_str)
+        if priority is None:
+            priority = PRIORITY_SAFETY if stop else classify_command(cmd_str)
+        if priority == PRIORITY_SAFETY:
+            # Safety-class commands also discard motion that has not reached the queue yet
+            self.coalescer.clear()
+        if stop and self.reliable.pending:
+            self.reliable.drop_unsent()
+        boards = command_boards(cmd_str)
+        body = cmd_str.strip()[2:].strip()
+        if reliable is None:
+            reliable = stop
+        refs = []
+        if boards and reliable and self.reliable_active():
+            seq = self.acks.next_seq()
+            self.reliable.track_text(seq, boards, body)
+            refs = [(board, seq) for board in boards]
+            on_sent = self.reliable_sent_callback(refs, on_sent)
+            cmd_str = format_seq_command(seq, cmd_str)
+        else:
+            if boards and self.reliable.pending:
+                # A newer command for the same motor / servo makes an unacknowledged older one moot
+                self.reliable.supersede([command_key(board, body) for board in boards])
+            if boards and self.sequence_commands and self.protocol_version >= SEQ_MIN_VERSION:
+                # Registered when it reaches the port, so commands flushed from the queue never count as lost
+                seq = self.acks.next_seq()
+                on_sent = self.acks.sent_callback(seq, boards, cmd_str.strip(), on_sent)
+                cmd_str = format_seq_command(seq, cmd_str)
+        if not cmd_str.endswith('\n'):
+            cmd_str += '\n'
+        self.write_bytes(cmd_str.encode('utf-8'), priority, on_sent)
+        return refs
+
+    def reliable_sent_callback(self, refs, on_sent=None):
+        # Starts the retransmit clocks when the first copy reaches the port
+        def sent(t_wire):
+            self.reliable.sent(refs, t_wire)
+            if on_sent:
+                on_sent(t_wire)
+        return sent
+
+    def wire_bytes_per_pair(self, pair):
+        if self.protocol == PROTOCOL_BINARY:
+            return 3
+        return len(format_angle_command(*pair)) + 1
+
+    def send_angle_batch(self, pairs, refresh=False, reliable=False):
+        """
+        Whole pose in one binary frame per 32 channels, or one text line per servo as fallback. reliable=True
+        (final frames of poses) bypasses the deadband and, on v4+ bridges, sends every channel under its own seq
+        until ACKed.
+        """
+        pairs = list(pairs)
+        if not refresh:
+            for board, channel, angle in pairs:
+                self.commanded[(board, channel)] = angle
+        if self.recorder and self.recorder.active and not refresh:
+            now = time.monotonic()
+            for board, channel, angle in pairs:
+                self.recorder.record(f"{board} ANGLE {channel} {angle:.1f}", now)
+        if reliable and self.reliable_active() and self.protocol == PROTOCOL_BINARY:
+            self.deadband.accept(pairs, self.wire_bytes_per_pair)
+            self.send_reliable_batch(pairs)
+            return
+        if self.reliable.pending and not refresh:
+            self.reliable.supersede([servo_key(board, channel) for board, channel, _ in pairs])
+        if refresh:
+            self.deadband.account_refresh(sum(self.wire_bytes_per_pair(p) for p in pairs))
+        elif reliable:
+            # No ACKs from this bridge: at least make sure the final frame is not swallowed by the deadband
+            self.deadband.accept(pairs, self.wire_bytes_per_pair)
+        else:
+            # Channels that moved less than the deadband since their last send are skipped
+            pairs = self.deadband.filter(pairs, self.wire_bytes_per_pair)
+            if not pairs:
+                return
+        if self.send_ticks and self.calibration:
+            self.send_tick_batch(self.calibration.to_ticks(pairs))
+            return
+        if self.protocol == PROTOCOL_BINARY:
+            for i in range(0, len(pairs), FRAME_MAX_PAIRS):
+                self.write_bytes(encode_angle_batch(pairs[i:i + FRAME_MAX_PAIRS]))
+        else:
+            lines = format_angle_batch_text(pairs)
+            if lines:
+                self.write_bytes(("\n".join(lines) + "\n").encode('utf-8'))
+
+    def send_reliable_batch(self, pairs):
+        if self.send_ticks and self.calibration:
+            frame_type, entries = FRAME_TYPE_SEQ_TICK_BATCH, self.calibration.to_ticks(pairs)
+        else:
+            frame_type, entries = FRAME_TYPE_SEQ_ANGLE_BATCH, pairs
+        quads = [(board, channel, value, self.acks.next_seq()) for board, channel, value in entries]
+        self.reliable.track_quads(frame_type, quads)
+        self.write_seq_batch(frame_type, quads, PRIORITY_MOTION, on_sent=True)
+
+    def write_seq_batch(self, frame_type, quads, priority, on_sent=False):
+        encode = SEQ_BATCH_ENCODERS[frame_type]
+        for i in range(0, len(quads), FRAME_MAX_PAIRS):
+            chunk = quads[i:i + FRAME_MAX_PAIRS]
+            callback = self.reliable_sent_callback([(q[0], q[3]) for q in chunk]) if on_sent else None
+            self.write_bytes(encode(chunk), priority, callback)
+
+    def gait_tables_supported(self):
+        return self.reliable_active() and self.protocol_version >= GAIT_TABLE_MIN_VERSION
+
+    def send_table_chunk(self, board, offset, data):
+        """One reliable TABLE_CHUNK frame of a gait table upload (bridge v5+). Returns its (board, seq)."""
+        seq = self.acks.next_seq()
+        frame = encode_table_chunk(board, offset, data, seq)
+        self.reliable.track_frame(board, seq, (board, "TABLE", offset), frame)
+        self.write_bytes(frame, PRIORITY_CONTROL, self.reliable_sent_callback([(board, seq)]))
+        return (board, seq)
+
+    def send_tick_batch(self, triples):
+        # Host-calibrated ticks: TICK_BATCH frames on v2+ bridges, TICK text lines otherwise
+        if self.protocol == PROTOCOL_BINARY and self.protocol_version >= TICK_BATCH_MIN_VERSION:
+            for i in range(0, len(triples), FRAME_MAX_PAIRS):
+                self.write_bytes(encode_tick_batch(triples[i:i + FRAME_MAX_PAIRS]))
+        else:
+            lines = format_tick_batch_text(triples)
+            if lines:
+                self.write_bytes(("\n".join(lines) + "\n").encode('utf-8'))
+
+    # Latest-value streaming commands (sliders): only the newest value per servo / motor is sent
+    def queue_angle(self, board, channel, angle):
+        self.coalescer.submit_angle(board, channel, angle)
+        self.notify_writer()   # Let an idle writer pick up the new flush deadline
+
+    def queue_motor(self, board, speed):
+        self.coalescer.submit_motor(board, speed)
+        self.notify_writer()
+
+    def flush_coalesced(self):
+        angles, motors = self.coalescer.drain()
+        if angles:
+            self.send_angle_batch(angles)
+        for board, speed in motors:
+            self.send_command(f"{board} MOTOR {speed}")
+
+    # Streaming rate: fixed, or steered by link quality between link_rate's bounds
+    def set_flush_rate(self, flush_hz):
+        self.flush_hz = float(flush_hz)
+        self.link_rate.set_bounds(max_hz=flush_hz)
+        self.apply_stream_rate()
+
+    def set_adaptive_rate(self, enabled):
+        self.adaptive_rate = enabled
+        self.apply_stream_rate()
+
+    def apply_stream_rate(self):
+        self.coalescer.set_rate(self.link_rate.rate_hz if self.adaptive_rate else self.flush_hz)
+
+    def stream_rate_limit(self):
+        """Highest rate (Hz) gait loops should tick at right now, or None when not adapting."""
+        return self.link_rate.rate_hz if self.adaptive_rate else None
+
+    def tx_timeout(self):
+        """How long an idle writer may block before the coalescer or deadband schedule needs it."""
+        return self.coalescer.time_until_due() if self.coalescer.has_pending() else SERIAL_READ_TIMEOUT_S
+
+    def pump_tx(self, write_fn, timeout):
+        """
+        One writer step: sends the highest-priority queued write (waiting up to timeout for one), then runs
+        the coalescer flush and deadband refresh schedules. Returns True if something went out.
+        """
+        wrote = False
+        item = self.tx_queue.get(timeout)
+        if item:
+            priority, t_enqueued, data, on_sent = item
+            try:
+                write_fn(data)
+                t_wire = time.monotonic()
+                self.tx_queue.record_sent(priority, t_enqueued, t_wire)
+                self.tx_rate.add(len(data), 1)
+                self.link_rate.note_packets(esp_now_packets(data),
+                                            t_wire - t_enqueued if priority == PRIORITY_MOTION else None)
+                if on_sent:
+                    on_sent(t_wire)
+                wrote = True
+            except Exception as e:
+                print(f"[SERIAL TX ERROR] {e}")
+        if self.coalescer.has_pending() and self.coalescer.due():
+            self.flush_coalesced()
+        refresh = self.deadband.refresh_due()
+        if refresh:
+            self.send_angle_batch(refresh, refresh=True)
+        if self.acks.pending:
+            expired = self.acks.expire()
+            if expired:
+                self.link_rate.note_acks(lost=len(expired))
+        if self.reliable.pending:
+            self.retransmit_due()
+        if self.link_rate.update() and self.adaptive_rate:
+            self.apply_stream_rate()
+        return wrote
+
+    def retransmit_due(self):
+        # Control class: ahead of streaming, but unlike a fresh stop it does not flush the motion lane
+        texts, quads, frames, failed = self.reliable.due()
+        retransmits = len(texts) + len(frames) + sum(len(entries) for entries in quads.values())
+        if retransmits:
+            self.link_rate.note_acks(lost=retransmits)
+        for seq, text in texts:
+            self.write_bytes(f"{format_seq_command(seq, text)}\n".encode('utf-8'), PRIORITY_CONTROL)
+        for frame_type, entries in quads.items():
+            self.write_seq_batch(frame_type, entries, PRIORITY_CONTROL)
+        for frame in frames:
+            self.write_bytes(frame, PRIORITY_CONTROL)
+        for entry in failed:
+            self.on_delivery_failed(entry)
+
+    # ---------------------------------------------------------------------------
+    # RECEIVE
+    # ---------------------------------------------------------------------------
+    def feed(self, data):
+        # Samples are stamped with the read time, so latency measured from them includes line handling
+        t_rx = time.monotonic()
+        lines = self.framer.feed(data)
+        self.rx_rate.add(len(data), len(lines))
+        for line in lines:
+            self.handle_line(line, t_rx)
+
+    def handle_line(self, line, t_rx=None):
+        # Command ACKs are bookkeeping, not console output
+        ack = parse_ack_line(line)
+        if ack is not None:
+            if self.reliable.on_ack(ack[0], ack[1], t_rx):
+                self.link_rate.note_acks(acked=1)
+            else:
+                rtt = self.acks.on_ack(ack[0], ack[1], t_rx)
+                if rtt is not None:
+                    self.link_rate.note_acks(acked=1, rtt_s=rtt)
+            return
+        if line.startswith(LINK_FAIL_PREFIX):
+            self.link_rate.note_link_fail()
+        for callback in self.line_callbacks:
+            callback(line)
+
+        if self.console is not None:
+            self.console.append(line)
+        self.on_line(line)
+
+        proto_version = parse_proto_reply(line)
+        if proto_version is not None:
+            self.protocol = PROTOCOL_BINARY
+            self.protocol_version = proto_version
+            self.reliable.clear()
+            self.on_protocol(self.protocol, proto_version)
+            return
+
+        # MPU telemetry for Left and Right Slaves goes into the ring buffers
+        sample = self.telemetry.feed_line(line, t_rx)
+        if sample is not None:
+            for callback in self.telemetry_callbacks:
+                callback(sample)
+            self.on_telemetry(sample)
+
+# -------------------------------------------------------------------------------
+# ASYNCIO CONTROLLER (Headless, No Qt)
+# -------------------------------------------------------------------------------
+class AsyncRollopod(BridgeLink):
+    """
+    BridgeLink on an asyncio serial transport. Reads are event driven (loop.add_reader on the port's file
+    descriptor; a polling task where the loop cannot watch serial handles, e.g. Windows), and one writer
+    task drains the priority queue. Commands may be issued from the loop or from other threads.
+    """
+
+    def __init__(self, port, baud_rate=115200, flush_hz=DEFAULT_FLUSH_HZ, invert_left=False, invert_right=False,
+                 sequence_commands=False, adaptive_rate=False):
+        super().__init__(flush_hz)
+        self.sequence_commands = sequence_commands
+        self.set_adaptive_rate(adaptive_rate)
+        self.port_name = port
+        self.baud_rate = baud_rate
+        self.invert_left = invert_left
+        self.invert_right = invert_right
+        self.ser = None
+        self.loop = None
+        self.tx_event = None
+        self.protocol_event = None
+        self.tasks = []
+        self.reader_fd = None
+        self.subscribers = set()
+        self.connected = False
+        self.failed_deliveries = deque(maxlen=FAILED_DELIVERY_HISTORY)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def connect(self, handshake_timeout=0.5):
+        """Opens the port and runs the protocol handshake; returns the negotiated protocol."""
+        self.loop = asyncio.get_running_loop()
+        self.tx_event = asyncio.Event()
+        self.protocol_event = asyncio.Event()
+        self.ser = serial.Serial(self.port_name, self.baud_rate, timeout=0)   # Non-blocking reads
+        self.connected = True
+        try:
+            self.loop.add_reader(self.ser.fileno(), self.on_readable)
+            self.reader_fd = self.ser.fileno()
+        except (NotImplementedError, AttributeError, ValueError):
+            self.tasks.append(self.loop.create_task(self.poll_reader()))
+        self.tasks.append(self.loop.create_task(self.write_loop()))
+
+        # Legacy bridges never answer and we stay on text commands
+        self.send_command(PROTO_QUERY)
+        await self.wait_protocol(handshake_timeout)
+        return self.protocol
+
+    async def close(self):
+        if not self.connected:
+            return
+        self.connected = False
+        if self.reader_fd is not None:
+            self.loop.remove_reader(self.reader_fd)
+            self.reader_fd = None
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.ser.close()
+
+    async def wait_protocol(self, timeout):
+        try:
+            await asyncio.wait_for(self.protocol_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.protocol
+
+    # ---------------------------------------------------------------------------
+    # TRANSPORT
+    # ---------------------------------------------------------------------------
+    def on_readable(self):
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+        except serial.SerialException as e:
+            print(f"[SERIAL RX ERROR] {e}")
+            self.loop.remove_reader(self.reader_fd)
+            self.reader_fd = None
+            return
+        if data:
+            self.feed(data)
+
+    async def poll_reader(self):
+        while self.connected:
+            data = self.ser.read(self.ser.in_waiting or 1)
+            if data:
+                self.feed(data)
+            else:
+                await asyncio.sleep(0.001)
+
+    def write_bytes(self, data, priority=PRIORITY_MOTION, on_sent=None):
+        super().write_bytes(data, priority, on_sent)
+        self.notify_writer()
+
+    def notify_writer(self):
+        # Safe from any thread (gait threads, callbacks); a no-op wake-up if the writer is already busy
+        if self.loop is not None and self.connected:
+            self.loop.call_soon_threadsafe(self.tx_event.set)
+
+    async def write_loop(self):
+        while self.connected:
+            self.tx_event.clear()
+            if self.pump_tx(self.ser.write, 0):
+                await asyncio.sleep(0)   # Yield between writes so reads and callers keep running
+                continue
+            try:
+                await asyncio.wait_for(self.tx_event.wait(), self.tx_timeout())
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, timeout=1.0):
+        """Waits until every queued write has gone out (or timeout)."""
+        deadline = time.monotonic() + timeout
+        while (any(self.tx_queue.pending()) or self.coalescer.has_pending()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.001)
+        return not any(self.tx_queue.pending())
+
+    # ---------------------------------------------------------------------------
+    # TELEMETRY
+    # ---------------------------------------------------------------------------
+    def on_protocol(self, protocol, version):
+        self.protocol_event.set()
+
+    def on_telemetry(self, sample):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()   # Slow consumer: drop its oldest sample, never block the reader
+            queue.put_nowait(sample)
+
+    async def stream_telemetry(self, board=None):
+        """Async iterator of MpuSample as they arrive; board 'L' / 'R' filters (untagged samples match both)."""
+        queue = asyncio.Queue(TELEMETRY_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        try:
+            while True:
+                sample = await queue.get()
+                if board is None or sample.board in (board, None):
+                    yield sample
+        finally:
+            self.subscribers.discard(queue)
+
+    def pitch(self, board):
+        latest = self.telemetry.buffers[board].latest()
+        return None if latest is None else latest[1]
+
+    def ack_stats(self):
+        """Per-board command round trip and loss when sequence_commands is on (see AckTracker.stats)."""
+        self.acks.expire()
+        return self.acks.stats()
+
+    def reliable_stats(self):
+        """Reliable delivery counts (tracked, delivered, retransmits, superseded, failed, pending) and delivery
+        time p50 / p99 / max in ms."""
+        return self.reliable.stats()
+
+    def link_stats(self):
+        """Streaming rate and the link estimate behind it (see LinkRateController.stats)."""
+        return self.link_rate.stats()
+
+    def on_delivery_failed(self, entry):
+        super().on_delivery_failed(entry)
+        self.failed_deliveries.append(entry)
+
+    # ---------------------------------------------------------------------------
+    # SERVOS, POSES & GAITS
+    # ---------------------------------------------------------------------------
+    def set_angle(self, board, channel, angle, stream=False):
+        """One servo. stream=True coalesces with other streamed values (latest wins at the flush rate)."""
+        if stream:
+            self.queue_angle(board, channel, angle)
+        else:
+            self.send_angle_batch([(board, channel, float(angle))])
+
+    def set_pose(self, angles):
+        """Jump to {(board, channel): angle, ...} in one batch, re-sent until every servo ACKs (bridge v4+)."""
+        self.send_angle_batch([(board, channel, float(a)) for (board, channel), a in angles.items()], reliable=True)
+
+    async def move_to(self, angles, duration_s=1.0, rate_hz=50, name="Pose"):
+        """Minimum-jerk move from the last commanded angles to {(board, channel): angle, ...}."""
+        if duration_s <= 0.0:
+            self.set_pose(angles)
+            return
+        start = {key: self.commanded.get(key, angle) for key, angle in angles.items()}
+        await self.run_gait(PoseTransition(start, angles, duration_s, name), 1.0 / rate_hz)
+
+    async def run_gait(self, gait, period_s=0.02, duration_s=None):
+        """
+        Runs gait.tick(dt, send_fn) on absolute deadlines until the gait reports done, duration_s elapses or the
+        task is cancelled; with adaptive_rate the period stretches to what the link sustains. Works with
+        WaddleGait / StabilizedGait (motor commands), LegGaitGenerator and PoseTransition (batches). Motor gaits
+        always end with a motor stop. Returns the last tick state.
+        """
+        is_motor_gait = isinstance(gait, (WaddleGait, StabilizedGait))
+        if is_motor_gait:
+            gait.invert_left, gait.invert_right = self.invert_left, self.invert_right
+        send_fn = self.send_command if is_motor_gait else self.send_angle_batch
+        gait.reset()
+        state = {}
+        start = next_deadline = time.monotonic()
+        last_tick = None
+        try:
+            while True:
+                now = time.monotonic()
+                dt = period_s if last_tick is None else now - last_tick
+                last_tick = now
+                state = gait.tick(dt, send_fn)
+                if state.get("done") or (duration_s is not None and now - start >= duration_s):
+                    break
+                limit = self.stream_rate_limit()
+                period = max(period_s, 1.0 / limit) if limit else period_s
+                next_deadline += period
+                if next_deadline < time.monotonic():
+                    next_deadline = time.monotonic() + period   # Missed a tick: resynchronise
+                await asyncio.sleep(max(0.0, next_deadline - time.monotonic()))
+        finally:
+            if isinstance(gait, StabilizedGait):
+                gait.stabilizer.disengage()   # Before the stop, or the next sample would restart the motors
+            if is_motor_gait:
+                self.stop_motors()
+        return state
+
+    async def upload_gait(self, tables, timeout=10.0):
+        """
+        Uploads {board: GaitTable} (rollopod_gaittable) to the slaves, chunked and ACKed (bridge v5+). Returns
+        the finished GaitUpload; check .state == UPLOAD_DONE, .error otherwise.
+        """
+        upload = GaitUpload(self, tables)
+        self.line_callbacks.append(upload.on_line)
+        try:
+            upload.start()
+            deadline = time.monotonic() + timeout
+            while not upload.done:
+                if time.monotonic() > deadline:
+                    upload.fail("timed out")
+                    break
+                upload.poll()
+                await asyncio.sleep(0.01)
+        finally:
+            self.line_callbacks.remove(upload.on_line)
+        return upload
+
+    def play_gait(self, speed_pct=100, board="B"):
+        """Starts the uploaded tables on the slaves; speed_pct scales playback time (100 = as compiled)."""
+        self.send_command(f"{board} GAIT_PLAY {int(speed_pct)}", reliable=True)
+
+    def stop_gait(self, board="B"):
+        """Stops table playback; servos hold where they are."""
+        self.send_command(f"{board} GAIT_STOP", reliable=True)
+
+    def attach_stabilizer(self, **gains):
+        """A PitchStabilizer fed by this link's telemetry and sending through it; enable it and wrap the waddle
+        in StabilizedGait(gait, stabilizer) to roll closed loop."""
+        stabilizer = PitchStabilizer(self.send_command, **gains)
+        stabilizer.invert_left, stabilizer.invert_right = self.invert_left, self.invert_right
+        self.telemetry_callbacks.append(stabilizer.on_sample)
+        return stabilizer
+
+    # ---------------------------------------------------------------------------
+    # MOTORS
+    # ---------------------------------------------------------------------------
+    def set_motors(self, left, right=None, stream=False):
+        """Drive speeds (-255..255) before inversion; right defaults to left. stream=True coalesces."""
+        right = left if right is None else right
+        for board, speed in resolve_motor_speeds(left, right, self.invert_left, self.invert_right):
+            if stream:
+                self.queue_motor(board, speed)
+            else:
+                self.send_command(f"{board} MOTOR {speed}")
+
+    def stop_motors(self):
+        # Safety class: jumps the queue and flushes pending motion
+        self.send_command(STOP_COMMAND, stop=True)
@@ -0,0 +1,767 @@
+"""
+Rollopod Bridge Emulator
+Pseudo-terminal stand-in for the ESP32 master bridge and both slaves, so the GUI, rollopod_core and benchmarks run
+end to end on Linux without hardware.
+
+    python rollopod_emulator.py --baud 115200 --telemetry-hz 50
+    python servo_controller_gui.py --port /dev/pts/7      # the path the emulator prints
+
+Mirrors esp32_master_bridge.ino (L / R / B prefixes, PROTO? handshake, ANGLE_BATCH / TICK_BATCH frames and their
+sequenced variants, "#<seq>" sequenced commands and their slave ACKs, duplicate suppression of retransmitted seqs on
+the slaves, TABLE_CHUNK gait table uploads, the cmd_struct round trip to the slaves) and the slave firmware's command set (ANGLE, TICK, MOTOR, CAL, CAL_ALL, GET_CAL, GET_ALL_CAL,
+FREQ, TORQUE, TELEMETRY, GET_MPU, RESET_MPU, SLEEP, WAKE, RESET, INFO, and GAIT_BEGIN / GAIT_COMMIT / GAIT_PLAY /
+GAIT_STOP / GAIT_INFO, with the gait player run by rollopod_gaittable's reference interpreter). Replies come back tagged "[LEFT]" / "[RIGHT]"
+exactly as the bridge prints them.
+
+The UART is modelled as a byte budget of baud / 10 bytes/s in each direction (8N1), with a FIFO-sized burst, so a host
+that writes faster than the link sees the same back-pressure it would on real hardware. ESP-NOW delivery can be made
+lossy (--loss) to exercise "[LINK FAIL]" handling and lost ACKs, and given a per-packet airtime (--airtime-ms) so
+sending faster than the air carries fills the bridge's ESP-NOW queue and loss climbs with the command rate. Telemetry pitch comes from a small plant: a first-order lag towards
+a tilt proportional to the drive motor speed, plus a slow sway and sensor noise.
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import threading
+import time
+import tty
+from collections import deque, namedtuple
+from itertools import chain
+
+from rollopod_protocol import (
+    FRAME_TYPE_ANGLE_BATCH, FRAME_TYPE_TICK_BATCH, FRAME_TYPE_SEQ_ANGLE_BATCH, FRAME_TYPE_SEQ_TICK_BATCH,
+    FRAME_TYPE_TABLE_CHUNK, FRAME_HEADER_SIZE, FRAME_CRC_SIZE, PROTO_VERSION, SEQ_MIN_VERSION, RELIABLE_MIN_VERSION,
+    GAIT_TABLE_MIN_VERSION, TABLE_CHUNK_MAX, crc16_ccitt, split_seq_command
+)
+from rollopod_gaittable import GaitTable, GaitTableInterpreter, GaitTableError, GAIT_TABLE_MAX, table_crc
+
+FRAME_SOF0 = 0xA5
+FRAME_SOF1 = 0x5A
+FRAME_TIMEOUT_S = 0.05      # FRAME_TIMEOUT_MS in the bridge: a stalled binary frame is dropped
+UART_FIFO_BYTES = 128       # Burst the UART model allows after an idle period
+TICK_MIN_DEFAULT = 102
+TICK_MAX_DEFAULT = 512
+SERVO_FREQ_DEFAULT = 50
+DEFAULT_TELEMETRY_HZ = 50   # TELEMETRY_INTERVAL = 20 ms in the slave firmware
+CMD_NAME_MAX = 15           # char command[16] in cmd_struct
+MESSAGE_MAX = 127           # char message[128] in telemetry_struct
+BOARD_TAGS = {'L': "[LEFT]", 'R': "[RIGHT]"}
+ESPNOW_QUEUE_PACKETS = 32   # Sends the bridge's WiFi driver can hold while the air is busy
+SEQ_DEDUP_SLOTS = 32        # Recently applied sequenced commands each slave remembers
+SEQ_STATEFUL_SLOTS = 16     # Separate ring for commands that must not run twice; streaming never evicts them
+SEQ_DEDUP_WINDOW_S = 5.0    # SEQ_DEDUP_WINDOW_MS: a repeat older than this is treated as a new command
+GAIT_TICK_S = 0.01          # GAIT_TICK_MS: gait player update period on the slaves
+
+CmdStruct = namedtuple("CmdStruct", ["command", "val1", "val2", "val3"])
+TableChunk = namedtuple("TableChunk", ["command", "offset", "data"])   # table_chunk_struct, command = "GTBL" tag
+VAL1_COMMANDS = ("MOTOR", "TORQUE", "FREQ", "TELEMETRY", "GET_CAL", "GAIT_BEGIN", "GAIT_COMMIT", "GAIT_PLAY")
+STATEFUL_COMMANDS = ("RESET", "RESET_MPU", "GAIT_BEGIN", "GAIT_COMMIT", "GAIT_PLAY", "GAIT_STOP")
+
+# -------------------------------------------------------------------------------
+# ARDUINO STRING PARSING (String.toInt / String.toFloat semantics)
+# -------------------------------------------------------------------------------
+def to_int(text):
+    """Leading optional sign and digits, 0 if there are none (never raises, like String.toInt)."""
+    text = text.strip()
+    end = 1 if text[:1] in "+-" else 0
+    while end < len(text) and text[end].isdigit():
+        end += 1
+    try:
+        return int(text[:end])
+    except ValueError:
+        return 0
+
+def to_float(text):
+    text = text.strip()
+    for end in range(len(text), 0, -1):
+        try:
+            return float(text[:end])
+        except ValueError:
+            continue
+    return 0.0
+
+def pack_command(command):
+    """
+    The bridge's sendCommandToSlave(): strips the board prefix and packs the text into a cmd_struct.
+    Returns (target, CmdStruct) with target 'L', 'R' or 'B'.
+    """
+    command = command.strip()
+    target = 'B'
+    if command.startswith(("L ", "L_")):
+        target, command = 'L', command[2:]
+    elif command.startswith(("R ", "R_")):
+        target, command = 'R', command[2:]
+    elif command.startswith(("B ", "B_", "ALL ")):
+        sp = command.find(' ')
+        if sp != -1:
+            command = command[sp + 1:]
+    command = command.strip()
+
+    parts = command.split(' ')
+    val1, val2, val3 = 0, 0, 0.0
+    if len(parts) > 1:
+        cmd = parts[0]
+        rest = command[len(cmd) + 1:]
+        if cmd in VAL1_COMMANDS:
+            val1 = to_int(rest)
+        elif cmd in ("ANGLE", "CAL_ALL"):
+            val1, val3 = to_int(parts[1]), to_float(" ".join(parts[2:]))
+        elif cmd == "TICK":
+            val1, val2 = to_int(parts[1]), to_int(" ".join(parts[2:]))
+        elif cmd == "CAL":
+            val1, val2, val3 = to_int(parts[1]), to_int(parts[2] if len(parts) > 2 else ""), to_float(" ".join(parts[3:]))
+    else:
+        cmd = command
+    return target, CmdStruct(cmd[:CMD_NAME_MAX], val1, val2, val3)
+
+# -------------------------------------------------------------------------------
+# SLAVE (PCA9685 + Drive Motor + MPU6050)
+# -------------------------------------------------------------------------------
+class SlaveEmulator:
+    def __init__(self, board, telemetry_hz=DEFAULT_TELEMETRY_HZ, pitch_per_speed=0.05, pitch_lag_s=0.3,
+                 sway_deg=1.5, noise_deg=0.05, rng=None):
+        self.board = board
+        self.telemetry_period = 1.0 / telemetry_hz if telemetry_hz > 0 else None
+        self.pitch_per_speed = pitch_per_speed
+        self.pitch_lag_s = pitch_lag_s
+        self.sway_deg = sway_deg
+        self.noise_deg = noise_deg
+        self.rng = rng or random.Random()
+        self.t = 0.0
+        self.next_telemetry = 0.0
+        self.commands = 0
+        self.duplicates = 0
+        self.recent_seqs = deque(maxlen=SEQ_DEDUP_SLOTS)   # (seq, CmdStruct, time applied)
+        self.stateful_seqs = deque(maxlen=SEQ_STATEFUL_SLOTS)
+        self.last_update = [None] * 16   # monotonic time each channel was last driven (for latency measurements)
+        self.clear_gait()
+        self.reset()
+
+    def clear_gait(self):
+        self.gait_buffer = bytearray()
+        self.gait_size = 0           # Announced by GAIT_BEGIN; 0 = no upload in progress
+        self.gait_chunks = set()     # Offsets received
+        self.gait = None             # GaitTableInterpreter of the committed table
+        self.gait_crc = 0
+        self.gait_playing = False
+        self.gait_speed = 100
+        self.gait_clock_ms = 0.0
+        self.gait_last_tick = 0.0
+
+    def reset(self):
+        self.frequency = SERVO_FREQ_DEFAULT
+        self.tick_min = [TICK_MIN_DEFAULT] * 16
+        self.tick_max = [TICK_MAX_DEFAULT] * 16
+        self.angles = [90.0] * 16
+        self.ticks = [0] * 16
+        self.motor_speed = 0
+        self.torque = 0
+        self.sleeping = False
+        self.telemetry_enabled = False
+        self.filtered_angle = self.accel_angle = self.gyro_angle = 0.0
+        for channel in range(16):
+            self.set_servo_angle(channel, 90.0)
+
+    # Servo outputs, same arithmetic as the firmware
+    def set_servo_pwm(self, channel, tick, now=None):
+        if 0 <= channel < 16 and 0 <= tick <= 4095:
+            self.ticks[channel] = tick
+            self.last_update[channel] = time.monotonic() if now is None else now
+
+    def set_servo_angle(self, channel, angle, now=None):
+        if not 0 <= channel < 16 or not 0.0 <= angle <= 180.0:
+            return
+        self.angles[channel] = angle
+        lo, hi = self.tick_min[channel], self.tick_max[channel]
+        tick = int(lo + (angle / 180.0) * (hi - lo) + 0.5)
+        self.set_servo_pwm(channel, min(4095, max(lo, min(hi, tick))), now)
+
+    # ---------------------------------------------------------------------------
+    # COMMANDS
+    # ---------------------------------------------------------------------------
+    def receive(self, cmd, now=None, seq=0):
+        """
+        onDataRecv(): rebuild the command text from the cmd_struct and run it. Returns the response messages,
+        ending with "ACK <seq>" for a sequenced command. A retransmission of a recently applied seq is only ACKed.
+        """
+        if isinstance(cmd, TableChunk):
+            # Slices are idempotent: a retransmission is simply written again
+            replies = self.receive_table_chunk(cmd)
+            if seq:
+                replies.append(f"ACK {seq}")
+            return replies
+        if seq:
+            t = time.monotonic() if now is None else now
+            if any(s == seq and c == cmd and t - t0 < SEQ_DEDUP_WINDOW_S
+                   for s, c, t0 in chain(self.recent_seqs, self.stateful_seqs)):
+                self.duplicates += 1
+                return [f"ACK {seq}"]
+            ring = self.stateful_seqs if cmd.command in STATEFUL_COMMANDS else self.recent_seqs
+            ring.append((seq, cmd, t))
+        name = cmd.command
+        text = name
+        if name in VAL1_COMMANDS:
+            text += f" {cmd.val1}"
+        elif name in ("ANGLE", "CAL_ALL"):
+            text += f" {cmd.val1} {cmd.val3:.1f}"
+        elif name == "TICK":
+            text += f" {cmd.val1} {cmd.val2}"
+        elif name == "CAL":
+            text += f" {cmd.val1} {cmd.val2} {cmd.val3:.0f}"
+        if name != "PING":
+            self.commands += 1
+        replies = self.process_command(text, now)
+        if seq:
+            replies.append(f"ACK {seq}")
+        return replies
+
+    def process_command(self, command, now=None):
+        command = command.upper().strip()
+        parts = command.split()
+        replies = []
+
+        if command == "PING":
+            replies.append("PONG")
+        elif command.startswith("TICK "):
+            if len(parts) >= 3:
+                channel, tick = to_int(parts[1]), to_int(parts[2])
+                if 0 <= channel < 16 and 0 <= tick <= 4095:
+                    self.set_servo_pwm(channel, tick, now)
+        elif command.startswith("ANGLE "):
+            if len(parts) >= 3:
+                channel, angle = to_int(parts[1]), to_float(parts[2])
+                if 0 <= channel < 16 and 0.0 <= angle <= 180.0:
+                    self.set_servo_angle(channel, angle, now)
+                    replies.append(f"OK: Ch {channel} set to {int(angle)} deg")
+        elif command.startswith("CAL ") and not command.startswith("CAL_"):
+            if len(parts) >= 4:
+                channel, lo, hi = to_int(parts[1]), to_int(parts[2]), to_int(parts[3])
+                if 0 <= channel < 16 and 0 <= lo < hi <= 4095:
+                    self.tick_min[channel], self.tick_max[channel] = lo, hi
+                    self.set_servo_angle(channel, self.angles[channel], now)
+                    replies.append(f"OK: Channel {channel} calibration set to {lo}-{hi}")
+                else:
+                    replies.append("ERROR: Invalid channel or tick range (0 < min < max <= 4095)")
+            else:
+                replies.append("ERROR: Invalid CAL command format. Use: CAL <channel> <min> <max>")
+        elif command.startswith("CAL_ALL "):
+            if len(parts) >= 3:
+                lo, hi = to_int(parts[1]), to_int(parts[2])
+                if 0 <= lo < hi <= 4095:
+                    for channel in range(16):
+                        self.tick_min[channel], self.tick_max[channel] = lo, hi
+                        self.set_servo_angle(channel, self.angles[channel], now)
+                    replies.append(f"OK: All channels calibration set to {lo}-{hi}")
+                else:
+                    replies.append("ERROR: Invalid tick range (0 < min < max <= 4095)")
+            else:
+                replies.append("ERROR: Invalid CAL_ALL command format. Use: CAL_ALL <min> <max>")
+        elif command.startswith("GET_CAL "):
+            channel = to_int(command[8:])
+            if 0 <= channel < 16:
+                replies.append(f"CAL_DATA {channel} {self.tick_min[channel]} {self.tick_max[channel]}")
+            else:
+                replies.append("ERROR: Invalid channel (0-15)")
+        elif command == "GET_ALL_CAL":
+            replies.append("ALL_CAL_DATA")
+            replies += [f"{ch} {self.tick_min[ch]} {self.tick_max[ch]}" for ch in range(16)]
+            replies.append("END_CAL_DATA")
+        elif command.startswith("FREQ "):
+            freq = to_int(command[5:])
+            if 40 <= freq <= 1000:
+                self.frequency = freq
+                replies.append(f"OK: PWM frequency set to {freq} Hz")
+            else:
+                replies.append("ERROR: Invalid frequency (40-1000 Hz)")
+        elif command == "SLEEP":
+            self.sleeping = True
+            replies.append("OK: PCA9685 sleep mode enabled")
+        elif command == "WAKE":
+            self.sleeping = False
+            replies.append("OK: PCA9685 woken up")
+        elif command == "RESET":
+            self.clear_gait()
+            self.reset()
+            replies.append("OK: Reset to default configuration")
+            replies += self.info_lines()
+        elif command.startswith("MOTOR "):
+            speed = to_int(command[6:])
+            if -255 <= speed <= 255:
+                self.motor_speed = speed
+                replies.append(f"OK: Motor speed set to {speed}")
+            else:
+                replies.append("ERROR: Speed must be between -255 and 255")
+        elif command.startswith("TORQUE "):
+            state = to_int(command[7:])
+            if state in (0, 1):
+                self.torque = state
+                replies.append(f"OK: Torque set to {'HIGH' if state else 'LOW'}")
+            else:
+                replies.append("ERROR: Torque state must be 0 or 1")
+        elif command == "RESET_MPU":
+            self.gyro_angle = 0.0
+            self.filtered_angle = self.accel_angle
+            replies.append("OK: MPU6050 angles reset")
+        elif command == "GET_MPU":
+            replies.append(f"MPU_DATA {self.filtered_angle:.2f} {self.accel_angle:.2f} {self.gyro_angle:.2f}")
+        elif command.startswith("TELEMETRY "):
+            self.telemetry_enabled = to_int(command[10:]) != 0
+            replies.append(f"OK: Telemetry {'ENABLED' if self.telemetry_enabled else 'DISABLED'}")
+        elif command == "INFO":
+            replies += self.info_lines()
+        elif command.startswith("GAIT_"):
+            replies += self.process_gait_command(parts, now)
+        else:
+            replies.append("ERROR: Unknown command")
+        return replies
+
+    # ---------------------------------------------------------------------------
+    # GAIT TABLES (Upload, Commit, Local Playback)
+    # ---------------------------------------------------------------------------
+    def receive_table_chunk(self, chunk):
+        if not self.gait_size or chunk.offset % TABLE_CHUNK_MAX or chunk.offset + len(chunk.data) > self.gait_size:
+            return ["GAIT ERROR Chunk outside the announced table"]
+        self.gait_buffer[chunk.offset:chunk.offset + len(chunk.data)] = chunk.data
+        self.gait_chunks.add(chunk.offset)
+        return []
+
+    def gait_status(self):
+        if self.gait is None:
+            return "GAIT EMPTY"
+        return (f"GAIT READY {self.gait_crc:08X} {len(self.gait.table.frames)} {len(self.gait_buffer)}"
+                f"{' PLAYING' if self.gait_playing else ''}")
+
+    def process_gait_command(self, parts, now=None):
+        name = parts[0]
+        arg = to_int(parts[1]) if len(parts) > 1 else 0
+        if name == "GAIT_BEGIN":
+            if not 0 < arg <= GAIT_TABLE_MAX:
+                return [f"GAIT ERROR Table must be 1-{GAIT_TABLE_MAX} bytes"]
+            self.clear_gait()
+            self.gait_size = arg
+            self.gait_buffer = bytearray(arg)
+            return [f"OK: Gait upload started ({arg} bytes)"]
+        if name == "GAIT_COMMIT":
+            if not self.gait_size:
+                return ["GAIT ERROR No upload in progress"]
+            if len(self.gait_chunks) * TABLE_CHUNK_MAX < self.gait_size:
+                return ["GAIT ERROR Missing chunks"]
+            crc = table_crc(self.gait_buffer)
+            if crc != arg & 0xFFFFFFFF:
+                return ["GAIT ERROR CRC mismatch"]
+            try:
+                table = GaitTable.decode(self.gait_buffer)
+            except GaitTableError as e:
+                return [f"GAIT ERROR {e}"]
+            if any(channel >= 16 for channel, _, _ in table.channels):
+                return ["GAIT ERROR Channel out of range"]
+            self.gait = GaitTableInterpreter(table)
+            self.gait_crc = crc
+            self.gait_size = 0
+            return [self.gait_status()]
+        if name == "GAIT_PLAY":
+            if self.gait is None:
+                return ["GAIT ERROR No gait table loaded"]
+            self.gait_speed = arg if 0 < arg <= 1000 else 100
+            self.gait_clock_ms = 0.0
+            self.gait_last_tick = time.monotonic() if now is None else now
+            self.gait_playing = True
+            self.play_gait_frame()
+            return [f"OK: Gait playing at {self.gait_speed}%"]
+        if name == "GAIT_STOP":
+            self.gait_playing = False
+            return ["OK: Gait stopped"]
+        if name == "GAIT_INFO":
+            return [self.gait_status()]
+        return ["ERROR: Unknown command"]
+
+    def play_gait_frame(self, now=None):
+        for channel, angle in self.gait.angles_at(int(self.gait_clock_ms)):
+            self.set_servo_angle(channel, angle, now)
+
+    def update_gait(self, now):
+        """The slave loop()'s gait player: every GAIT_TICK_S, advance the scaled clock and drive the servos."""
+        if not self.gait_playing or now - self.gait_last_tick < GAIT_TICK_S:
+            return None
+        self.gait_clock_ms += (now - self.gait_last_tick) * 1000.0 * self.gait_speed / 100.0
+        self.gait_last_tick = now
+        self.play_gait_frame(now)
+        if self.gait.finished(int(self.gait_clock_ms)):
+            self.gait_playing = False
+            return "GAIT DONE"
+        return None
+
+    def info_lines(self):
+        lines = ["\n========== Current Configuration ==========", f"PWM Frequency: {self.frequency} Hz",
+                 "\nChannel Configuration:", "Ch  | Angle  | Curr Tick | Tick Min | Tick Max",
+                 "----|--------|-----------|----------|----------"]
+        lines += [f"{ch:2d}  | {self.angles[ch]:6.1f} | {self.ticks[ch]:4d}      | {self.tick_min[ch]:4d}     | "
+                  f"{self.tick_max[ch]:4d}" for ch in range(16)]
+        lines.append("==========================================\n")
+        return lines
+
+    # ---------------------------------------------------------------------------
+    # MPU6050 PLANT MODEL
+    # ---------------------------------------------------------------------------
+    def update_mpu(self, dt):
+        self.t += dt
+        target = self.pitch_per_speed * self.motor_speed + self.sway_deg * math.sin(2.0 * math.pi * 0.5 * self.t)
+        alpha = dt / (self.pitch_lag_s + dt) if self.pitch_lag_s > 0.0 else 1.0
+        prev = self.filtered_angle
+        self.accel_angle = target + self.rng.gauss(0.0, self.noise_deg * 4)
+        self.filtered_angle = prev + alpha * (target - prev) + self.rng.gauss(0.0, self.noise_deg)
+        self.gyro_angle += self.filtered_angle - prev
+
+    def telemetry_due(self, now):
+        """Returns the pitch to stream if this slave's telemetry interval has elapsed, else None."""
+        if not self.telemetry_enabled or self.telemetry_period is None or now < self.next_telemetry:
+            return None
+        self.next_telemetry = max(self.next_telemetry + self.telemetry_period, now - self.telemetry_period)
+        return self.filtered_angle
+
+# -------------------------------------------------------------------------------
+# MASTER BRIDGE
+# -------------------------------------------------------------------------------
+class BridgeEmulator:
+    """The bridge's loop(): byte-level text / frame demux, local commands, forwarding and telemetry relay."""
+
+    def __init__(self, telemetry_hz=DEFAULT_TELEMETRY_HZ, loss=0.0, seed=None, proto_version=PROTO_VERSION,
+                 airtime_s=0.0):
+        self.rng = random.Random(seed)
+        self.slaves = {board: SlaveEmulator(board, telemetry_hz, rng=self.rng) for board in ('L', 'R')}
+        self.loss = loss
+        self.airtime_s = airtime_s
+        self.air_free_at = 0.0
+        self.proto_version = proto_version
+        self.out = bytearray()
+        self.text_buffer = bytearray()
+        self.frame = bytearray()
+        self.frame_start = 0.0
+        self.last_update = None
+        self.stats = {"text_lines": 0, "frames": 0, "frame_errors": 0, "frame_timeouts": 0,
+                      "packets": 0, "lost": 0, "congested": 0, "telemetry": 0, "telemetry_lost": 0, "acks": 0, "acks_lost": 0}
+
+    def print_line(self, text):
+        self.out += (text + "\n").encode("utf-8", errors="replace")
+
+    def take_output(self, n=None):
+        n = len(self.out) if n is None else min(n, len(self.out))
+        data = bytes(self.out[:n])
+        del self.out[:n]
+        return data
+
+    # ---------------------------------------------------------------------------
+    # RECEIVE FROM HOST
+    # ---------------------------------------------------------------------------
+    def feed(self, data, now=None):
+        now = time.monotonic() if now is None else now
+        if self.frame and now - self.frame_start > FRAME_TIMEOUT_S:
+            self.frame.clear()   # Drop truncated binary frame
+            self.stats["frame_timeouts"] += 1
+        for b in data:
+            # Binary frames start with 0xA5, which never appears in text commands
+            if self.frame or (b == FRAME_SOF0 and not self.text_buffer):
+                self.handle_frame_byte(b, now)
+            elif b == 0x0A:
+                line = self.text_buffer.decode("utf-8", errors="replace").strip()
+                self.text_buffer.clear()
+                if line:
+                    self.handle_text_line(line, now)
+            else:
+                self.text_buffer.append(b)
+
+    def handle_text_line(self, line, now):
+        self.stats["text_lines"] += 1
+        upper = line.upper()
+        if upper == "GET_MAC":
+            self.print_line("Master MAC:      02:00:00:00:00:00")
+            self.print_line("Left Slave MAC:  02:00:00:00:00:01")
+            self.print_line("  -> Status: ONLINE")
+            self.print_line("Right Slave MAC: 02:00:00:00:00:02")
+            self.print_line("  -> Status: ONLINE")
+        elif upper == "HELP":
+            self.print_line("ROLLOPOD DUAL MASTER BRIDGE (EMULATED)")
+            self.print_line("  L <cmd> / R <cmd> / B <cmd>, GET_MAC, PROTO?")
+        elif upper == "PROTO?":
+            if self.proto_version:
+                self.print_line(f"PROTO BIN {self.proto_version}")
+        elif upper == "PING":
+            self.print_line("Bridge OK - pinging both Left & Right slaves...")
+            self.forward(*pack_command("B INFO"), now=now)
+        else:
+            seq = 0
+            if self.proto_version >= SEQ_MIN_VERSION:
+                seq, line = split_seq_command(line)
+            self.forward(*pack_command(line), now=now, seq=seq)
+
+    def handle_frame_byte(self, b, now):
+        if not self.frame:
+            self.frame_start = now
+        self.frame.append(b)
+        if len(self.frame) == 2 and b != FRAME_SOF1:
+            self.frame.clear()
+            return
+        if len(self.frame) < FRAME_HEADER_SIZE:
+            return
+        length = self.frame[2]
+        total = FRAME_HEADER_SIZE + length + FRAME_CRC_SIZE
+        if len(self.frame) < total:
+            return
+        crc_rx = (self.frame[total - 2] << 8) | self.frame[total - 1]
+        if crc16_ccitt(self.frame[2:total - 2]) == crc_rx:
+            self.process_batch_frame(bytes(self.frame[FRAME_HEADER_SIZE:total - 2]), now)
+        else:
+            self.stats["frame_errors"] += 1
+            self.print_line("[FRAME ERR] CRC mismatch - frame dropped")
+        self.frame.clear()
+
+    def process_batch_frame(self, payload, now):
+        if len(payload) < 2:
+            return
+        frame_type, count = payload[0], payload[1]
+        if frame_type == FRAME_TYPE_TABLE_CHUNK and self.proto_version >= GAIT_TABLE_MIN_VERSION:
+            self.process_table_chunk(payload, count, now)
+            return
+        is_tick = frame_type in (FRAME_TYPE_TICK_BATCH, FRAME_TYPE_SEQ_TICK_BATCH)
+        is_seq = frame_type in (FRAME_TYPE_SEQ_ANGLE_BATCH, FRAME_TYPE_SEQ_TICK_BATCH)
+        known = frame_type in (FRAME_TYPE_ANGLE_BATCH, FRAME_TYPE_TICK_BATCH, FRAME_TYPE_SEQ_ANGLE_BATCH,
+                               FRAME_TYPE_SEQ_TICK_BATCH)
+        if not known or (is_tick and self.proto_version < 2) or (is_seq and self.proto_version < RELIABLE_MIN_VERSION):
+            self.stats["frame_errors"] += 1
+            self.print_line("[FRAME ERR] Unknown frame type - frame dropped")
+            return
+        stride = 5 if is_seq else 3
+        if len(payload) != 2 + stride * count:
+            self.stats["frame_errors"] += 1
+            self.print_line("[FRAME ERR] Payload length mismatch - frame dropped")
+            return
+        self.stats["frames"] += 1
+        for i in range(count):
+            entry = payload[2 + stride * i:2 + stride * (i + 1)]
+            addr, value = entry[0], entry[1] | (entry[2] << 8)
+            seq = entry[3] | (entry[4] << 8) if is_seq else 0
+            board = 'R' if addr & 0x80 else 'L'
+            if is_tick:
+                cmd = CmdStruct("TICK", addr & 0x0F, value, 0.0)
+            else:
+                cmd = CmdStruct("ANGLE", addr & 0x0F, 0, value / 10.0)
+            self.send_to_slave(board, cmd, now, seq)
+
+    def process_table_chunk(self, payload, count, now):
+        # COUNT is the data length; one chunk is one ESP-NOW packet to one slave
+        if len(payload) != 7 + count or count > TABLE_CHUNK_MAX:
+            self.stats["frame_errors"] += 1
+            self.print_line("[FRAME ERR] Payload length mismatch - frame dropped")
+            return
+        self.stats["frames"] += 1
+        board = 'R' if payload[2] & 0x80 else 'L'
+        offset = payload[3] | (payload[4] << 8)
+        seq = payload[5] | (payload[6] << 8)
+        self.send_to_slave(board, TableChunk("GTBL", offset, bytes(payload[7:])), now, seq)
+
+    # ---------------------------------------------------------------------------
+    # ESP-NOW LINK
+    # ---------------------------------------------------------------------------
+    def forward(self, target, cmd, now=None, seq=0):
+        for board in ('L', 'R'):
+            if target in (board, 'B'):
+                self.send_to_slave(board, cmd, now, seq)
+
+    def air_busy(self, now):
+        """Queues one packet on the air; True if the driver queue is already full and it is dropped."""
+        now = time.monotonic() if now is None else now
+        start = max(now, self.air_free_at)
+        if start - now > ESPNOW_QUEUE_PACKETS * self.airtime_s:
+            return True
+        self.air_free_at = start + self.airtime_s
+        return False
+
+    def send_to_slave(self, board, cmd, now=None, seq=0):
+        self.stats["packets"] += 1
+        congested = self.airtime_s > 0.0 and self.air_busy(now)
+        if congested:
+            self.stats["congested"] += 1
+        if congested or (self.loss and self.rng.random() < self.loss):
+            self.stats["lost"] += 1
+            if cmd.command != "PING":
+                self.print_line("[LINK FAIL] Delivery FAILED - Slave offline or out of range!")
+            return
+        for message in self.slaves[board].receive(cmd, now, seq):
+            if seq and message == f"ACK {seq}":
+                # The ACK is its own ESP-NOW packet back to the bridge, so it can be lost too
+                if self.loss and self.rng.random() < self.loss:
+                    self.stats["acks_lost"] += 1
+                    continue
+                self.stats["acks"] += 1
+            if message != "PONG":
+                self.print_line(f"{BOARD_TAGS[board]} {message[:MESSAGE_MAX]}")
+
+    def update(self, now=None):
+        """Advances the MPU models and relays any telemetry that is due."""
+        now = time.monotonic() if now is None else now
+        dt = 0.0 if self.last_update is None else now - self.last_update
+        self.last_update = now
+        for board, slave in self.slaves.items():
+            if dt > 0.0:
+                slave.update_mpu(dt)
+            message = slave.update_gait(now)
+            if message is not None:
+                self.print_line(f"{BOARD_TAGS[board]} {message}")
+            pitch = slave.telemetry_due(now)
+            if pitch is not None:
+                if self.loss and self.rng.random() < self.loss:
+                    self.stats["telemetry_lost"] += 1
+                    continue
+                self.stats["telemetry"] += 1
+                self.print_line(f"{BOARD_TAGS[board]} MPU_DATA {pitch:.2f}")
+
+    def next_event_s(self, now):
+        due = [s.next_telemetry for s in self.slaves.values() if s.telemetry_enabled and s.telemetry_period]
+        return max(0.0, min(due) - now) if due else None
+
+# -------------------------------------------------------------------------------
+# UART MODEL & PSEUDO-TERMINAL
+# -------------------------------------------------------------------------------
+class ByteBudget:
+    """Token bucket of baud / 10 bytes/s (8N1) with a FIFO-sized burst; baud 0 means unlimited."""
+
+    def __init__(self, baud, burst=UART_FIFO_BYTES):
+        self.rate = baud / 10.0 if baud else None
+        self.burst = burst
+        self.credit = float(burst)
+        self.last = time.monotonic()
+
+    def refill(self, now):
+        if self.rate is not None:
+            self.credit = min(self.burst, self.credit + (now - self.last) * self.rate)
+        self.last = now
+
+    def available(self, want):
+        return want if self.rate is None else min(want, int(self.credit))
+
+    def spend(self, n):
+        if self.rate is not None:
+            self.credit -= n
+
+    def wait_s(self):
+        if self.rate is None or self.credit >= 1.0:
+            return 0.0
+        return (1.0 - self.credit) / self.rate
+
+class PtyBridgeEmulator(threading.Thread):
+    """Runs a BridgeEmulator behind a pty. Open self.port_name like any serial port."""
+
+    def __init__(self, baud=115200, telemetry_hz=DEFAULT_TELEMETRY_HZ, loss=0.0, seed=None, link=None,
+                 proto_version=PROTO_VERSION, airtime_s=0.0):
+        super().__init__(daemon=True)
+        self.bridge = BridgeEmulator(telemetry_hz, loss, seed, proto_version, airtime_s)
+        self.rx_budget = ByteBudget(baud)
+        self.tx_budget = ByteBudget(baud)
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.master_fd)
+        tty.setraw(self.slave_fd)   # Kept open so the pty survives the host closing and reopening it
+        self.port_name = os.ttyname(self.slave_fd)
+        self.link = link
+        if link:
+            if os.path.islink(link):
+                os.unlink(link)
+            os.symlink(self.port_name, link)
+        self.running = False
+        self.rx_bytes = 0
+        self.tx_bytes = 0
+
+    def stop(self):
+        self.running = False
+        self.join(1.0)
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+    def run(self):
+        self.running = True
+        fd = self.master_fd
+        while self.running:
+            now = time.monotonic()
+            self.rx_budget.refill(now)
+            self.tx_budget.refill(now)
+            self.bridge.update(now)
+
+            timeouts = [0.01]
+            event_s = self.bridge.next_event_s(now)
+            if event_s is not None:
+                timeouts.append(event_s)
+            readers = [fd]
+            if self.rx_budget.available(1) < 1:
+                readers = []
+                timeouts.append(self.rx_budget.wait_s())
+            writers = []
+            if self.bridge.out:
+                if self.tx_budget.available(1) >= 1:
+                    writers = [fd]
+                else:
+                    timeouts.append(self.tx_budget.wait_s())
+            try:
+                readable, writable, _ = select.select(readers, writers, [], max(0.0, min(timeouts)))
+            except (OSError, ValueError):
+                break
+
+            if readable:
+                n = self.rx_budget.available(4096)
+                try:
+                    data = os.read(fd, n)
+                except OSError:
+                    data = b""
+                if data:
+                    self.rx_budget.spend(len(data))
+                    self.rx_bytes += len(data)
+                    self.bridge.feed(data, time.monotonic())
+            if writable:
+                chunk = self.bridge.out[:self.tx_budget.available(len(self.bridge.out))]
+                try:
+                    written = os.write(fd, chunk)
+                except (BlockingIOError, OSError):
+                    written = 0
+                del self.bridge.out[:written]
+                self.tx_budget.spend(written)
+                self.tx_bytes += written
+
+    def stats(self):
+        data = dict(self.bridge.stats)
+        data.update(rx_bytes=self.rx_bytes, tx_bytes=self.tx_bytes,
+                    commands={board: s.commands for board, s in self.bridge.slaves.items()},
+                    duplicates={board: s.duplicates for board, s in self.bridge.slaves.items()})
+        return data
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulated Rollopod master bridge and slaves on a pseudo-terminal")
+    parser.add_argument("--baud", type=int, default=115200, help="Serial baud rate to model (0 = unlimited)")
+    parser.add_argument("--telemetry-hz", type=float, default=DEFAULT_TELEMETRY_HZ, help="MPU_DATA rate per slave once enabled")
+    parser.add_argument("--loss", type=float, default=0.0, help="ESP-NOW packet loss probability (0-1)")
+    parser.add_argument("--airtime-ms", type=float, default=0.0,
+                        help="Air time per ESP-NOW packet; faster commands overflow the send queue (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for loss and sensor noise")
+    parser.add_argument("--link", default=None, help="Also expose the pty under this path (symlink), e.g. /tmp/rollopod")
+    parser.add_argument("--legacy", action="store_true", help="Behave like a text-only bridge (no PROTO? reply)")
+    args = parser.parse_args()
+
+    emulator = PtyBridgeEmulator(args.baud, args.telemetry_hz, args.loss, args.seed, args.link,
+                                 proto_version=0 if args.legacy else PROTO_VERSION, airtime_s=args.airtime_ms / 1000.0)
+    emulator.start()
+    print(f"[EMULATOR] Bridge on {emulator.port_name}" + (f" ({args.link})" if args.link else ""), flush=True)
+    try:
+        while emulator.is_alive():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    emulator.stop()
+    print(f"[EMULATOR] {emulator.stats()}")
+
+if __name__ == "__main__":
+    main()
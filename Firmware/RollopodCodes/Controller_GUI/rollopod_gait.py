@@ -0,0 +1,250 @@
+"""
+Rollopod Gait Engines & Real-Time Control Loop
+Differential waddle generator driven from a deadline-scheduled thread, independent of the Qt GUI thread.
+Waveforms come from precomputed lookup tables read through a phase accumulator, so frequency and
+amplitude changes never cause a phase jump and each tick costs a table lookup instead of a sin() call.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+# -------------------------------------------------------------------------------
+# PHASE-ACCUMULATOR WAVETABLE OSCILLATOR
+# -------------------------------------------------------------------------------
+WAVETABLE_SIZE = 1024
+WAVEFORM_SHAPES = ["Sine", "Triangle", "Square (Fourier)", "Custom Fourier"]
+SQUARE_HARMONICS = [(k, 1.0 / k, 0.0) for k in (1, 3, 5, 7, 9)]
+
+def parse_harmonics(text):
+    """Parse "k:amp[:phase_deg], ..." (e.g. "1:1.0, 3:0.3:90") into [(k, amp, phase_rad), ...]."""
+    harmonics = []
+    for term in text.replace(";", ",").split(","):
+        term = term.strip()
+        if not term:
+            continue
+        fields = [f.strip() for f in term.split(":")]
+        if len(fields) not in (2, 3):
+            raise ValueError(f"Harmonic term '{term}' must be k:amp or k:amp:phase_deg")
+        k = int(fields[0])
+        if k < 1:
+            raise ValueError(f"Harmonic number must be >= 1 (got {k})")
+        phase = math.radians(float(fields[2])) if len(fields) == 3 else 0.0
+        harmonics.append((k, float(fields[1]), phase))
+    if not harmonics:
+        raise ValueError("At least one harmonic is required")
+    return harmonics
+
+def build_wavetable(shape="Sine", harmonics=None, size=WAVETABLE_SIZE):
+    """One period of the waveform, normalised to a peak of 1.0. Built once, never per tick."""
+    if shape == "Sine":
+        table = [math.sin(2.0 * math.pi * i / size) for i in range(size)]
+    elif shape == "Triangle":
+        # Starts at 0 and rises, in phase with the sine
+        table = [1.0 - abs(((4.0 * i / size + 1.0) % 4.0) - 2.0) for i in range(size)]
+    else:
+        terms = SQUARE_HARMONICS if shape == "Square (Fourier)" else (harmonics or [(1, 1.0, 0.0)])
+        table = [sum(a * math.sin(2.0 * math.pi * k * i / size + ph) for k, a, ph in terms) for i in range(size)]
+
+    peak = max(abs(v) for v in table) or 1.0
+    return [v / peak for v in table]
+
+class WaveformOscillator:
+    def __init__(self, table=None, frequency=2.0, amplitude=0.0, glide_s=0.25):
+        self.table = table or build_wavetable("Sine")
+        self.phase = 0.0                    # Cycles, wrapped to [0, 1)
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.target_frequency = frequency
+        self.target_amplitude = amplitude
+        self.glide_s = glide_s              # Time constant for frequency / amplitude changes
+
+    def reset(self):
+        self.phase = 0.0
+        self.frequency = self.target_frequency
+        self.amplitude = self.target_amplitude
+
+    def set_table(self, table):
+        self.table = table                  # Phase is kept, so swapping shapes never jumps in time
+
+    def step(self, dt):
+        # First-order glide of frequency and amplitude towards their targets
+        k = min(1.0, dt / self.glide_s) if self.glide_s > 0.0 else 1.0
+        self.frequency += (self.target_frequency - self.frequency) * k
+        self.amplitude += (self.target_amplitude - self.amplitude) * k
+
+        self.phase += self.frequency * dt
+        self.phase -= math.floor(self.phase)
+
+        # Linear interpolation between adjacent table entries
+        table = self.table
+        pos = self.phase * len(table)
+        idx = int(pos)
+        frac = pos - idx
+        v0 = table[idx % len(table)]
+        v1 = table[(idx + 1) % len(table)]
+        return self.amplitude * (v0 + (v1 - v0) * frac)
+
+# -------------------------------------------------------------------------------
+# DIFFERENTIAL WADDLING GAIT (Left/Right DC Motor Waveform Oscillation)
+# -------------------------------------------------------------------------------
+class WaddleGait:
+    def __init__(self):
+        self.base_speed = 120
+        self.frequency = 2.0         # Hz
+        self.amplitude_pct = 50.0    # %
+        self.ramp_time = 1.0         # Ramp duration in seconds
+        self.invert_left = False
+        self.invert_right = False
+        self.waveform = "Sine"
+        self.harmonics = None
+        self.oscillator = WaveformOscillator()
+        self.reset()
+
+    def reset(self):
+        self.t = 0.0
+        self.ramp_factor = 0.0
+        self.update_oscillator_targets()
+        self.oscillator.reset()
+
+    def set_waveform(self, shape, harmonics=None):
+        self.waveform = shape
+        self.harmonics = harmonics
+        self.oscillator.set_table(build_wavetable(shape, harmonics))
+
+    def update_oscillator_targets(self):
+        max_diff_amp = abs(self.base_speed) if self.base_speed != 0 else 128.0
+        self.oscillator.target_frequency = self.frequency
+        self.oscillator.target_amplitude = (self.amplitude_pct / 100.0) * max_diff_amp
+
+    def step(self, dt):
+        """Advance the gait by dt seconds. Returns (l_speed, r_speed, diff_val) before direction inversion."""
+        self.t += dt
+
+        # Ramp up factor smoothly over the configured ramp time
+        ramp_step = dt / self.ramp_time if self.ramp_time > 0.0 else 1.0
+        if self.ramp_factor < 1.0:
+            self.ramp_factor = min(1.0, self.ramp_factor + ramp_step)
+
+        # Differential Waveform (phase accumulator + table lookup, gliding to the latest parameters)
+        self.update_oscillator_targets()
+        diff_val = self.oscillator.step(dt)
+
+        target_l_speed = (self.base_speed + diff_val) * self.ramp_factor
+        target_r_speed = (self.base_speed - diff_val) * self.ramp_factor
+
+        # Clamp speeds
+        l_speed = max(-255, min(255, int(round(target_l_speed))))
+        r_speed = max(-255, min(255, int(round(target_r_speed))))
+        return l_speed, r_speed, diff_val
+
+    def apply_inversion(self, l_speed, r_speed):
+        eff_l_speed = -l_speed if self.invert_left else l_speed
+        eff_r_speed = -r_speed if self.invert_right else r_speed
+        return eff_l_speed, eff_r_speed
+
+    def tick(self, dt, send_fn):
+        # One control-loop tick: send_fn receives motor command strings
+        l_speed, r_speed, diff_val = self.step(dt)
+        eff_l_speed, eff_r_speed = self.apply_inversion(l_speed, r_speed)
+        send_fn(f"L MOTOR {eff_l_speed}")
+        send_fn(f"R MOTOR {eff_r_speed}")
+        return {"t": self.t, "l_speed": l_speed, "r_speed": r_speed,
+                "eff_l_speed": eff_l_speed, "eff_r_speed": eff_r_speed,
+                "diff_val": diff_val, "ramp_factor": self.ramp_factor}
+
+# -------------------------------------------------------------------------------
+# DEADLINE-SCHEDULED CONTROL LOOP THREAD
+# -------------------------------------------------------------------------------
+def sleep_until(deadline, spin_margin=0.001):
+    # Coarse sleep, then spin the last millisecond to hit the deadline precisely
+    remaining = deadline - time.monotonic()
+    if remaining > spin_margin:
+        time.sleep(remaining - spin_margin)
+    while time.monotonic() < deadline:
+        pass
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(math.ceil(pct / 100.0 * len(sorted_values))) - 1)
+    return sorted_values[max(0, idx)]
+
+class ControlLoopThread(threading.Thread):
+    """
+    Runs gait.tick(dt, send_fn) on absolute deadlines (period_s apart); the gait computes and transmits
+    its own commands through send_fn and may return {"done": True} to end the loop. rate_limit_fn, if given,
+    returns the highest rate (Hz) the link sustains right now (or None) and stretches the period to match.
+    The GUI only reads snapshot() / jitter_stats() at display rate.
+    """
+
+    def __init__(self, gait, send_fn, period_s=0.02, history=1000, rate_limit_fn=None):
+        super().__init__(daemon=True)
+        self.gait = gait
+        self.send_fn = send_fn
+        self.period_s = period_s
+        self.rate_limit_fn = rate_limit_fn
+        self.active_period = period_s   # period_s, or longer while the link rate limit is below 1 / period_s
+        self.running = False
+        self.lock = threading.Lock()
+        self.periods = deque(maxlen=history)   # Actual minus scheduled period per tick
+        self.tick_times = deque(maxlen=history)
+        self.overruns = 0
+        self.state = {}
+
+    def stop(self):
+        self.running = False
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(1.0)
+
+    def run(self):
+        self.running = True
+        self.gait.reset()
+        next_deadline = time.monotonic()
+        last_tick = None
+
+        while self.running:
+            now = time.monotonic()
+            dt = self.active_period if last_tick is None else now - last_tick
+            if last_tick is not None:
+                self.periods.append(dt - self.active_period)
+            last_tick = now
+
+            state = self.gait.tick(dt, self.send_fn)
+            self.tick_times.append(time.monotonic() - now)
+
+            with self.lock:
+                self.state = state
+            if state.get("done"):
+                # Finite motions (pose transitions) end the loop after their final frame
+                self.running = False
+                break
+
+            limit = self.rate_limit_fn() if self.rate_limit_fn else None
+            self.active_period = max(self.period_s, 1.0 / limit) if limit else self.period_s
+            next_deadline += self.active_period
+            if next_deadline < time.monotonic():
+                # Missed a whole tick: resynchronise instead of bursting to catch up
+                self.overruns += 1
+                next_deadline = time.monotonic() + self.active_period
+            sleep_until(next_deadline)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.state)
+
+    def jitter_stats(self):
+        """Period jitter |actual - nominal| in milliseconds: (mean, p99, max)."""
+        deviations = sorted(abs(p) * 1000.0 for p in list(self.periods))
+        if not deviations:
+            return 0.0, 0.0, 0.0
+        return sum(deviations) / len(deviations), percentile(deviations, 99), deviations[-1]
+
+    def load_stats(self):
+        """Tick compute + transmit time in milliseconds: (mean, max), and the fraction of the period used."""
+        times = list(self.tick_times)
+        if not times:
+            return 0.0, 0.0, 0.0
+        mean_s = sum(times) / len(times)
+        return mean_s * 1000.0, max(times) * 1000.0, mean_s / self.active_period
@@ -0,0 +1,415 @@
+"""
+Rollopod Gait Tables
+Compiles a walking gait cycle or a transformation trajectory into a compact binary keyframe table per slave,
+uploads it once in TABLE_CHUNK frames, and lets the slave play it locally on "GAIT_PLAY": one command replaces a
+100 Hz angle stream, so the gait no longer depends on ESP-NOW delivering every frame on time.
+
+Table layout (little-endian, GAIT_TABLE_VERSION 1), mirrored by the slave firmware's gait player:
+    header    "GT", version u8, channels N u8, keyframes F u16, loop_start u16, loop_count u16 (0 = forever),
+              flags u8 (bit 0: loop), reserved u8
+    channels  N x (channel u8, min u16, span u16)        min / span in 0.1 deg
+    frames    F x (duration_ms u16, N x q u8)            angle = (min + span * q / 255) / 10
+
+Keyframe k moves linearly to keyframe k + 1 over its duration_ms. Frames before loop_start play once; a looping
+table then repeats loop_start..F-1, the last keyframe moving back to loop_start, loop_count times (then holds
+loop_start). A non-looping table stops on its last keyframe. Keyframes are picked greedily from a dense sampling so
+linear interpolation stays within tolerance_deg of the source, and GaitTableInterpreter replays a table the way
+the firmware does, so a compiled gait can be checked against its source without hardware.
+
+    tables = compile_gait_cycle(leg_gait)                  # {board: GaitTable}
+    check_gait_cycle(tables, leg_gait)                     # {board: (max_err_deg, rms_err_deg)}
+    upload = GaitUpload(link, tables); upload.start()      # then upload.poll() until upload.done
+"""
+
+import argparse
+import math
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from rollopod_protocol import TABLE_CHUNK_MAX
+
+GAIT_TABLE_MAGIC = b"GT"
+GAIT_TABLE_VERSION = 1
+GAIT_TABLE_MAX = 4096        # GAIT_TABLE_MAX in the slave firmware: table buffer per slave
+HEADER_SIZE = 12
+CHANNEL_SIZE = 5
+FLAG_LOOP = 0x01
+Q_MAX = 255
+DURATION_MAX_MS = 65535
+DEFAULT_SAMPLE_HZ = 200
+DEFAULT_TOLERANCE_DEG = 0.5  # Same as the deadband: about one PCA9685 tick
+
+class GaitTableError(Exception):
+    pass
+
+class GaitTable:
+    """One slave's keyframes: channels [(channel, min_d, span_d)], frames [(duration_ms, [q per channel])]."""
+
+    def __init__(self, channels, frames, loop=False, loop_start=0, loop_count=0):
+        self.channels = channels
+        self.frames = frames
+        self.loop = loop
+        self.loop_start = loop_start
+        self.loop_count = loop_count
+
+    def angle(self, index, q):
+        _, min_d, span_d = self.channels[index]
+        return (min_d + span_d * q / Q_MAX) / 10.0
+
+    @property
+    def duration_ms(self):
+        """One pass: intro plus one loop for looping tables, up to the last keyframe otherwise."""
+        durations = [d for d, _ in self.frames]
+        return sum(durations) if self.loop else sum(durations[:-1])
+
+    def encode(self):
+        n = len(self.channels)
+        out = bytearray(GAIT_TABLE_MAGIC)
+        out += struct.pack("<BBHHHBB", GAIT_TABLE_VERSION, n, len(self.frames), self.loop_start, self.loop_count,
+                           FLAG_LOOP if self.loop else 0, 0)
+        for channel, min_d, span_d in self.channels:
+            out += struct.pack("<BHH", channel, min_d, span_d)
+        for duration_ms, qs in self.frames:
+            out += struct.pack("<H", duration_ms) + bytes(qs)
+        if len(out) > GAIT_TABLE_MAX:
+            raise GaitTableError(f"Table is {len(out)} bytes, slaves hold {GAIT_TABLE_MAX}")
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        data = bytes(data)
+        if len(data) < HEADER_SIZE or data[:2] != GAIT_TABLE_MAGIC:
+            raise GaitTableError("Not a gait table")
+        version, n, n_frames, loop_start, loop_count, flags, _ = struct.unpack_from("<BBHHHBB", data, 2)
+        if version != GAIT_TABLE_VERSION:
+            raise GaitTableError(f"Unsupported gait table version {version}")
+        if len(data) != HEADER_SIZE + CHANNEL_SIZE * n + (2 + n) * n_frames:
+            raise GaitTableError(f"Table is {len(data)} bytes, header describes {n} channels x {n_frames} frames")
+        if n_frames == 0 or loop_start >= n_frames:
+            raise GaitTableError("Table has no frames or loop_start is out of range")
+        channels = [struct.unpack_from("<BHH", data, HEADER_SIZE + CHANNEL_SIZE * i) for i in range(n)]
+        frames = []
+        pos = HEADER_SIZE + CHANNEL_SIZE * n
+        for _ in range(n_frames):
+            frames.append((struct.unpack_from("<H", data, pos)[0], list(data[pos + 2:pos + 2 + n])))
+            pos += 2 + n
+        return cls(channels, frames, bool(flags & FLAG_LOOP), loop_start, loop_count)
+
+def table_crc(data):
+    """CRC-32 (zlib / IEEE 802.3) the slave checks the assembled table against on GAIT_COMMIT."""
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+# -------------------------------------------------------------------------------
+# COMPILER (Quantize, Then Keep Only The Keyframes Linear Interpolation Needs)
+# -------------------------------------------------------------------------------
+def quantize_channels(samples):
+    """samples (T, N) in degrees -> ([(min_d, span_d)], q (T, N) uint8)."""
+    lo = np.floor(samples.min(axis=0) * 10.0).astype(int)
+    hi = np.ceil(samples.max(axis=0) * 10.0).astype(int)
+    span = hi - lo
+    scale = np.where(span > 0, Q_MAX / np.maximum(span, 1), 0.0)
+    q = np.clip(np.rint((samples * 10.0 - lo) * scale), 0, Q_MAX).astype(np.uint8)
+    return list(zip(lo.tolist(), span.tolist())), q
+
+def pick_keyframes(times_ms, samples, decoded, tolerance_deg):
+    """
+    Greedy keyframe selection over samples (T, N): from each keyframe, extend to the furthest sample whose
+    straight line (between decoded endpoints) stays within tolerance_deg of every source sample in between.
+    """
+    keys = [0]
+    last = len(times_ms) - 1
+    i = 0
+    while i < last:
+        j = i + 1
+        while j < last:
+            k = j + 1
+            if times_ms[k] - times_ms[i] > DURATION_MAX_MS:
+                break
+            s = ((times_ms[i + 1:k] - times_ms[i]) / (times_ms[k] - times_ms[i]))[:, None]
+            line = decoded[i] + (decoded[k] - decoded[i]) * s
+            if np.abs(line - samples[i + 1:k]).max() > tolerance_deg:
+                break
+            j = k
+        keys.append(j)
+        i = j
+    return keys
+
+def compile_table(channels, times_ms, samples, loop=False, tolerance_deg=DEFAULT_TOLERANCE_DEG):
+    """
+    channels [ch, ...], times_ms (T,) rising from 0, samples (T, N) degrees. A looping table's last sample must be
+    the first again (the wrap point at the cycle length); it is not stored as a keyframe.
+    """
+    times_ms = np.rint(np.asarray(times_ms, dtype=np.float64)).astype(np.int64)
+    samples = np.asarray(samples, dtype=np.float64)
+    ranges, q = quantize_channels(samples)
+    spans = np.array([span for _, span in ranges], dtype=np.float64)
+    mins = np.array([lo for lo, _ in ranges], dtype=np.float64)
+    decoded = (mins + spans * q / Q_MAX) / 10.0
+    keys = pick_keyframes(times_ms.astype(np.float64), samples, decoded, tolerance_deg)
+    if loop:
+        keys = keys[:-1] or [0]
+        ends = keys[1:] + [len(times_ms) - 1]
+    else:
+        ends = keys[1:] + [keys[-1]]
+    frames = [(int(times_ms[end] - times_ms[k]), q[k].tolist()) for k, end in zip(keys, ends)]
+    table = GaitTable([(ch, lo, span) for ch, (lo, span) in zip(channels, ranges)], frames, loop=loop)
+    table.encode()   # Size check
+    return table
+
+def board_columns(targets):
+    """[(index, board, channel), ...] -> {board: ([index, ...], [channel, ...])}, boards in first-seen order."""
+    columns = {}
+    for idx, board, channel in targets:
+        cols = columns.setdefault(board, ([], []))
+        cols[0].append(idx)
+        cols[1].append(channel)
+    return columns
+
+def compile_gait_cycle(gait, sample_hz=DEFAULT_SAMPLE_HZ, tolerance_deg=DEFAULT_TOLERANCE_DEG):
+    """One cycle of a LegGaitGenerator at its current frequency, as looping tables: {board: GaitTable}."""
+    if gait.frequency <= 0.0:
+        raise GaitTableError("Gait frequency must be positive")
+    period_ms = 1000.0 / gait.frequency
+    n = max(8, int(math.ceil(period_ms * sample_hz / 1000.0)))
+    angles = gait.compute(np.arange(n + 1) / n)    # Sample n is phase 1.0 == phase 0: the wrap point
+    times_ms = np.arange(n + 1) * period_ms / n
+    return {board: compile_table(channels, times_ms, angles[:, cols], loop=True, tolerance_deg=tolerance_deg)
+            for board, (cols, channels) in board_columns(gait.targets).items()}
+
+def compile_trajectory(trajectory, tolerance_deg=DEFAULT_TOLERANCE_DEG):
+    """A CompiledTrajectory (walk <-> roll transformation) as one-shot tables: {board: GaitTable}."""
+    frames = np.asarray(trajectory.frames, dtype=np.float64)
+    times_ms = np.arange(len(frames)) * 1000.0 / trajectory.rate_hz
+    targets = [(i, board, channel) for i, (board, channel) in enumerate(trajectory.keys)]
+    return {board: compile_table(channels, times_ms, frames[:, cols], tolerance_deg=tolerance_deg)
+            for board, (cols, channels) in board_columns(targets).items()}
+
+# -------------------------------------------------------------------------------
+# REFERENCE INTERPRETER (Bit-For-Bit The Slave's Gait Player)
+# -------------------------------------------------------------------------------
+class GaitTableInterpreter:
+    """
+    Angles a slave commands t_ms into playback, with the firmware's arithmetic: integer milliseconds (its
+    millis() clock), q interpolated linearly between keyframes, then mapped through the channel's min / span.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.durations = [d for d, _ in table.frames]
+        self.intro_ms = sum(self.durations[:table.loop_start])
+        self.loop_ms = sum(self.durations[table.loop_start:])
+
+    def position(self, t_ms):
+        """(frame, next frame, elapsed ms in the segment, finished) at t_ms."""
+        table = self.table
+        last = len(table.frames) - 1
+        t_ms = int(t_ms)
+        if t_ms >= self.intro_ms and table.loop:
+            if self.loop_ms <= 0:
+                return table.loop_start, table.loop_start, 0, False
+            passes, t_ms = divmod(t_ms - self.intro_ms, self.loop_ms)
+            if table.loop_count and passes >= table.loop_count:
+                return table.loop_start, table.loop_start, 0, True
+            frame = table.loop_start
+        else:
+            frame = 0
+        while frame < last and t_ms >= self.durations[frame]:
+            t_ms -= self.durations[frame]
+            frame += 1
+        if frame == last:
+            if not table.loop:
+                return last, last, 0, True
+            return last, table.loop_start, t_ms, False
+        return frame, frame + 1, t_ms, False
+
+    def angles_at(self, t_ms):
+        """[(channel, angle), ...] at t_ms; the segment's start angle when it has no duration."""
+        frame, nxt, elapsed, _ = self.position(t_ms)
+        duration = self.durations[frame]
+        q0, q1 = self.table.frames[frame][1], self.table.frames[nxt][1]
+        out = []
+        for i, (channel, _, _) in enumerate(self.table.channels):
+            q = q0[i] + (q1[i] - q0[i]) * elapsed / duration if duration else q0[i]
+            out.append((channel, self.table.angle(i, q)))
+        return out
+
+    def finished(self, t_ms):
+        return self.position(t_ms)[3]
+
+def table_error(table, times_ms, reference):
+    """(max, rms) error in degrees of a table's playback against reference (T, N) sampled at times_ms."""
+    interp = GaitTableInterpreter(table)
+    played = np.array([[a for _, a in interp.angles_at(t)] for t in np.rint(times_ms).astype(np.int64)])
+    err = np.abs(played - np.asarray(reference, dtype=np.float64))
+    return float(err.max()), float(np.sqrt((err ** 2).mean()))
+
+def check_gait_cycle(tables, gait, cycles=2, sample_hz=DEFAULT_SAMPLE_HZ):
+    """Plays tables for several cycles against the generator itself: {board: (max_err_deg, rms_err_deg)}."""
+    period_ms = 1000.0 / gait.frequency
+    times_ms = np.arange(0.0, cycles * period_ms, 1000.0 / sample_hz)
+    # Table time is whole milliseconds, so compare against the generator at those same instants
+    angles = gait.compute(np.rint(times_ms) / period_ms % 1.0)
+    return {board: table_error(tables[board], times_ms, angles[:, cols])
+            for board, (cols, _) in board_columns(gait.targets).items() if board in tables}
+
+def check_trajectory(tables, trajectory):
+    frames = np.asarray(trajectory.frames, dtype=np.float64)
+    times_ms = np.arange(len(frames)) * 1000.0 / trajectory.rate_hz
+    targets = [(i, board, channel) for i, (board, channel) in enumerate(trajectory.keys)]
+    return {board: table_error(tables[board], times_ms, frames[:, cols])
+            for board, (cols, _) in board_columns(targets).items() if board in tables}
+
+# -------------------------------------------------------------------------------
+# UPLOAD (GAIT_BEGIN -> Reliable TABLE_CHUNK Frames -> GAIT_COMMIT, Per Slave)
+# -------------------------------------------------------------------------------
+UPLOAD_IDLE = "idle"
+UPLOAD_BEGIN = "begin"
+UPLOAD_CHUNKS = "chunks"
+UPLOAD_COMMIT = "commit"
+UPLOAD_DONE = "done"
+UPLOAD_FAILED = "failed"
+VERDICT_TIMEOUT_S = 0.5      # Commit ACKed but its verdict line lost: ask again with GAIT_INFO
+VERDICT_ATTEMPTS = 5
+
+def chunk_table(data, size=TABLE_CHUNK_MAX):
+    return [(offset, data[offset:offset + size]) for offset in range(0, len(data), size)]
+
+class GaitUpload:
+    """
+    Drives one upload of {board: GaitTable} through a BridgeLink (bridge v5+). Every step is a reliable send, so
+    lost chunks are retransmitted and the next step starts only once every slave has ACKed the previous one. The
+    slave answers the commit (and GAIT_INFO) with "GAIT READY <crc> ..." or "GAIT ERROR <reason>"; feed received
+    lines to on_line() and call poll() from any periodic context.
+    """
+
+    def __init__(self, link, tables):
+        self.link = link
+        self.data = {board: table.encode() for board, table in tables.items()}
+        self.crcs = {board: table_crc(data) for board, data in self.data.items()}
+        self.state = UPLOAD_IDLE
+        self.refs = []
+        self.error = None
+        self.t_start = self.t_end = None
+        self.ready = set()
+        self.verdict_due = None
+        self.verdict_attempts = 0
+
+    @property
+    def done(self):
+        return self.state in (UPLOAD_DONE, UPLOAD_FAILED)
+
+    @property
+    def total_bytes(self):
+        return sum(len(data) for data in self.data.values())
+
+    def start(self):
+        self.t_start = time.monotonic()
+        if not self.link.gait_tables_supported():
+            self.fail("bridge does not support gait tables (needs protocol v5 with reliable delivery)")
+            return
+        self.refs = []
+        for board, data in self.data.items():
+            self.refs += self.link.send_command(f"{board} GAIT_BEGIN {len(data)}", reliable=True)
+        self.state = UPLOAD_BEGIN
+
+    def on_line(self, line):
+        """Feed received lines: picks up the slaves' commit verdicts."""
+        for board, tag in (("L", "[LEFT] GAIT "), ("R", "[RIGHT] GAIT ")):
+            if line.startswith(tag) and board in self.data:
+                verdict = line[len(tag):].split()
+                if verdict[:2] == ["READY", f"{self.crcs[board]:08X}"]:
+                    self.ready.add(board)
+                elif verdict[:1] == ["ERROR"] and not self.done:
+                    self.fail(f"{board}: {' '.join(verdict[1:])}")
+
+    def fail(self, reason):
+        self.state = UPLOAD_FAILED
+        self.error = reason
+        self.t_end = time.monotonic()
+
+    def poll(self):
+        """Advances the upload if the current step is fully acknowledged. Returns the state."""
+        if self.done or self.state == UPLOAD_IDLE:
+            return self.state
+        status = [self.link.reliable.status(ref) for ref in self.refs]
+        if any(s in ("failed", "superseded") for s in status):
+            self.fail(f"{self.state} step was not acknowledged")
+            return self.state
+        if self.state == UPLOAD_COMMIT and self.ready >= set(self.data):
+            self.state = UPLOAD_DONE
+            self.t_end = time.monotonic()
+            return self.state
+        if any(s != "delivered" for s in status):
+            return self.state
+        if self.state == UPLOAD_COMMIT:
+            self.poll_verdict()
+            return self.state
+        if self.state == UPLOAD_BEGIN:
+            self.refs = [self.link.send_table_chunk(board, offset, chunk)
+                         for board, data in self.data.items() for offset, chunk in chunk_table(data)]
+            self.state = UPLOAD_CHUNKS
+        elif self.state == UPLOAD_CHUNKS:
+            self.refs = []
+            for board, crc in self.crcs.items():
+                # cmd_struct carries val1 as int32
+                self.refs += self.link.send_command(f"{board} GAIT_COMMIT {crc - (1 << 32) if crc >= 1 << 31 else crc}",
+                                                    reliable=True)
+            self.state = UPLOAD_COMMIT
+        return self.state
+
+    def poll_verdict(self):
+        now = time.monotonic()
+        if self.verdict_due is None:
+            self.verdict_due = now + VERDICT_TIMEOUT_S
+        elif now >= self.verdict_due:
+            if self.verdict_attempts >= VERDICT_ATTEMPTS:
+                self.fail("no commit verdict from " + ", ".join(sorted(set(self.data) - self.ready)))
+                return
+            self.verdict_attempts += 1
+            self.verdict_due = now + VERDICT_TIMEOUT_S
+            for board in sorted(set(self.data) - self.ready):
+                self.link.send_command(f"{board} GAIT_INFO")
+
+    def elapsed_s(self):
+        if self.t_start is None:
+            return 0.0
+        return (self.t_end or time.monotonic()) - self.t_start
+
+# -------------------------------------------------------------------------------
+# CLI: Compile A Gait, Check It And Optionally Write The Tables
+# -------------------------------------------------------------------------------
+def main():
+    from rollopod_leg_gait import LegGaitGenerator, GAIT_NAMES, JOINT_NAMES
+
+    parser = argparse.ArgumentParser(description="Compile a walking gait into per-slave keyframe tables")
+    parser.add_argument("--gait", choices=GAIT_NAMES, default="Tripod")
+    parser.add_argument("--frequency", type=float, default=0.5, help="Gait cycles per second")
+    parser.add_argument("--stride", type=float, default=20.0)
+    parser.add_argument("--lift", type=float, default=25.0)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE_DEG, help="Max keyframe error (deg)")
+    parser.add_argument("--out", help="Directory to write <gait>_<board>.gt tables into")
+    args = parser.parse_args()
+
+    gait = LegGaitGenerator(args.gait, args.frequency, args.stride, args.lift)
+    # Default leg map: the first ten joints on the left slave's channels 0-9, the rest on the right's
+    gait.set_channel_map({name: f"{'L' if i < 10 else 'R'}:CH {i % 10:02d}" for i, name in enumerate(JOINT_NAMES)})
+    tables = compile_gait_cycle(gait, tolerance_deg=args.tolerance)
+    errors = check_gait_cycle(tables, gait)
+    streamed = int(round(100 / args.frequency)) * len(gait.targets) * 3
+    for board, table in tables.items():
+        data = table.encode()
+        max_err, rms_err = errors[board]
+        print(f"{board}: {len(table.channels)} channels, {len(table.frames)} keyframes, {len(data)} bytes, "
+              f"crc {table_crc(data):08X}, max err {max_err:.2f} deg, rms {rms_err:.2f} deg")
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            with open(os.path.join(args.out, f"{args.gait.lower()}_{board}.gt"), "wb") as f:
+                f.write(data)
+    print(f"One cycle streamed at 100 Hz: ~{streamed} frame bytes, every cycle")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Rollopod Vectorized Walking Gait Generator
+Computes all 20 leg joint angles per tick as one NumPy array operation for tripod, wave and ripple gaits.
+Joint roles and direction signs follow the hand-written tables in Firmware/new/Control2ServoDriver1Cytron/motion.h.
+"""
+
+import numpy as np
+
+# -------------------------------------------------------------------------------
+# JOINT MODEL (Index order matches LEG_SERVOS in servo_controller_gui.py)
+# -------------------------------------------------------------------------------
+LEGS = ["Left Front", "Left Middle", "Left Rear", "Right Front", "Right Middle", "Right Rear"]
+
+ROLE_SWING = 1   # Coxa: moves the foot forward / backward
+ROLE_LIFT = 2    # Femur (Patella on the middle legs): raises the foot
+ROLE_HOLD = 0    # Tibia / spare joints: held at the base pose
+
+# (servo name, leg index, role, sign) - sign maps "+forward" / "+up" onto the servo direction
+JOINT_TABLE = [
+    ("Left Front Coxa",      0, ROLE_SWING, +1),
+    ("Left Front Femur",     0, ROLE_LIFT,  +1),
+    ("Left Front Tibia",     0, ROLE_HOLD,   0),
+    ("Left Middle Coxa",     1, ROLE_SWING, +1),
+    ("Left Middle Femur",    1, ROLE_HOLD,   0),
+    ("Left Middle Patella",  1, ROLE_LIFT,  -1),
+    ("Left Middle Tibia",    1, ROLE_HOLD,   0),
+    ("Left Rear Coxa",       2, ROLE_SWING, +1),
+    ("Left Rear Femur",      2, ROLE_LIFT,  +1),
+    ("Left Rear Tibia",      2, ROLE_HOLD,   0),
+    ("Right Front Coxa",     3, ROLE_SWING, -1),
+    ("Right Front Femur",    3, ROLE_LIFT,  +1),
+    ("Right Front Tibia",    3, ROLE_HOLD,   0),
+    ("Right Middle Coxa",    4, ROLE_SWING, -1),
+    ("Right Middle Femur",   4, ROLE_HOLD,   0),
+    ("Right Middle Patella", 4, ROLE_LIFT,  +1),
+    ("Right Middle Tibia",   4, ROLE_HOLD,   0),
+    ("Right Rear Coxa",      5, ROLE_SWING, -1),
+    ("Right Rear Femur",     5, ROLE_LIFT,  +1),
+    ("Right Rear Tibia",     5, ROLE_HOLD,   0),
+]
+
+JOINT_NAMES = [j[0] for j in JOINT_TABLE]
+JOINT_LEG = np.array([j[1] for j in JOINT_TABLE], dtype=np.intp)
+JOINT_SWING_SIGN = np.array([j[3] if j[2] == ROLE_SWING else 0 for j in JOINT_TABLE], dtype=np.float64)
+JOINT_LIFT_SIGN = np.array([j[3] if j[2] == ROLE_LIFT else 0 for j in JOINT_TABLE], dtype=np.float64)
+
+# -------------------------------------------------------------------------------
+# GAIT PATTERNS: per-leg phase offset (cycles) + duty factor (stance fraction)
+# Leg order: LF, LM, LR, RF, RM, RR
+# -------------------------------------------------------------------------------
+GAIT_PATTERNS = {
+    # Two alternating tripods: (RF, LM, RR) then (LF, RM, LR), as in motion.h FORWARD_SEQUENCE
+    "Tripod": (np.array([0.5, 0.0, 0.5, 0.0, 0.5, 0.0]), 0.5),
+    # One leg in swing at a time, rear-to-front on each side
+    "Wave":   (np.array([2.0, 1.0, 0.0, 5.0, 4.0, 3.0]) / 6.0, 5.0 / 6.0),
+    # Per-side wave with the two sides half a cycle apart
+    "Ripple": (np.array([4.0, 2.0, 0.0, 1.0, 5.0, 3.0]) / 6.0, 2.0 / 3.0),
+}
+GAIT_NAMES = list(GAIT_PATTERNS)
+
+class LegGaitGenerator:
+    def __init__(self, gait="Tripod", frequency=0.5, stride_deg=20.0, lift_deg=25.0):
+        self.base_pose = np.full(len(JOINT_TABLE), 90.0)
+        self.frequency = frequency      # Gait cycles per second
+        self.stride_deg = stride_deg    # Coxa half-stroke amplitude
+        self.lift_deg = lift_deg        # Peak femur lift during swing
+        self.phase = 0.0
+        self.set_gait(gait)
+        self.targets = []               # [(joint index, board, channel), ...] for mapped joints
+
+    def set_gait(self, gait):
+        offsets, duty = GAIT_PATTERNS[gait]
+        self.gait = gait
+        self.joint_offsets = offsets[JOINT_LEG]
+        self.duty = duty
+
+    def set_base_pose(self, angles):
+        self.base_pose = np.asarray(angles, dtype=np.float64).copy()
+
+    def set_channel_map(self, leg_channel_map):
+        """Resolve servo names to (board, channel) through the GUI's leg_channel_map ("L:CH 03" style keys)."""
+        targets = []
+        for idx, name in enumerate(JOINT_NAMES):
+            key_str = leg_channel_map.get(name, "Unassigned")
+            if not key_str or ":" not in key_str:
+                continue
+            board, ch_str = key_str.split(":", 1)
+            try:
+                targets.append((idx, board.strip(), int(ch_str.replace("CH", "").strip())))
+            except ValueError:
+                continue
+        self.targets = targets
+
+    def reset(self):
+        self.phase = 0.0
+
+    def compute(self, phases):
+        """
+        Joint angles for one phase (scalar -> shape (20,)) or many phases at once (shape (T,) -> (T, 20)).
+        Swing: coxa sweeps back-to-front while the femur lifts on a half sine. Stance: coxa sweeps front-to-back.
+        """
+        phases = np.asarray(phases, dtype=np.float64)
+        phi = (phases[..., None] + self.joint_offsets) % 1.0
+
+        swing_frac = 1.0 - self.duty
+        in_swing = phi < swing_frac
+        s_swing = phi / swing_frac
+        s_stance = (phi - swing_frac) / self.duty
+
+        sweep = np.where(in_swing, 2.0 * s_swing - 1.0, 1.0 - 2.0 * s_stance)
+        lift = np.where(in_swing, np.sin(np.pi * s_swing), 0.0)
+
+        angles = (self.base_pose
+                  + JOINT_SWING_SIGN * self.stride_deg * sweep
+                  + JOINT_LIFT_SIGN * self.lift_deg * lift)
+        return np.clip(angles, 0.0, 180.0)
+
+    def to_pairs(self, angles):
+        values = angles.tolist()
+        return [(board, channel, values[idx]) for idx, board, channel in self.targets]
+
+    def tick(self, dt, send_fn):
+        # One control-loop tick: send_fn receives a [(board, channel, angle), ...] batch
+        self.phase = (self.phase + self.frequency * dt) % 1.0
+        angles = self.compute(self.phase)
+        pairs = self.to_pairs(angles)
+        if pairs:
+            send_fn(pairs)
+        return {"phase": self.phase, "gait": self.gait, "angles": angles, "channels": len(pairs)}
@@ -0,0 +1,193 @@
+"""
+Rollopod Link-Adaptive Command Rate
+Continuous estimate of ESP-NOW loss and command latency, and the streaming command rate steered from it. The
+packet-loss tracer (ESP32C6_Packet_Loss/result.txt) shows loss near zero at 100 Hz and ~50 % at 500 Hz once
+airtime saturates, so the rate is run AIMD-style between configured bounds: it creeps up while the link is clean
+and backs off multiplicatively as soon as loss or latency climbs.
+
+Loss evidence, one window at a time (the worst source with enough samples wins):
+    ACKs         sequenced commands ACKed vs expired, reliable deliveries vs retransmits
+    link fails   "[LINK FAIL]" lines from the bridge vs the ESP-NOW packets the host's writes turn into
+    telemetry    samples missing from each slave's MPU stream, against its median sample interval
+Latency: motion-lane enqueue-to-wire wait (UART backlog) and command round trip, whichever is worse.
+
+    rate = LinkRateController(min_hz=10, max_hz=100)
+    rate.note_packets(n, wait_s) / note_link_fail() / note_acks(ok, lost, rtt_s) / on_sample(sample)
+    if rate.update():                      # once per window, from the writer
+        coalescer.set_rate(rate.rate_hz)
+"""
+
+import threading
+import time
+from collections import deque
+
+from rollopod_gait import percentile
+
+DEFAULT_MIN_HZ = 10.0
+DEFAULT_MAX_HZ = 100.0
+DEFAULT_INITIAL_HZ = 50.0
+WINDOW_S = 0.5
+LOSS_HIGH = 0.05            # Back off above this (smoothed) loss
+LOSS_LOW = 0.02             # Probe upwards below it; a DevKit link sits at ~1.7 % even when idle
+LATENCY_HIGH_MS = 30.0
+INCREASE_HZ = 5.0
+DECREASE_FACTOR = 0.7
+DECREASE_COOLDOWN_S = 1.0   # Let the smoothed loss react to one back-off before the next
+LOSS_ALPHA = 0.3
+MIN_SAMPLES = 10            # Per source and window, before its loss fraction counts
+TELEMETRY_GAP_MAX_S = 0.5   # A longer silence is a paused stream, not lost samples
+TELEMETRY_INTERVALS = 50
+TELEMETRY_MIN_INTERVALS = 10   # Before the median interval is trusted
+HISTORY = 240               # Windows kept for display (2 minutes)
+
+class TelemetryGapCounter:
+    """
+    Missing samples in one slave's MPU stream. Arrival jitter (USB latency timers can hold a line for ~16 ms)
+    is absorbed by accumulating expected-minus-received arrivals and only counting whole samples.
+    """
+
+    def __init__(self):
+        self.last_t = None
+        self.intervals = deque(maxlen=TELEMETRY_INTERVALS)
+        self.phase = 0.0
+
+    def feed(self, t):
+        """Returns (received, missing) for this sample."""
+        last, self.last_t = self.last_t, t
+        if last is None:
+            return 1, 0
+        dt = t - last
+        if dt > TELEMETRY_GAP_MAX_S:
+            self.phase = 0.0
+            return 1, 0
+        self.intervals.append(dt)
+        if len(self.intervals) < TELEMETRY_MIN_INTERVALS:
+            return 1, 0
+        nominal = percentile(sorted(self.intervals), 50)
+        if nominal <= 0.0:
+            return 1, 0
+        self.phase = max(-1.0, self.phase + dt / nominal - 1.0)
+        missing = int(self.phase + 0.1) if self.phase > 0.0 else 0
+        self.phase -= missing
+        return 1, missing
+
+class LinkRateController:
+    """Thread-safe: the writer notes packets and runs update(), the reader notes ACKs, link fails and samples."""
+
+    def __init__(self, min_hz=DEFAULT_MIN_HZ, max_hz=DEFAULT_MAX_HZ, initial_hz=DEFAULT_INITIAL_HZ):
+        self.lock = threading.Lock()
+        self.min_hz = min_hz
+        self.max_hz = max_hz
+        self.rate_hz = max(min_hz, min(max_hz, initial_hz))
+        self.loss = 0.0               # Smoothed loss fraction
+        self.latency_ms = 0.0         # Last window's latency
+        self.sources = {}             # Last window's loss fraction per source that had enough samples
+        self.gaps = {"L": TelemetryGapCounter(), "R": TelemetryGapCounter()}
+        self.history = deque(maxlen=HISTORY)   # (t, rate_hz, loss, latency_ms)
+        self.increases = 0
+        self.decreases = 0
+        self.next_update = 0.0
+        self.last_decrease = -DECREASE_COOLDOWN_S
+        self.reset_window()
+
+    def reset_window(self):
+        self.acked = self.ack_lost = 0
+        self.packets = self.link_fails = 0
+        self.telem_rx = self.telem_missing = 0
+        self.wait_sum = 0.0
+        self.wait_n = 0
+        self.rtt_sum = 0.0
+        self.rtt_n = 0
+
+    def set_bounds(self, min_hz=None, max_hz=None):
+        with self.lock:
+            if min_hz is not None:
+                self.min_hz = float(min_hz)
+            if max_hz is not None:
+                self.max_hz = float(max_hz)
+            self.max_hz = max(self.min_hz, self.max_hz)
+            self.rate_hz = max(self.min_hz, min(self.max_hz, self.rate_hz))
+
+    # ---------------------------------------------------------------------------
+    # EVIDENCE
+    # ---------------------------------------------------------------------------
+    def note_packets(self, packets, wait_s=None):
+        """One write reached the port: the ESP-NOW packets it becomes, and its queue wait if it was motion."""
+        with self.lock:
+            self.packets += packets
+            if wait_s is not None:
+                self.wait_sum += wait_s
+                self.wait_n += 1
+
+    def note_link_fail(self):
+        with self.lock:
+            self.link_fails += 1
+
+    def note_acks(self, acked=0, lost=0, rtt_s=None):
+        with self.lock:
+            self.acked += acked
+            self.ack_lost += lost
+            if rtt_s is not None:
+                self.rtt_sum += rtt_s
+                self.rtt_n += 1
+
+    def on_sample(self, sample):
+        # Telemetry callback (reader thread); untagged samples cannot be attributed to a stream
+        gaps = self.gaps.get(sample.board)
+        if gaps is None:
+            return
+        with self.lock:
+            received, missing = gaps.feed(sample.t)
+            self.telem_rx += received
+            self.telem_missing += missing
+
+    # ---------------------------------------------------------------------------
+    # CONTROL
+    # ---------------------------------------------------------------------------
+    def window_sources(self):
+        sources = {}
+        if self.acked + self.ack_lost >= MIN_SAMPLES:
+            sources["ack"] = self.ack_lost / (self.acked + self.ack_lost)
+        if self.packets >= MIN_SAMPLES:
+            sources["link"] = min(1.0, self.link_fails / self.packets)
+        if self.telem_rx + self.telem_missing >= MIN_SAMPLES:
+            sources["telemetry"] = self.telem_missing / (self.telem_rx + self.telem_missing)
+        return sources
+
+    def update(self, now=None):
+        """Closes the window when due and steps the rate. Returns True if rate_hz changed."""
+        now = time.monotonic() if now is None else now
+        if now < self.next_update:
+            return False
+        with self.lock:
+            self.next_update = now + WINDOW_S
+            sources = self.window_sources()
+            wait_ms = 1000.0 * self.wait_sum / self.wait_n if self.wait_n else 0.0
+            rtt_ms = 1000.0 * self.rtt_sum / self.rtt_n if self.rtt_n else 0.0
+            self.reset_window()
+
+            self.sources = sources
+            self.latency_ms = max(wait_ms, rtt_ms)
+            if sources:
+                self.loss += LOSS_ALPHA * (max(sources.values()) - self.loss)
+            old = self.rate_hz
+            if self.loss > LOSS_HIGH or self.latency_ms > LATENCY_HIGH_MS:
+                if now - self.last_decrease >= DECREASE_COOLDOWN_S:
+                    self.rate_hz = max(self.min_hz, self.rate_hz * DECREASE_FACTOR)
+                    self.last_decrease = now
+            elif sources and self.loss < LOSS_LOW and self.latency_ms < LATENCY_HIGH_MS / 2:
+                # Only probe upwards on evidence: an idle link says nothing about a faster one
+                self.rate_hz = min(self.max_hz, self.rate_hz + INCREASE_HZ)
+            if self.rate_hz > old:
+                self.increases += 1
+            elif self.rate_hz < old:
+                self.decreases += 1
+            self.history.append((now, self.rate_hz, self.loss, self.latency_ms))
+            return self.rate_hz != old
+
+    def stats(self):
+        with self.lock:
+            return {"rate_hz": self.rate_hz, "min_hz": self.min_hz, "max_hz": self.max_hz,
+                    "loss_pct": self.loss * 100.0, "latency_ms": self.latency_ms,
+                    "sources": {name: frac * 100.0 for name, frac in self.sources.items()},
+                    "increases": self.increases, "decreases": self.decreases}
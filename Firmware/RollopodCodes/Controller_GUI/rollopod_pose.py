@@ -0,0 +1,195 @@
+"""
+Rollopod Pose Transitions
+Minimum-jerk interpolation between two poses, streamed as angle batches from the real-time control loop,
+plus the staged walk <-> roll transformation planner with an on-disk trajectory cache.
+"""
+
+import hashlib
+import json
+import math
+import os
+
+def minimum_jerk(s):
+    # 10s^3 - 15s^4 + 6s^5: zero velocity and acceleration at both ends
+    s = max(0.0, min(1.0, s))
+    return s * s * s * (10.0 + s * (-15.0 + 6.0 * s))
+
+def send_pose(send_fn, angles, final):
+    pairs = [(board, channel, angle) for (board, channel), angle in angles.items()]
+    if final:
+        send_fn(pairs, reliable=True)
+    else:
+        send_fn(pairs)
+
+class PoseTransition:
+    """
+    Moves every channel in target from its start angle to its target angle over duration_s.
+    Poses are dicts keyed by (board, channel). Runs as a finite gait on ControlLoopThread.
+    """
+
+    def __init__(self, start, target, duration_s=1.0, name="Pose"):
+        self.name = name
+        self.keys = list(target)
+        self.start = [float(start.get(k, target[k])) for k in self.keys]
+        self.delta = [float(target[k]) - a for k, a in zip(self.keys, self.start)]
+        self.duration_s = max(0.0, float(duration_s))
+        self.t = 0.0
+
+    def reset(self):
+        self.t = 0.0
+
+    def angles_at(self, t):
+        blend = minimum_jerk(t / self.duration_s) if self.duration_s > 0.0 else 1.0
+        return {k: a + d * blend for k, a, d in zip(self.keys, self.start, self.delta)}
+
+    def tick(self, dt, send_fn):
+        # One control-loop tick: send_fn receives a [(board, channel, angle), ...] batch; the final one is
+        # sent with reliable=True so the pose the robot comes to rest in is retransmitted until ACKed
+        self.t = min(self.duration_s, self.t + dt)
+        angles = self.angles_at(self.t)
+        progress = self.t / self.duration_s if self.duration_s > 0.0 else 1.0
+        send_pose(send_fn, angles, progress >= 1.0)
+        return {"name": self.name, "t": self.t, "progress": progress, "angles": angles, "done": progress >= 1.0}
+
+# -------------------------------------------------------------------------------
+# WALK <-> ROLL TRANSFORMATION PLANNER (Staged, Speed-Limited, Cached On Disk)
+# -------------------------------------------------------------------------------
+JOINT_ROLES = ["Coxa", "Femur", "Patella", "Tibia", "Other"]
+
+# Coxa swings clear first, then the femur/patella fold, then the tibia locks the ring
+DEFAULT_STAGE_ORDER = [["Coxa"], ["Femur", "Patella"], ["Tibia"], ["Other"]]
+DEFAULT_SPEED_LIMITS = {"Coxa": 90.0, "Femur": 90.0, "Patella": 90.0, "Tibia": 120.0, "Other": 90.0}
+
+# Peak velocity of a minimum-jerk move is 1.875 * distance / duration
+MIN_JERK_PEAK_VELOCITY = 1.875
+
+def joint_role(servo_name):
+    last = servo_name.split()[-1] if servo_name else ""
+    return last if last in JOINT_ROLES else "Other"
+
+class CompiledTrajectory:
+    def __init__(self, keys, rate_hz, frames, stages):
+        self.keys = keys            # [(board, channel), ...]
+        self.rate_hz = rate_hz
+        self.frames = frames        # [[angle per key], ...] sampled at rate_hz, last frame = target
+        self.stages = stages        # [(stage roles, start_s, duration_s), ...]
+
+    @property
+    def duration_s(self):
+        return (len(self.frames) - 1) / self.rate_hz
+
+    def to_dict(self):
+        return {"keys": [f"{b}:{ch}" for b, ch in self.keys], "rate_hz": self.rate_hz,
+                "frames": [[round(a, 2) for a in f] for f in self.frames], "stages": self.stages}
+
+    @classmethod
+    def from_dict(cls, data):
+        keys = [(k.split(":")[0], int(k.split(":")[1])) for k in data["keys"]]
+        stages = [(list(roles), start, dur) for roles, start, dur in data["stages"]]
+        return cls(keys, data["rate_hz"], data["frames"], stages)
+
+class TransformationPlanner:
+    """
+    Plans a staged move between two poses: stages run in order, joints inside a stage move together on
+    minimum-jerk profiles, and each stage lasts exactly as long as its slowest joint needs under its speed limit.
+    """
+
+    def __init__(self, speed_limits=None, stage_order=None, rate_hz=50, cache_dir="trajectory_cache"):
+        self.speed_limits = dict(DEFAULT_SPEED_LIMITS, **(speed_limits or {}))
+        self.stage_order = stage_order or DEFAULT_STAGE_ORDER
+        self.rate_hz = rate_hz
+        self.cache_dir = cache_dir
+
+    def cache_key(self, start, target, roles):
+        blob = json.dumps({
+            "start": sorted((f"{b}:{ch}", round(a, 1)) for (b, ch), a in start.items() if (b, ch) in target),
+            "target": sorted((f"{b}:{ch}", round(a, 1)) for (b, ch), a in target.items()),
+            "roles": sorted((f"{b}:{ch}", r) for (b, ch), r in roles.items() if (b, ch) in target),
+            "limits": sorted(self.speed_limits.items()),
+            "order": self.stage_order,
+            "rate": self.rate_hz,
+        }, sort_keys=True)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+    def plan(self, start, target, roles):
+        keys = list(target)
+        start_vals = [float(start.get(k, target[k])) for k in keys]
+        target_vals = [float(target[k]) for k in keys]
+        key_roles = [roles.get(k, "Other") for k in keys]
+
+        # Stage timing: time-optimal per stage given the slowest joint's speed limit
+        stages = []
+        t_cursor = 0.0
+        for stage_roles in self.stage_order:
+            idx = [i for i, r in enumerate(key_roles) if r in stage_roles]
+            if not idx:
+                continue
+            duration = max(MIN_JERK_PEAK_VELOCITY * abs(target_vals[i] - start_vals[i]) / self.speed_limits.get(key_roles[i], 90.0)
+                           for i in idx)
+            if duration <= 0.0:
+                continue
+            stages.append((list(stage_roles), t_cursor, duration))
+            t_cursor += duration
+
+        n_frames = max(1, int(math.ceil(t_cursor * self.rate_hz))) + 1
+        frames = []
+        for f in range(n_frames):
+            t = min(t_cursor, f / self.rate_hz)
+            frame = list(start_vals)
+            for stage_roles, t0, dur in stages:
+                blend = minimum_jerk((t - t0) / dur)
+                for i, r in enumerate(key_roles):
+                    if r in stage_roles:
+                        frame[i] = start_vals[i] + (target_vals[i] - start_vals[i]) * blend
+            frames.append(frame)
+        frames[-1] = list(target_vals)
+        return CompiledTrajectory(keys, self.rate_hz, frames, stages)
+
+    def plan_cached(self, start, target, roles):
+        """Returns (trajectory, cache_hit)."""
+        key = self.cache_key(start, target, roles)
+        path = os.path.join(self.cache_dir, f"transform_{key}.json")
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    return CompiledTrajectory.from_dict(json.load(f)), True
+            except (OSError, ValueError, KeyError):
+                pass
+
+        trajectory = self.plan(start, target, roles)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(trajectory.to_dict(), f)
+        except OSError as e:
+            print(f"[TRAJECTORY CACHE ERROR] {e}")
+        return trajectory, False
+
+class TrajectoryPlayer:
+    """Replays a CompiledTrajectory on ControlLoopThread, blending in from the current pose if it differs."""
+
+    def __init__(self, trajectory, current=None, name="Transformation", lead_in_s=0.5):
+        self.trajectory = trajectory
+        self.name = name
+        first = dict(zip(trajectory.keys, trajectory.frames[0]))
+        needs_lead_in = current and any(abs(current.get(k, a) - a) > 1.0 for k, a in first.items())
+        self.lead_in = PoseTransition(current, first, lead_in_s) if needs_lead_in else None
+        self.lead_in_s = lead_in_s if needs_lead_in else 0.0
+        self.t = 0.0
+
+    def reset(self):
+        self.t = 0.0
+
+    def tick(self, dt, send_fn):
+        self.t += dt
+        if self.t < self.lead_in_s:
+            angles = self.lead_in.angles_at(self.t)
+        else:
+            traj = self.trajectory
+            idx = min(len(traj.frames) - 1, int(round((self.t - self.lead_in_s) * traj.rate_hz)))
+            angles = dict(zip(traj.keys, traj.frames[idx]))
+        total = self.lead_in_s + self.trajectory.duration_s
+        progress = min(1.0, self.t / total) if total > 0.0 else 1.0
+        send_pose(send_fn, angles, self.t >= total)
+        return {"name": self.name, "t": self.t, "progress": progress, "angles": angles,
+                "done": self.t >= total}
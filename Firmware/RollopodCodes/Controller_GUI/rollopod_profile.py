@@ -0,0 +1,152 @@
+"""
+Rollopod Profile Store
+Versioned file for everything the GUI persists: settings, named poses, gait presets and calibration sets.
+
+File layout (v2, PROFILE_EXT ".rprof"; not JSON as a whole): a header line, then one "<section>\\t<compact JSON>"
+line per section:
+
+    {"format": "rollopod-profile", "version": 2}
+    settings	{"leg_channels": {...}, "invert_left_motor": false, ...}
+    poses	{"Standing": {"L:CH 00": 90.0, ...}, "Crouch": {...}}
+    gait_presets	{"Slow Waddle": {...}}
+    calibration_sets	{"Bench": {<settings.json layout>}}
+
+Sections stay as raw text until first accessed, so a load only parses what the caller uses, and a save
+re-serialises only the sections changed since the last write. Saves go to a temp file that is renamed
+over the profile, so an interrupted write never leaves a half-written file. v1 profiles (one indented
+JSON object with leg_channels / standing_angles / motor flags, in a .json file) are migrated on load: they are
+read once and left in place, and the first save writes the .rprof beside them.
+"""
+
+import json
+import os
+
+PROFILE_FORMAT = "rollopod-profile"
+PROFILE_VERSION = 2
+PROFILE_EXT = ".rprof"
+LEGACY_EXT = ".json"
+
+SECTION_SETTINGS = "settings"
+SECTION_POSES = "poses"
+SECTION_GAIT_PRESETS = "gait_presets"
+SECTION_CALIBRATION_SETS = "calibration_sets"
+SECTION_ORDER = [SECTION_SETTINGS, SECTION_POSES, SECTION_GAIT_PRESETS, SECTION_CALIBRATION_SETS]
+
+STANDING_POSE = "Standing"
+V1_SETTINGS_KEYS = ("leg_channels", "invert_left_motor", "invert_right_motor", "sync_motors")
+
+def migrate_v1(data):
+    """Split a v1 profile dict into v2 sections."""
+    sections = {SECTION_SETTINGS: {k: data[k] for k in V1_SETTINGS_KEYS if k in data}}
+    if "standing_angles" in data:
+        sections[SECTION_POSES] = {STANDING_POSE: dict(data["standing_angles"])}
+    return sections
+
+def profile_path(path):
+    """The v2 profile a path saves to: a legacy .json profile maps to the .rprof beside it."""
+    root, ext = os.path.splitext(path)
+    return root + PROFILE_EXT if ext.lower() == LEGACY_EXT else path
+
+class ProfileStore:
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path   # Read (never written) when path does not exist yet
+        self.source = None               # File the last load() read, if any
+        self.raw = {}        # section -> JSON text as last read / written
+        self.parsed = {}     # section -> dict, only for sections accessed since load
+        self.dirty = set()
+        self.migrated = False
+
+    def load(self, source=None):
+        """
+        Reads source (default: path, else legacy_path) and splits it into sections without parsing them.
+        Anything read from another file than path is marked migrated and dirty, so the next save writes all of
+        it to path. A missing file is an empty profile.
+        """
+        self.raw, self.parsed, self.dirty = {}, {}, set()
+        self.migrated = False
+        self.source = None
+        if source is None:
+            source = self.path
+            if not os.path.exists(source) and self.legacy_path and os.path.exists(self.legacy_path):
+                source = self.legacy_path
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return
+        self.source = source
+
+        header_line, _, body = text.partition("\n")
+        try:
+            header = json.loads(header_line)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != PROFILE_FORMAT:
+            # v1: a single (indented) JSON object
+            self.parsed = migrate_v1(json.loads(text))
+            self.dirty = set(self.parsed)
+            self.migrated = True
+            return
+        if header.get("version", 0) > PROFILE_VERSION:
+            raise ValueError(f"{source} is a v{header['version']} profile; this GUI reads up to v{PROFILE_VERSION}")
+
+        for line in body.split("\n"):
+            name, sep, payload = line.partition("\t")
+            if sep:
+                self.raw[name] = payload
+        if source != self.path:
+            self.dirty = set(self.raw)
+            self.migrated = True
+
+    def section(self, name):
+        """The section's dict (parsed on first use). Mutate it in place, then call mark_dirty(name)."""
+        if name not in self.parsed:
+            payload = self.raw.get(name)
+            self.parsed[name] = json.loads(payload) if payload else {}
+        return self.parsed[name]
+
+    def mark_dirty(self, name):
+        self.dirty.add(name)
+
+    # ---------------------------------------------------------------------------
+    # NAMED ENTRIES (poses, gait presets, calibration sets)
+    # ---------------------------------------------------------------------------
+    def names(self, name):
+        return sorted(self.section(name))
+
+    def get_entry(self, name, key, default=None):
+        return self.section(name).get(key, default)
+
+    def put_entry(self, name, key, value):
+        self.section(name)[key] = value
+        self.dirty.add(name)
+
+    def delete_entry(self, name, key):
+        if self.section(name).pop(key, None) is not None:
+            self.dirty.add(name)
+
+    # ---------------------------------------------------------------------------
+    # SAVE (Atomic Write-And-Rename)
+    # ---------------------------------------------------------------------------
+    def save(self):
+        """Writes the profile if anything changed. Returns the number of sections that were re-serialised."""
+        if not self.dirty:
+            return 0
+        for name in self.dirty:
+            self.raw[name] = json.dumps(self.section(name), separators=(",", ":"))
+        written = len(self.dirty)
+
+        names = [n for n in SECTION_ORDER if n in self.raw] + sorted(n for n in self.raw if n not in SECTION_ORDER)
+        lines = [json.dumps({"format": PROFILE_FORMAT, "version": PROFILE_VERSION})]
+        lines += [f"{n}\t{self.raw[n]}" for n in names]
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.dirty.clear()
+        self.migrated = False
+        return written
@@ -0,0 +1,297 @@
+"""
+Rollopod Master Bridge Wire Protocol
+Text command formatting plus the compact binary ANGLE_BATCH / TICK_BATCH frames used to send a whole pose
+in one write.
+
+Binary frame layout (all multi-byte fields little-endian except the CRC):
+
+    +------+------+-----+------+-------+-----------------------+---------+
+    | 0xA5 | 0x5A | LEN | TYPE | COUNT | COUNT x (ADDR, VALUE) | CRC16BE |
+    +------+------+-----+------+-------+-----------------------+---------+
+
+    LEN        number of bytes from TYPE up to (not including) the CRC
+    ADDR       bit 7 = board (0 = Left, 1 = Right), bits 0-3 = PCA channel
+    VALUE      uint16: angle in tenths of a degree (ANGLE_BATCH, 0 - 1800)
+               or a host-calibrated PCA9685 tick (TICK_BATCH, 0 - 4095, bridge v2+)
+    CRC16BE    CRC-16/CCITT-FALSE over LEN..last payload byte, big-endian
+
+SEQ_ANGLE_BATCH / SEQ_TICK_BATCH (bridge v4+) carry (ADDR, VALUE, SEQ uint16) per channel, so every servo in a
+pose is acknowledged, and retransmitted, on its own.
+
+TABLE_CHUNK (bridge v5+) carries a slice of a compiled gait table for one slave: COUNT is the number of data
+bytes, followed by (ADDR, OFFSET uint16, SEQ uint16) and the data. ADDR's channel bits are unused.
+
+Sequenced text commands (bridge v3+): "#<seq> L MOTOR 120" is forwarded with seq attached to the cmd_struct,
+and each addressed slave answers "[LEFT] ACK <seq>" once it has applied the command. From v4 a slave applies a
+repeated seq with the same contents only once (it just ACKs again), so retransmissions are idempotent.
+"""
+
+import struct
+
+# -------------------------------------------------------------------------------
+# FRAME CONSTANTS
+# -------------------------------------------------------------------------------
+FRAME_SOF = b"\xA5\x5A"
+FRAME_TYPE_ANGLE_BATCH = 0x01
+FRAME_TYPE_TICK_BATCH = 0x02
+FRAME_TYPE_SEQ_ANGLE_BATCH = 0x03
+FRAME_TYPE_SEQ_TICK_BATCH = 0x04
+SEQ_FRAME_TYPES = (FRAME_TYPE_SEQ_ANGLE_BATCH, FRAME_TYPE_SEQ_TICK_BATCH)
+FRAME_TYPE_TABLE_CHUNK = 0x05
+FRAME_MAX_PAIRS = 32
+TABLE_CHUNK_MAX = 192     # Data bytes per chunk: fits the slave's table_chunk_struct in one ESP-NOW packet
+FRAME_HEADER_SIZE = 3   # SOF (2) + LEN (1)
+FRAME_CRC_SIZE = 2
+
+# Handshake: host asks "PROTO?", a binary-capable bridge answers "PROTO BIN <version>"
+PROTO_QUERY = "PROTO?"
+PROTO_REPLY_PREFIX = "PROTO BIN"
+PROTO_VERSION = 5
+TICK_BATCH_MIN_VERSION = 2
+SEQ_MIN_VERSION = 3
+RELIABLE_MIN_VERSION = 4  # Sequenced batch frames and duplicate suppression on the slaves
+GAIT_TABLE_MIN_VERSION = 5
+
+SEQ_PREFIX = "#"
+SEQ_MODULO = 65536      # Host sequence numbers wrap; 0 means "not sequenced"
+ACK_WORD = "ACK"
+ACK_BOARD_TAGS = {"[LEFT]": "L", "[RIGHT]": "R"}
+LINK_FAIL_PREFIX = "[LINK FAIL]"   # Printed by the bridge for every ESP-NOW send the slave did not acknowledge
+
+PROTOCOL_TEXT = "text"
+PROTOCOL_BINARY = "binary"
+
+class FrameError(ValueError):
+    pass
+
+def crc16_ccitt(data, crc=0xFFFF):
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+# -------------------------------------------------------------------------------
+# TEXT PROTOCOL (Fallback / Legacy Bridge Firmware)
+# -------------------------------------------------------------------------------
+def format_angle_command(board, channel, angle):
+    return f"{board} ANGLE {channel} {int(angle)}"
+
+def format_angle_batch_text(pairs):
+    return [format_angle_command(board, channel, angle) for board, channel, angle in pairs]
+
+def format_tick_command(board, channel, tick):
+    return f"{board} TICK {channel} {int(tick)}"
+
+def format_tick_batch_text(triples):
+    return [format_tick_command(board, channel, tick) for board, channel, tick in triples]
+
+def format_seq_command(seq, cmd_str):
+    return f"{SEQ_PREFIX}{seq} {cmd_str}"
+
+def split_seq_command(line):
+    """The bridge's side of format_seq_command(): returns (seq, command); seq is 0 for unsequenced lines."""
+    if not line.startswith(SEQ_PREFIX):
+        return 0, line
+    head, _, rest = line.partition(" ")
+    try:
+        return int(head[len(SEQ_PREFIX):]) % SEQ_MODULO, rest.strip()
+    except ValueError:
+        return 0, rest.strip()
+
+def command_boards(cmd_str):
+    """
+    Slaves a text command is addressed to, from its L / R / B prefix. Unprefixed lines give () so bridge-local
+    commands (PROTO?, GET_MAC, PING) are never sequenced.
+    """
+    head = cmd_str.lstrip()[:2]
+    if head in ("L ", "L_"):
+        return ("L",)
+    if head in ("R ", "R_"):
+        return ("R",)
+    if head in ("B ", "B_"):
+        return ("L", "R")
+    return ()
+
+# -------------------------------------------------------------------------------
+# BINARY PROTOCOL (Host Encoder + Python Reference Decoder)
+# -------------------------------------------------------------------------------
+def encode_address(board, channel):
+    if board not in ('L', 'R'):
+        raise FrameError(f"Invalid board '{board}' (expected 'L' or 'R')")
+    if not 0 <= channel < 16:
+        raise FrameError(f"Invalid channel {channel} (expected 0-15)")
+    return (0x80 if board == 'R' else 0x00) | channel
+
+def decode_address(addr):
+    return ('R' if addr & 0x80 else 'L'), addr & 0x0F
+
+def encode_batch(frame_type, entries):
+    """Encode [(board, channel, uint16 value), ...] into a single batch frame of the given type."""
+    entries = list(entries)
+    if not entries:
+        raise FrameError("Batch frame needs at least one channel")
+    if len(entries) > FRAME_MAX_PAIRS:
+        raise FrameError(f"Batch frame holds at most {FRAME_MAX_PAIRS} channels, got {len(entries)}")
+
+    payload = bytearray((frame_type, len(entries)))
+    for board, channel, value in entries:
+        payload += struct.pack("<BH", encode_address(board, channel), value)
+
+    body = bytes((len(payload),)) + payload
+    return FRAME_SOF + body + struct.pack(">H", crc16_ccitt(body))
+
+def encode_seq_batch(frame_type, entries):
+    """Encode [(board, channel, uint16 value, seq), ...] into one SEQ_ANGLE_BATCH / SEQ_TICK_BATCH frame."""
+    entries = list(entries)
+    if not entries:
+        raise FrameError("Batch frame needs at least one channel")
+    if len(entries) > FRAME_MAX_PAIRS:
+        raise FrameError(f"Batch frame holds at most {FRAME_MAX_PAIRS} channels, got {len(entries)}")
+
+    payload = bytearray((frame_type, len(entries)))
+    for board, channel, value, seq in entries:
+        payload += struct.pack("<BHH", encode_address(board, channel), value, seq)
+
+    body = bytes((len(payload),)) + payload
+    return FRAME_SOF + body + struct.pack(">H", crc16_ccitt(body))
+
+def angle_to_wire(angle):
+    return int(round(max(0.0, min(180.0, float(angle))) * 10))
+
+def encode_angle_batch(pairs):
+    """Encode [(board, channel, angle), ...] into a single ANGLE_BATCH frame."""
+    return encode_batch(FRAME_TYPE_ANGLE_BATCH, [(board, channel, angle_to_wire(angle)) for board, channel, angle in pairs])
+
+def encode_tick_batch(triples):
+    """Encode [(board, channel, tick), ...] into a single TICK_BATCH frame (bridge protocol v2+)."""
+    return encode_batch(FRAME_TYPE_TICK_BATCH, [(board, channel, max(0, min(4095, int(tick))))
+                                                for board, channel, tick in triples])
+
+def encode_seq_angle_batch(quads):
+    """Encode [(board, channel, angle, seq), ...] into a single SEQ_ANGLE_BATCH frame (bridge protocol v4+)."""
+    return encode_seq_batch(FRAME_TYPE_SEQ_ANGLE_BATCH, [(board, channel, angle_to_wire(angle), seq)
+                                                         for board, channel, angle, seq in quads])
+
+def encode_seq_tick_batch(quads):
+    """Encode [(board, channel, tick, seq), ...] into a single SEQ_TICK_BATCH frame (bridge protocol v4+)."""
+    return encode_seq_batch(FRAME_TYPE_SEQ_TICK_BATCH, [(board, channel, max(0, min(4095, int(tick))), seq)
+                                                        for board, channel, tick, seq in quads])
+
+def encode_table_chunk(board, offset, data, seq):
+    """Encode one gait table slice for a slave into a TABLE_CHUNK frame (bridge protocol v5+)."""
+    data = bytes(data)
+    if not 0 < len(data) <= TABLE_CHUNK_MAX:
+        raise FrameError(f"Table chunk holds 1-{TABLE_CHUNK_MAX} bytes, got {len(data)}")
+    payload = bytes((FRAME_TYPE_TABLE_CHUNK, len(data))) + struct.pack("<BHH", encode_address(board, 0), offset, seq)
+    body = bytes((len(payload) + len(data),)) + payload + data
+    return FRAME_SOF + body + struct.pack(">H", crc16_ccitt(body))
+
+def decode_frame(frame):
+    """
+    Reference decoder: returns (frame_type, [(board, channel, angle or tick), ...]) or raises FrameError.
+    Entries of sequenced frames carry their seq as a fourth field; a TABLE_CHUNK gives [(board, offset, seq, data)].
+    """
+    frame = bytes(frame)
+    if len(frame) < FRAME_HEADER_SIZE + FRAME_CRC_SIZE or frame[:2] != FRAME_SOF:
+        raise FrameError("Missing start-of-frame marker")
+    length = frame[2]
+    end = FRAME_HEADER_SIZE + length
+    if len(frame) != end + FRAME_CRC_SIZE:
+        raise FrameError(f"Frame length mismatch (LEN={length}, got {len(frame)} bytes)")
+    (crc_rx,) = struct.unpack(">H", frame[end:])
+    if crc16_ccitt(frame[2:end]) != crc_rx:
+        raise FrameError("CRC mismatch")
+
+    payload = frame[FRAME_HEADER_SIZE:end]
+    if len(payload) < 2:
+        raise FrameError("Truncated payload")
+    frame_type, count = payload[0], payload[1]
+    if frame_type == FRAME_TYPE_TABLE_CHUNK:
+        if len(payload) != 7 + count:
+            raise FrameError(f"Payload holds {len(payload) - 7} bytes for a {count} byte chunk")
+        addr, offset, seq = struct.unpack_from("<BHH", payload, 2)
+        return frame_type, [(decode_address(addr)[0], offset, seq, bytes(payload[7:]))]
+    if frame_type not in (FRAME_TYPE_ANGLE_BATCH, FRAME_TYPE_TICK_BATCH) + SEQ_FRAME_TYPES:
+        raise FrameError(f"Unknown frame type 0x{frame_type:02X}")
+    sequenced = frame_type in SEQ_FRAME_TYPES
+    stride = 5 if sequenced else 3
+    if len(payload) != 2 + stride * count:
+        raise FrameError(f"Payload holds {len(payload) - 2} bytes for {count} channels")
+
+    pairs = []
+    for i in range(count):
+        addr, value = struct.unpack_from("<BH", payload, 2 + stride * i)
+        board, channel = decode_address(addr)
+        if frame_type in (FRAME_TYPE_ANGLE_BATCH, FRAME_TYPE_SEQ_ANGLE_BATCH):
+            value = value / 10.0
+        if sequenced:
+            (seq,) = struct.unpack_from("<H", payload, 5 + stride * i)
+            pairs.append((board, channel, value, seq))
+        else:
+            pairs.append((board, channel, value))
+    return frame_type, pairs
+
+class FrameDecoder:
+    """Incremental reference decoder mirroring the bridge firmware's byte-by-byte state machine."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.crc_errors = 0
+
+    def feed(self, data):
+        self.buffer += data
+        frames = []
+        while True:
+            start = self.buffer.find(FRAME_SOF)
+            if start < 0:
+                # Keep a trailing 0xA5 in case the 0x5A arrives with the next chunk
+                del self.buffer[:max(0, len(self.buffer) - 1)]
+                return frames
+            del self.buffer[:start]
+            if len(self.buffer) < FRAME_HEADER_SIZE:
+                return frames
+            total = FRAME_HEADER_SIZE + self.buffer[2] + FRAME_CRC_SIZE
+            if len(self.buffer) < total:
+                return frames
+            try:
+                frames.append(decode_frame(self.buffer[:total]))
+                del self.buffer[:total]
+            except FrameError:
+                self.crc_errors += 1
+                del self.buffer[:1]
+
+def parse_proto_reply(line):
+    """Returns the bridge's binary protocol version from a handshake reply, or None."""
+    line = line.strip()
+    if not line.startswith(PROTO_REPLY_PREFIX):
+        return None
+    try:
+        return int(line[len(PROTO_REPLY_PREFIX):].strip() or PROTO_VERSION)
+    except ValueError:
+        return None
+
+def parse_ack_line(line):
+    """Returns (board, seq) for a slave acknowledgement relayed by the bridge ("[LEFT] ACK 42"), or None."""
+    parts = line.split()
+    if len(parts) != 3 or parts[1] != ACK_WORD or parts[0] not in ACK_BOARD_TAGS:
+        return None
+    try:
+        return ACK_BOARD_TAGS[parts[0]], int(parts[2])
+    except ValueError:
+        return None
+
+def esp_now_packets(data):
+    """How many ESP-NOW sends the bridge makes for one host write: one per channel of a batch frame, one per
+    addressed slave of each text command (bridge-local lines make none)."""
+    if data[:2] == FRAME_SOF:
+        if len(data) < 5:
+            return 0
+        return 1 if data[3] == FRAME_TYPE_TABLE_CHUNK else data[4]
+    packets = 0
+    for line in bytes(data).decode("utf-8", errors="replace").splitlines():
+        packets += len(command_boards(split_seq_command(line.strip())[1]))
+    return packets
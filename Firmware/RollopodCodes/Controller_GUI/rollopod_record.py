@@ -0,0 +1,199 @@
+"""
+Rollopod Command Recorder & Replayer
+Compact binary log of every command sent to the bridge, and a deadline-scheduled replayer that reports timing drift.
+
+Log layout: 8-byte header (b"RPLG", uint16 version, uint16 reserved), then one record per command:
+
+    +-----------+-------+-----+-----+-----------------+
+    | T_US (u4) | BOARD | CMD | LEN | LEN bytes ARGS  |
+    +-----------+-------+-----+-----+-----------------+
+
+    T_US   microseconds since the recording started (monotonic clock), little-endian. u32, so one log covers at
+           most MAX_RECORDING_S (about 71.6 minutes): the recorder stops itself there instead of wrapping
+    BOARD  ASCII board letter ('L', 'R', 'B') or 0 for bridge-level commands
+    CMD    command code (CMD_ANGLE / CMD_MOTOR / CMD_TEXT)
+    ARGS   ANGLE: channel u1 + angle_x10 u2 | MOTOR: speed s2 | TEXT: UTF-8 remainder of the line
+"""
+
+import struct
+import threading
+import time
+
+from rollopod_gait import percentile
+
+LOG_MAGIC = b"RPLG"
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct("<4sHH")
+RECORD_HEADER = struct.Struct("<IcBB")
+
+CMD_TEXT = 0
+CMD_ANGLE = 1
+CMD_MOTOR = 2
+
+BOARDS = ("L", "R", "B")
+MAX_RECORD_US = 0xFFFFFFFF
+MAX_RECORDING_S = MAX_RECORD_US / 1e6
+
+def encode_record(t_us, line):
+    parts = line.strip().split()
+    board = parts[0] if parts and parts[0] in BOARDS else None
+    rest = parts[1:] if board else parts
+    try:
+        if board and len(rest) == 3 and rest[0] == "ANGLE":
+            args = struct.pack("<BH", int(rest[1]), int(round(float(rest[2]) * 10)))
+            return RECORD_HEADER.pack(t_us, board.encode(), CMD_ANGLE, len(args)) + args
+        if board and len(rest) == 2 and rest[0] == "MOTOR":
+            args = struct.pack("<h", int(rest[1]))
+            return RECORD_HEADER.pack(t_us, board.encode(), CMD_MOTOR, len(args)) + args
+    except (ValueError, struct.error):
+        pass
+    args = " ".join(rest).encode("utf-8")[:255]
+    return RECORD_HEADER.pack(t_us, (board or "\0").encode(), CMD_TEXT, len(args)) + args
+
+def decode_record(board_b, cmd, args):
+    """Rebuild the command line for one record."""
+    board = board_b.decode() if board_b != b"\0" else ""
+    if cmd == CMD_ANGLE:
+        channel, angle_x10 = struct.unpack("<BH", args)
+        angle = angle_x10 / 10.0
+        return f"{board} ANGLE {channel} {int(angle) if angle == int(angle) else angle}"
+    if cmd == CMD_MOTOR:
+        (speed,) = struct.unpack("<h", args)
+        return f"{board} MOTOR {speed}"
+    text = args.decode("utf-8", errors="ignore")
+    return f"{board} {text}" if board else text
+
+def load_log(path):
+    """Returns [(t_seconds, command_line), ...] in recorded order."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < LOG_HEADER.size:
+        raise ValueError(f"{path} is too short to be a command log")
+    magic, version, _ = LOG_HEADER.unpack_from(data)
+    if magic != LOG_MAGIC or version != LOG_VERSION:
+        raise ValueError(f"{path} is not a v{LOG_VERSION} Rollopod command log")
+
+    records = []
+    pos = LOG_HEADER.size
+    while pos + RECORD_HEADER.size <= len(data):
+        t_us, board_b, cmd, length = RECORD_HEADER.unpack_from(data, pos)
+        pos += RECORD_HEADER.size
+        if pos + length > len(data):
+            break   # Truncated final record (recording interrupted mid-write)
+        records.append((t_us / 1e6, decode_record(board_b, cmd, data[pos:pos + length])))
+        pos += length
+    return records
+
+# -------------------------------------------------------------------------------
+# RECORDER (Called From Any Thread That Transmits)
+# -------------------------------------------------------------------------------
+class CommandRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+        self.t0 = 0.0
+        self.count = 0
+        self.limit_reached = False
+
+    @property
+    def active(self):
+        return self.file is not None
+
+    def start(self, path):
+        with self.lock:
+            if self.file:
+                self.file.close()
+            self.file = open(path, "wb", buffering=65536)
+            self.file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, 0))
+            self.path = path
+            self.t0 = time.monotonic()
+            self.count = 0
+            self.limit_reached = False
+
+    def record(self, line, now=None):
+        if self.file is None:
+            return
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if self.file is None:
+                return
+            t_us = max(0, int((now - self.t0) * 1e6))
+            if t_us > MAX_RECORD_US:
+                # T_US would wrap and replay would burst the rest out: end the log at the limit instead
+                self.file.close()
+                self.file = None
+                self.limit_reached = True
+                return
+            self.file.write(encode_record(t_us, line))
+            self.count += 1
+
+    def stop(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+            self.file = None
+            return self.count
+
+# -------------------------------------------------------------------------------
+# REPLAYER (Deadline-Scheduled, Drift-Reporting)
+# -------------------------------------------------------------------------------
+class CommandReplayer(threading.Thread):
+    """
+    Re-sends recorded commands on absolute deadlines (recorded time / speed). Commands sharing a timestamp
+    go out back to back; drift is measured per distinct timestamp as actual send time minus scheduled time.
+    """
+
+    def __init__(self, records, send_fn, speed=1.0):
+        super().__init__(daemon=True)
+        self.records = records
+        self.send_fn = send_fn
+        self.speed = speed
+        self.running = True            # Set here, not in run(), so a stop() before the thread starts sticks
+        self.stop_event = threading.Event()
+        self.send_lock = threading.Lock()
+        self.sent = 0
+        self.drift_ms = []
+
+    def stop(self):
+        """Returns once no further command can go out: safe to send a stop right after it."""
+        with self.send_lock:
+            self.running = False
+            self.stop_event.set()
+
+    def wait_until(self, deadline, spin_margin=0.001):
+        # sleep_until() with an interruptible coarse part; False if stop() came first
+        remaining = deadline - time.monotonic()
+        if remaining > spin_margin and self.stop_event.wait(remaining - spin_margin):
+            return False
+        while time.monotonic() < deadline:
+            pass
+        return self.running
+
+    def run(self):
+        start = time.monotonic()
+        last_t = None
+        for t, line in self.records:
+            if t != last_t:
+                deadline = start + t / self.speed
+                if not self.wait_until(deadline):
+                    break
+                self.drift_ms.append((time.monotonic() - deadline) * 1000.0)
+                last_t = t
+            with self.send_lock:
+                if not self.running:
+                    break
+                self.send_fn(line)
+            self.sent += 1
+        self.running = False
+
+    @property
+    def progress(self):
+        return self.sent / len(self.records) if self.records else 1.0
+
+    def drift_stats(self):
+        """Send-time drift in milliseconds: (mean, p99, max)."""
+        drift = sorted(abs(d) for d in list(self.drift_ms))
+        if not drift:
+            return 0.0, 0.0, 0.0
+        return sum(drift) / len(drift), percentile(drift, 99), drift[-1]
@@ -0,0 +1,211 @@
+"""
+Rollopod Reliable Delivery
+Retransmission for the few commands whose loss leaves the robot in the wrong state: motor / torque stops and the
+final frame of a pose. Each is tracked per addressed board under its sequence number and re-sent with the same
+seq (the slaves apply a repeated seq only once and simply ACK it again) on an exponential backoff until that board
+acknowledges it, a newer command for the same motor or servo supersedes it, or RETRANSMIT_MAX_ATTEMPTS run out.
+Gait table uploads use the same path for their steps and TABLE_CHUNK frames. Streaming traffic never enters it.
+
+    sender = ReliableSender()
+    sender.track_text(seq, ("L", "R"), "MOTOR 0")                     # when queued
+    sender.sent([(board, seq), ...], t_wire)                          # on_sent from the TX queue
+    sender.on_ack(board, seq)                                         # reader
+    texts, quads, frames, failed = sender.due()                       # writer: what to re-send now
+    sender.status((board, seq))                                       # "pending", "delivered", "failed", ...
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+from rollopod_gait import percentile
+
+RETRANSMIT_INITIAL_S = 0.05
+RETRANSMIT_MAX_S = 0.8
+RETRANSMIT_MAX_ATTEMPTS = 8        # ~4 s of backoff, inside the slaves' 5 s duplicate window
+UNSENT_GRACE_S = 1.0               # Retransmit even if the first copy never reached the port
+COMPLETED_MEMORY = 1024
+DELIVERY_HISTORY = 1000
+
+SERVO_COMMANDS = ("ANGLE", "TICK")
+
+def command_key(board, cmd_body):
+    """Supersession key for one board: a newer command with the same key makes a pending retransmit obsolete."""
+    parts = cmd_body.split()
+    if not parts:
+        return None
+    name = parts[0].upper()
+    if name in SERVO_COMMANDS:
+        return (board, "SERVO", parts[1] if len(parts) > 1 else "")
+    return (board, name)
+
+def servo_key(board, channel):
+    return (board, "SERVO", str(channel))
+
+class ReliableEntry:
+    __slots__ = ("board", "seq", "key", "text", "quad", "frame_type", "frame", "created", "first_sent", "next_due",
+                 "rto", "attempts")
+
+    def __init__(self, board, seq, key, text=None, quad=None, frame_type=None, frame=None, now=None):
+        self.board = board
+        self.seq = seq
+        self.key = key
+        self.text = text                # "L MOTOR 0" for text commands
+        self.quad = quad                # (board, channel, value, seq) for sequenced batch frames
+        self.frame_type = frame_type
+        self.frame = frame              # Complete encoded frame, re-sent as is (gait table chunks)
+        self.created = time.monotonic() if now is None else now
+        self.first_sent = None
+        self.next_due = self.created + UNSENT_GRACE_S
+        self.rto = RETRANSMIT_INITIAL_S
+        self.attempts = 0
+
+    def describe(self):
+        if self.text is not None:
+            what = self.text
+        elif self.frame is not None:
+            what = f"{self.board} gait table chunk at {self.key[2]}"
+        else:
+            what = f"{self.board} servo {self.quad[1]} final frame"
+        return f"[RELIABLE] No ACK for '{what}' (seq {self.seq}) after {self.attempts} retransmits"
+
+class ReliableSender:
+    """Thread-safe; the writer calls sent() / due(), the reader on_ack(), senders track_*() and supersede()."""
+
+    def __init__(self, initial_s=RETRANSMIT_INITIAL_S, max_s=RETRANSMIT_MAX_S, max_attempts=RETRANSMIT_MAX_ATTEMPTS):
+        self.initial_s = initial_s
+        self.max_s = max_s
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.pending = {}                  # (board, seq) -> ReliableEntry
+        self.by_key = {}                   # supersession key -> (board, seq)
+        self.completed = OrderedDict()     # (board, seq) of finished entries -> outcome, so late ACKs are recognised
+        self.delivery_times = deque(maxlen=DELIVERY_HISTORY)
+        self.counts = {"tracked": 0, "delivered": 0, "retransmits": 0, "superseded": 0, "failed": 0}
+
+    def add(self, entry):
+        with self.lock:
+            old = self.by_key.get(entry.key)
+            if old is not None and self.pending.pop(old, None) is not None:
+                self.counts["superseded"] += 1
+                self.remember(old, "superseded")
+            entry.rto = self.initial_s
+            self.pending[(entry.board, entry.seq)] = entry
+            self.by_key[entry.key] = (entry.board, entry.seq)
+            self.counts["tracked"] += 1
+
+    def track_text(self, seq, boards, cmd_body):
+        """A sequenced text command ("MOTOR 0", without the board prefix) addressed to boards."""
+        for board in boards:
+            self.add(ReliableEntry(board, seq, command_key(board, cmd_body), text=f"{board} {cmd_body}"))
+
+    def track_quads(self, frame_type, quads):
+        """Entries [(board, channel, value, seq), ...] of a sequenced batch frame."""
+        for quad in quads:
+            board, channel, _, seq = quad
+            self.add(ReliableEntry(board, seq, servo_key(board, channel), quad=quad, frame_type=frame_type))
+
+    def track_frame(self, board, seq, key, frame):
+        """A complete frame for one board (a gait table chunk), ACKed under seq."""
+        self.add(ReliableEntry(board, seq, key, frame=frame))
+
+    def sent(self, refs, t_wire):
+        """First copy of these (board, seq) entries reached the port: start their retransmit clocks."""
+        with self.lock:
+            for ref in refs:
+                entry = self.pending.get(ref)
+                if entry is not None and entry.first_sent is None:
+                    entry.first_sent = t_wire
+                    entry.next_due = t_wire + entry.rto
+
+    def supersede(self, keys):
+        """Drops pending retransmits for these keys (a newer fire-and-forget command was just queued for them)."""
+        with self.lock:
+            for key in keys:
+                ref = self.by_key.pop(key, None)
+                if ref is not None and self.pending.pop(ref, None) is not None:
+                    self.counts["superseded"] += 1
+                    self.remember(ref, "superseded")
+
+    def drop_unsent(self):
+        """Forgets servo frames still waiting in the queue: a stop flushes the motion lane and they must not come back."""
+        with self.lock:
+            for ref, entry in list(self.pending.items()):
+                if entry.quad is not None and entry.first_sent is None:
+                    self.finish(ref, entry, "superseded")
+                    self.counts["superseded"] += 1
+
+    def on_ack(self, board, seq, t_rx=None):
+        """Returns True if the ACK belongs to a reliable command (pending or recently finished)."""
+        ref = (board, seq)
+        with self.lock:
+            entry = self.pending.get(ref)
+            if entry is None:
+                return ref in self.completed
+            self.finish(ref, entry, "delivered")
+            self.counts["delivered"] += 1
+            if entry.first_sent is not None:
+                t_rx = time.monotonic() if t_rx is None else t_rx
+                self.delivery_times.append(t_rx - entry.first_sent)
+            return True
+
+    def finish(self, ref, entry, outcome):
+        # Caller holds the lock
+        del self.pending[ref]
+        if self.by_key.get(entry.key) == ref:
+            del self.by_key[entry.key]
+        self.remember(ref, outcome)
+
+    def remember(self, ref, outcome):
+        self.completed[ref] = outcome
+        while len(self.completed) > COMPLETED_MEMORY:
+            self.completed.popitem(last=False)
+
+    def status(self, ref):
+        """State of a (board, seq): "pending", "delivered", "failed", "superseded", or None once forgotten."""
+        with self.lock:
+            if ref in self.pending:
+                return "pending"
+            return self.completed.get(ref)
+
+    def due(self, now=None):
+        """
+        Entries whose retransmit timer expired, with their backoff doubled: returns (texts, quads_by_frame_type,
+        frames, failed) where failed lists the entries that ran out of attempts and were dropped.
+        """
+        now = time.monotonic() if now is None else now
+        texts, quads, frames, failed = [], {}, [], []
+        with self.lock:
+            for ref, entry in list(self.pending.items()):
+                if now < entry.next_due:
+                    continue
+                if entry.attempts >= self.max_attempts:
+                    self.finish(ref, entry, "failed")
+                    self.counts["failed"] += 1
+                    failed.append(entry)
+                    continue
+                entry.attempts += 1
+                entry.rto = min(self.max_s, entry.rto * 2.0)
+                entry.next_due = now + entry.rto
+                self.counts["retransmits"] += 1
+                if entry.text is not None:
+                    texts.append((entry.seq, entry.text))
+                elif entry.frame is not None:
+                    frames.append(entry.frame)
+                else:
+                    quads.setdefault(entry.frame_type, []).append(entry.quad)
+        return texts, quads, frames, failed
+
+    def stats(self):
+        """Counts plus pending entries and first-send-to-ACK delivery time p50 / p99 / max in ms."""
+        with self.lock:
+            times = sorted(self.delivery_times)
+            stats = dict(self.counts, pending=len(self.pending))
+        stats.update(p50_ms=percentile(times, 50) * 1000.0, p99_ms=percentile(times, 99) * 1000.0,
+                     max_ms=times[-1] * 1000.0 if times else 0.0)
+        return stats
+
+    def clear(self):
+        with self.lock:
+            self.pending.clear()
+            self.by_key.clear()
@@ -0,0 +1,65 @@
+"""
+Rollopod Serial Receive Path
+Incremental line framing over bulk reads, plus bytes/s and lines/s counters for the reader threads.
+"""
+
+import time
+
+SERIAL_READ_TIMEOUT_S = 0.05    # Upper bound on how long a read (or an idle writer) blocks, i.e. shutdown latency
+MAX_LINE_BYTES = 4096           # A line longer than this without a newline is treated as noise and dropped
+
+class LineFramer:
+    """Splits a byte stream into stripped text lines. Partial lines stay in the buffer for the next feed()."""
+
+    def __init__(self, max_line=MAX_LINE_BYTES):
+        self.buffer = bytearray()
+        self.max_line = max_line
+        self.overflows = 0
+
+    def feed(self, data):
+        self.buffer += data
+        end = self.buffer.rfind(b"\n")
+        if end < 0:
+            if len(self.buffer) > self.max_line:
+                self.overflows += 1
+                del self.buffer[:]
+            return []
+        chunk = self.buffer[:end].decode("utf-8", errors="ignore")
+        del self.buffer[:end + 1]
+        return [line for line in (raw.strip() for raw in chunk.split("\n")) if line]
+
+    def reset(self):
+        del self.buffer[:]
+
+class RateCounter:
+    """Totals plus rates over the last completed measurement window (default 1 s)."""
+
+    def __init__(self, window_s=1.0):
+        self.window_s = window_s
+        self.total_bytes = 0
+        self.total_lines = 0
+        self.bytes_per_s = 0.0
+        self.lines_per_s = 0.0
+        self.window_start = time.monotonic()
+        self.window_bytes = 0
+        self.window_lines = 0
+
+    def add(self, n_bytes, n_lines, now=None):
+        self.total_bytes += n_bytes
+        self.total_lines += n_lines
+        self.window_bytes += n_bytes
+        self.window_lines += n_lines
+        self.tick(now)
+
+    def tick(self, now=None):
+        """Closes the window once it has run its length; returns True when the rates were refreshed."""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.window_start
+        if elapsed < self.window_s:
+            return False
+        self.bytes_per_s = self.window_bytes / elapsed
+        self.lines_per_s = self.window_lines / elapsed
+        self.window_start = now
+        self.window_bytes = 0
+        self.window_lines = 0
+        return True
@@ -0,0 +1,342 @@
+"""
+Rollopod Pitch Stabilizer
+Host-side closed loop for rolling mode: each streamed MPU pitch sample from a slave corrects that slave's
+motor speed on top of the waddle's open-loop speed, straight from the serial reader (no GUI or control-loop
+hop), so the only added latency is decoding the line and queueing one motor command.
+
+    stabilizer = PitchStabilizer(link.send_command)
+    link.telemetry_callbacks.append(stabilizer.on_sample)
+    loop = ControlLoopThread(StabilizedGait(WaddleGait(), stabilizer), link.send_command)
+
+Per side: PID on pitch error (derivative on the filtered measurement, conditional-integration anti-windup,
+clamped and slew-limited output). Sample-to-command latency (sample read -> motor command written to the
+port) and compute time are measured for every correction. A step test offsets the setpoint and records a
+trace that can be saved as CSV and summarised by step_metrics().
+"""
+
+import csv
+import threading
+import time
+from collections import deque
+
+from rollopod_gait import percentile
+from rollopod_tx import PRIORITY_MOTION
+
+MOTOR_LIMIT = 255
+STALE_SAMPLE_S = 0.1          # A side without a sample for this long falls back to open loop
+LATENCY_HISTORY = 1000
+STEP_PRE_ROLL_S = 0.5         # Trace recorded at the old setpoint before the step
+
+DEFAULT_KP = 20.0             # Motor speed units per degree
+DEFAULT_KI = 60.0             # Per degree-second
+DEFAULT_KD = 0.5              # Per degree/second
+DEFAULT_OUTPUT_LIMIT = 150.0  # Max correction added to the gait speed
+DEFAULT_SLEW_PER_S = 800.0    # Max correction change per second
+DEFAULT_D_FILTER_S = 0.05     # Derivative low-pass time constant
+
+TRACE_FIELDS = ["t", "board", "setpoint", "pitch", "p", "i", "d", "correction", "base", "speed", "compute_ms"]
+
+def clamp(value, limit):
+    return max(-limit, min(limit, value))
+
+# -------------------------------------------------------------------------------
+# PID (Anti-Windup, Slew-Limited Output)
+# -------------------------------------------------------------------------------
+class PitchPID:
+    def __init__(self, kp=DEFAULT_KP, ki=DEFAULT_KI, kd=DEFAULT_KD, output_limit=DEFAULT_OUTPUT_LIMIT,
+                 slew_per_s=DEFAULT_SLEW_PER_S, d_filter_s=DEFAULT_D_FILTER_S):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_limit = output_limit
+        self.slew_per_s = slew_per_s
+        self.d_filter_s = d_filter_s
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0          # Kept in output units, so changing ki does not bump the output
+        self.d_rate = 0.0
+        self.last_t = None
+        self.last_measurement = None
+        self.output = 0.0
+        self.p = self.i = self.d = 0.0
+
+    def limit(self, value, dt):
+        value = clamp(value, self.output_limit)
+        if self.slew_per_s > 0.0:
+            step = self.slew_per_s * dt
+            value = max(self.output - step, min(self.output + step, value))
+        return value
+
+    def update(self, setpoint, measurement, t):
+        """Returns the new output. A first sample (or one after a gap) only primes the derivative."""
+        dt = 0.0 if self.last_t is None else t - self.last_t
+        if dt <= 0.0 or dt > STALE_SAMPLE_S:
+            dt = 0.0
+            self.d_rate = 0.0
+        error = setpoint - measurement
+
+        # Derivative on measurement: setpoint steps do not kick the output
+        if dt > 0.0:
+            rate = -(measurement - self.last_measurement) / dt
+            self.d_rate += dt / (self.d_filter_s + dt) * (rate - self.d_rate)
+        self.last_t = t
+        self.last_measurement = measurement
+
+        self.p = self.kp * error
+        self.d = self.kd * self.d_rate
+        if dt > 0.0:
+            # Conditional integration: hold the integral while the output is pinned by the clamp or the slew
+            # limit, unless this error would pull it back out
+            unlimited = self.p + self.integral + self.d
+            if self.limit(unlimited, dt) == unlimited or error * unlimited < 0.0:
+                self.integral = clamp(self.integral + self.ki * error * dt, self.output_limit)
+        self.i = self.integral
+
+        self.output = self.limit(self.p + self.i + self.d, dt)
+        return self.output
+
+# -------------------------------------------------------------------------------
+# STABILIZER (Per-Sample Motor Corrections)
+# -------------------------------------------------------------------------------
+class PitchStabilizer:
+    """
+    Turns pitch samples into "L/R MOTOR" commands through send_fn(cmd, on_sent=None, priority=None, stop=False).
+    Corrections go out motion class even when they round to 0; only the step test's stand-down is a stop.
+    on_sample() runs in the serial reader's context; gains and setpoint are plain attributes the GUI may change
+    at any time.
+    Corrections are only sent while enabled (user switch) and engaged (a gait or step test is running).
+    """
+
+    def __init__(self, send_fn, **gains):
+        self.send_fn = send_fn
+        self.lock = threading.Lock()
+        self.pids = {"L": PitchPID(**gains), "R": PitchPID(**gains)}
+        self.setpoint = 0.0
+        self.direction = 1.0          # -1 if more forward speed pitches the shell the other way
+        self.enabled = False
+        self.engaged = False
+        self.invert_left = False
+        self.invert_right = False
+        self.base = {"L": 0, "R": 0}
+        self.last_sample_t = {"L": None, "R": None}
+        self.correction = {"L": 0.0, "R": 0.0}
+        self.speed = {"L": 0, "R": 0}
+        self.latencies = deque(maxlen=LATENCY_HISTORY)
+        self.compute_times = deque(maxlen=LATENCY_HISTORY)
+        self.corrections_sent = 0
+
+        self.trace = None             # Rows while a step test is recording
+        self.last_trace = None        # (rows, info) of the last finished step test
+        self.step_info = None
+        self.step_engaged = False
+
+    def set_gains(self, kp=None, ki=None, kd=None, output_limit=None, slew_per_s=None):
+        for pid in self.pids.values():
+            if kp is not None: pid.kp = kp
+            if ki is not None: pid.ki = ki
+            if kd is not None: pid.kd = kd
+            if output_limit is not None: pid.output_limit = output_limit
+            if slew_per_s is not None: pid.slew_per_s = slew_per_s
+
+    def set_base(self, l_speed, r_speed):
+        # Open-loop speeds (before inversion) the corrections are added to
+        self.base = {"L": l_speed, "R": r_speed}
+
+    def engage(self):
+        with self.lock:
+            for pid in self.pids.values():
+                pid.reset()
+            self.correction = {"L": 0.0, "R": 0.0}
+            self.engaged = True
+
+    def disengage(self):
+        with self.lock:
+            self.engaged = False
+            self.trace = None
+            self.step_info = None
+            self.step_engaged = False
+
+    def is_live(self, board, now=None):
+        """True if this side is being corrected closed loop (enabled, engaged and a fresh sample)."""
+        last = self.last_sample_t[board]
+        now = time.monotonic() if now is None else now
+        return self.enabled and self.engaged and last is not None and now - last <= STALE_SAMPLE_S
+
+    def on_sample(self, sample):
+        board = sample.board
+        if board not in self.pids:
+            return
+        t0 = time.monotonic()
+        with self.lock:
+            self.last_sample_t[board] = sample.t
+            if not (self.enabled and self.engaged):
+                return
+            setpoint = self.current_setpoint(sample.t)
+            pid = self.pids[board]
+            correction = self.direction * pid.update(setpoint, sample.pitch, sample.t)
+            base = self.base[board]
+            speed = int(round(clamp(base + correction, MOTOR_LIMIT)))
+            invert = self.invert_left if board == "L" else self.invert_right
+            self.correction[board] = correction
+            self.speed[board] = speed
+            trace = self.trace
+
+        def on_sent(t_wire):
+            self.latencies.append(t_wire - sample.t)
+
+        self.send_fn(f"{board} MOTOR {-speed if invert else speed}", on_sent=on_sent, priority=PRIORITY_MOTION)
+        compute_s = time.monotonic() - t0
+        self.compute_times.append(compute_s)
+        self.corrections_sent += 1
+        if trace is not None:
+            trace.append((sample.t, board, setpoint, sample.pitch, pid.p, pid.i, pid.d, correction, base, speed,
+                          compute_s * 1000.0))
+            self.check_step_done(sample.t)
+
+    def latency_stats(self):
+        """(p50, p99, max) sample-to-wire latency and (p50, p99) compute time, all in ms."""
+        lat = sorted(self.latencies)
+        comp = sorted(self.compute_times)
+        if not lat:
+            lat = [0.0]
+        return (percentile(lat, 50) * 1000.0, percentile(lat, 99) * 1000.0, lat[-1] * 1000.0,
+                percentile(comp, 50) * 1000.0, percentile(comp, 99) * 1000.0)
+
+    # ---------------------------------------------------------------------------
+    # STEP-RESPONSE TEST
+    # ---------------------------------------------------------------------------
+    def start_step_test(self, step_deg, duration_s=3.0):
+        """
+        Records STEP_PRE_ROLL_S at the current setpoint, then duration_s with the setpoint offset by step_deg.
+        Engages the stabilizer (at the current gait speed, or standing still) if nothing else has.
+        """
+        t_start = time.monotonic()
+        with self.lock:
+            self.step_info = {"step_deg": step_deg, "setpoint": self.setpoint, "t_start": t_start,
+                              "t_step": t_start + STEP_PRE_ROLL_S, "t_end": t_start + STEP_PRE_ROLL_S + duration_s,
+                              "gains": {k: getattr(self.pids["L"], k) for k in ("kp", "ki", "kd", "output_limit", "slew_per_s")}}
+            self.trace = []
+            self.step_engaged = not self.engaged
+            if self.step_engaged:
+                self.base = {"L": 0, "R": 0}
+        if self.step_engaged:
+            self.engage()
+
+    def current_setpoint(self, t):
+        info = self.step_info
+        if info is not None and t >= info["t_step"]:
+            return info["setpoint"] + info["step_deg"]
+        return self.setpoint
+
+    def check_step_done(self, t):
+        with self.lock:
+            info = self.step_info
+            if info is None or t < info["t_end"]:
+                return
+            self.last_trace = (self.trace, info)
+            self.trace = None
+            self.step_info = None
+            stand_down = self.step_engaged
+            self.step_engaged = False
+            if stand_down:
+                self.engaged = False
+        if stand_down:
+            for board in self.pids:
+                self.send_fn(f"{board} MOTOR 0", stop=True)
+
+    def take_finished_trace(self):
+        """Returns (rows, info) once per finished step test, else None."""
+        with self.lock:
+            finished, self.last_trace = self.last_trace, None
+        return finished
+
+    def step_running(self):
+        return self.step_info is not None
+
+def save_trace(path, rows, info):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(f"# step {info['step_deg']:+.2f} deg from {info['setpoint']:+.2f} at t={info['t_step']:.4f}; "
+                f"gains {info['gains']}\n")
+        writer = csv.writer(f)
+        writer.writerow(TRACE_FIELDS)
+        for row in rows:
+            writer.writerow([f"{v:.4f}" if isinstance(v, float) else v for v in row])
+
+def step_metrics(rows, info, board, band_pct=5.0):
+    """
+    Rise time (10-90%), overshoot (% of the step) and settling time (last exit from the +/-band_pct band)
+    for one side's response, from the step onwards. Times in seconds; None where the response never got there.
+    """
+    step = info["step_deg"]
+    t_step = info["t_step"]
+    pts = [(row[0] - t_step, (row[3] - info["setpoint"]) / step) for row in rows if row[1] == board and row[0] >= t_step]
+    if not pts or step == 0.0:
+        return {"rise_s": None, "overshoot_pct": None, "settle_s": None}
+
+    t10 = next((t for t, y in pts if y >= 0.1), None)
+    t90 = next((t for t, y in pts if y >= 0.9), None)
+    band = band_pct / 100.0
+    settle = 0.0
+    for t, y in pts:
+        if abs(y - 1.0) > band:
+            settle = t
+    settled = abs(pts[-1][1] - 1.0) <= band
+    return {"rise_s": t90 - t10 if t10 is not None and t90 is not None else None,
+            "overshoot_pct": max(0.0, max(y for _, y in pts) - 1.0) * 100.0,
+            "settle_s": settle if settled else None}
+
+# -------------------------------------------------------------------------------
+# STABILIZED WADDLE
+# -------------------------------------------------------------------------------
+class StabilizedGait:
+    """
+    WaddleGait wrapper for ControlLoopThread / AsyncRollopod.run_gait: the gait sets the stabilizer's base
+    speeds every tick, and only sides without live pitch samples are driven open loop from here.
+    """
+
+    def __init__(self, gait, stabilizer):
+        self.gait = gait
+        self.stabilizer = stabilizer
+
+    @property
+    def invert_left(self):
+        return self.gait.invert_left
+
+    @invert_left.setter
+    def invert_left(self, value):
+        self.gait.invert_left = self.stabilizer.invert_left = value
+
+    @property
+    def invert_right(self):
+        return self.gait.invert_right
+
+    @invert_right.setter
+    def invert_right(self, value):
+        self.gait.invert_right = self.stabilizer.invert_right = value
+
+    def reset(self):
+        self.gait.reset()
+        self.stabilizer.engage()
+
+    def tick(self, dt, send_fn):
+        l_speed, r_speed, diff_val = self.gait.step(dt)
+        stab = self.stabilizer
+        stab.set_base(l_speed, r_speed)
+        now = time.monotonic()
+        live_l, live_r = stab.is_live("L", now), stab.is_live("R", now)
+        if live_l:
+            l_speed = stab.speed["L"]
+        if live_r:
+            r_speed = stab.speed["R"]
+        eff_l_speed, eff_r_speed = self.gait.apply_inversion(l_speed, r_speed)
+        if not live_l:
+            send_fn(f"L MOTOR {eff_l_speed}")
+        if not live_r:
+            send_fn(f"R MOTOR {eff_r_speed}")
+        return {"t": self.gait.t, "l_speed": l_speed, "r_speed": r_speed,
+                "eff_l_speed": eff_l_speed, "eff_r_speed": eff_r_speed,
+                "diff_val": diff_val, "ramp_factor": self.gait.ramp_factor,
+                "closed_loop": (live_l, live_r),
+                "l_correction": stab.correction["L"] if live_l else 0.0,
+                "r_correction": stab.correction["R"] if live_r else 0.0}
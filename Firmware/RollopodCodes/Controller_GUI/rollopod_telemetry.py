@@ -0,0 +1,98 @@
+"""
+Rollopod MPU Telemetry Decoder & History
+Parses the bridge's "[LEFT] MPU_DATA <pitch> [accel gyro]" lines into timestamped samples and keeps
+a fixed-size NumPy ring buffer per slave, so the GUI can read history at display rate instead of per line.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+MpuSample = namedtuple("MpuSample", ["t", "board", "pitch", "accel", "gyro"])
+
+BOARD_TAGS = {"[LEFT]": "L", "[RIGHT]": "R"}
+DEFAULT_HISTORY = 4096   # ~80 s per slave at 50 Hz
+
+def parse_telemetry_line(line, t=None):
+    """
+    Returns an MpuSample, or None for non-telemetry lines. Streamed telemetry carries only the filtered
+    pitch; GET_MPU replies add the accelerometer and gyro angles. Untagged lines get board None.
+    """
+    parts = line.split()
+    if "MPU_DATA" not in parts:
+        return None
+    idx = parts.index("MPU_DATA")
+    values = []
+    for p in parts[idx + 1:idx + 4]:
+        try:
+            values.append(float(p))
+        except ValueError:
+            break
+    if not values:
+        return None
+
+    board = BOARD_TAGS.get(parts[0]) if idx > 0 else None
+    accel = values[1] if len(values) > 1 else float("nan")
+    gyro = values[2] if len(values) > 2 else float("nan")
+    return MpuSample(time.monotonic() if t is None else t, board, values[0], accel, gyro)
+
+class PitchRingBuffer:
+    """Fixed-capacity (timestamp, pitch) history. Written by the serial thread, read by the GUI."""
+
+    def __init__(self, capacity=DEFAULT_HISTORY):
+        self.lock = threading.Lock()
+        self.t = np.zeros(capacity)
+        self.pitch = np.zeros(capacity)
+        self.capacity = capacity
+        self.count = 0          # Total samples ever written (also the change counter for redraws)
+
+    def append(self, t, pitch):
+        with self.lock:
+            i = self.count % self.capacity
+            self.t[i] = t
+            self.pitch[i] = pitch
+            self.count += 1
+
+    def latest(self):
+        with self.lock:
+            if not self.count:
+                return None
+            i = (self.count - 1) % self.capacity
+            return self.t[i], self.pitch[i]
+
+    def snapshot(self, window_s=None, now=None):
+        """Chronologically ordered (t, pitch) copies, optionally limited to the last window_s seconds."""
+        with self.lock:
+            n = min(self.count, self.capacity)
+            start = (self.count - n) % self.capacity
+            order = (np.arange(n) + start) % self.capacity
+            t = self.t[order]
+            pitch = self.pitch[order]
+        if window_s is not None and n:
+            now = time.monotonic() if now is None else now
+            first = np.searchsorted(t, now - window_s)
+            t, pitch = t[first:], pitch[first:]
+        return t, pitch
+
+    def rate_hz(self, window_s=2.0, now=None):
+        t, _ = self.snapshot(window_s, now)
+        return len(t) / window_s
+
+class TelemetryHistory:
+    def __init__(self, capacity=DEFAULT_HISTORY):
+        self.buffers = {"L": PitchRingBuffer(capacity), "R": PitchRingBuffer(capacity)}
+        self.last_sample = {"L": None, "R": None}
+
+    def add(self, sample):
+        # Untagged samples (legacy single-slave bridges) feed both sides
+        for board in ((sample.board,) if sample.board in self.buffers else ("L", "R")):
+            self.buffers[board].append(sample.t, sample.pitch)
+            self.last_sample[board] = sample
+
+    def feed_line(self, line, t=None):
+        sample = parse_telemetry_line(line, t)
+        if sample is not None:
+            self.add(sample)
+        return sample
@@ -0,0 +1,268 @@
+"""
+Rollopod Serial TX Pipeline
+Latest-value command coalescing between the GUI and the serial worker thread, the prioritised
+TX queue the worker's writer drains so stop commands never wait behind motion traffic, and the
+per-channel deadband filter that drops angle updates too small for a servo to act on.
+"""
+
+import threading
+import time
+from collections import deque
+
+from rollopod_gait import percentile
+
+DEFAULT_FLUSH_HZ = 100.0
+
+class CommandCoalescer:
+    """Keeps only the newest pending value per (board, channel) servo and per motor, flushed at a fixed rate."""
+
+    def __init__(self, flush_hz=DEFAULT_FLUSH_HZ):
+        self.lock = threading.Lock()
+        self.pending_angles = {}   # (board, channel) -> angle
+        self.pending_motors = {}   # 'L' / 'R' / 'B' -> speed
+        self.flush_interval = 1.0 / flush_hz
+        self.next_flush = 0.0
+        self.sent_count = 0
+        self.dropped_count = 0
+
+    def set_rate(self, flush_hz):
+        self.flush_interval = 1.0 / max(1.0, float(flush_hz))
+
+    def submit_angle(self, board, channel, angle):
+        with self.lock:
+            key = (board, channel)
+            if key in self.pending_angles:
+                self.dropped_count += 1
+            self.pending_angles[key] = float(angle)
+
+    def submit_motor(self, board, speed):
+        with self.lock:
+            if board == 'B':
+                # A both-motor command supersedes everything pending
+                self.dropped_count += len(self.pending_motors)
+                self.pending_motors = {'B': int(speed)}
+                return
+            if 'B' in self.pending_motors:
+                # Split a pending 'B' so the untouched side keeps its value
+                other = 'R' if board == 'L' else 'L'
+                self.pending_motors[other] = self.pending_motors.pop('B')
+            elif board in self.pending_motors:
+                self.dropped_count += 1
+            self.pending_motors[board] = int(speed)
+
+    def clear(self):
+        with self.lock:
+            self.dropped_count += len(self.pending_angles) + len(self.pending_motors)
+            self.pending_angles.clear()
+            self.pending_motors.clear()
+
+    def clear_motors(self):
+        with self.lock:
+            self.dropped_count += len(self.pending_motors)
+            self.pending_motors.clear()
+
+    def has_pending(self):
+        return bool(self.pending_angles or self.pending_motors)
+
+    def time_until_due(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_flush - now)
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self.next_flush:
+            return False
+        # Schedule from the previous deadline to hold the rate, but never build up a backlog
+        self.next_flush += self.flush_interval
+        if self.next_flush <= now:
+            self.next_flush = now + self.flush_interval
+        return True
+
+    def drain(self):
+        """Returns ([(board, channel, angle), ...], [(board, speed), ...]) and resets the pending state."""
+        with self.lock:
+            angles = [(b, ch, a) for (b, ch), a in self.pending_angles.items()]
+            motors = list(self.pending_motors.items())
+            self.pending_angles = {}
+            self.pending_motors = {}
+            self.sent_count += len(angles) + len(motors)
+        return angles, motors
+
+    def stats(self):
+        with self.lock:
+            return {"sent": self.sent_count, "dropped": self.dropped_count}
+
+# -------------------------------------------------------------------------------
+# DEADBAND FILTER (Per-Channel Shadow State + Periodic Full Refresh)
+# -------------------------------------------------------------------------------
+DEFAULT_DEADBAND_DEG = 0.5     # ~1 PCA9685 tick at 50 Hz for a 180° servo
+DEFAULT_REFRESH_S = 2.0
+
+class DeadbandFilter:
+    """
+    Remembers the last angle sent per (board, channel) and drops updates that move less than deadband_deg.
+    The newest requested angle is always kept, and refresh_due() hands back the full requested state every
+    refresh_s seconds, so a lost packet or a swallowed final step is corrected within one refresh period.
+    """
+
+    def __init__(self, deadband_deg=DEFAULT_DEADBAND_DEG, refresh_s=DEFAULT_REFRESH_S, window_s=60.0):
+        self.lock = threading.Lock()
+        self.deadband_deg = deadband_deg
+        self.refresh_s = refresh_s
+        self.window_s = window_s
+        self.sent = {}        # (board, channel) -> last angle on the wire
+        self.requested = {}   # (board, channel) -> newest angle asked for
+        self.next_refresh = 0.0
+        self.history = deque()  # (time, bytes sent, bytes saved) per filtered batch, last window_s seconds
+        self.total_sent_bytes = 0
+        self.total_saved_bytes = 0
+
+    def set_deadband(self, deadband_deg):
+        self.deadband_deg = max(0.0, float(deadband_deg))
+
+    def invalidate(self):
+        # Forget what the servos hold (reconnect, bridge reset): everything is sent again
+        with self.lock:
+            self.sent.clear()
+
+    def filter(self, pairs, bytes_per_pair, now=None):
+        """Returns the subset of [(board, channel, angle), ...] worth sending; bytes_per_pair(pair) sizes the savings."""
+        now = time.monotonic() if now is None else now
+        kept = []
+        sent_bytes = saved_bytes = 0
+        with self.lock:
+            for pair in pairs:
+                board, channel, angle = pair
+                key = (board, channel)
+                self.requested[key] = angle
+                last = self.sent.get(key)
+                if last is not None and abs(angle - last) < self.deadband_deg:
+                    saved_bytes += bytes_per_pair(pair)
+                    continue
+                self.sent[key] = angle
+                kept.append(pair)
+                sent_bytes += bytes_per_pair(pair)
+            self.record(now, sent_bytes, saved_bytes)
+        return kept
+
+    def accept(self, pairs, bytes_per_pair, now=None):
+        """Records pairs sent unfiltered (reliable final frames), so later updates are filtered against them."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            for board, channel, angle in pairs:
+                self.requested[(board, channel)] = angle
+                self.sent[(board, channel)] = angle
+            self.record(now, sum(bytes_per_pair(pair) for pair in pairs), 0)
+
+    def refresh_due(self, now=None):
+        """Full requested state once per refresh period (empty list otherwise)."""
+        now = time.monotonic() if now is None else now
+        if now < self.next_refresh:
+            return []
+        with self.lock:
+            self.next_refresh = now + self.refresh_s
+            self.sent.update(self.requested)
+            return [(b, ch, a) for (b, ch), a in self.requested.items()]
+
+    def record(self, now, sent_bytes, saved_bytes):
+        self.total_sent_bytes += sent_bytes
+        self.total_saved_bytes += saved_bytes
+        self.history.append((now, sent_bytes, saved_bytes))
+        while self.history and self.history[0][0] < now - self.window_s:
+            self.history.popleft()
+
+    def account_refresh(self, sent_bytes, now=None):
+        with self.lock:
+            self.record(time.monotonic() if now is None else now, sent_bytes, 0)
+
+    def stats(self):
+        """Bytes sent / saved over the last window_s seconds and in total, plus the saved fraction of the window."""
+        with self.lock:
+            sent = sum(h[1] for h in self.history)
+            saved = sum(h[2] for h in self.history)
+            total = sent + saved
+            return {"window_sent": sent, "window_saved": saved,
+                    "window_saved_frac": saved / total if total else 0.0,
+                    "total_sent": self.total_sent_bytes, "total_saved": self.total_saved_bytes}
+
+# -------------------------------------------------------------------------------
+# PRIORITISED TX QUEUE (Safety > Control > Motion)
+# -------------------------------------------------------------------------------
+PRIORITY_SAFETY = 0    # STOP, torque off, explicit motor stops: preempt everything and flush pending motion
+PRIORITY_CONTROL = 1   # Configuration, queries, telemetry switches
+PRIORITY_MOTION = 2    # ANGLE / MOTOR / TICK streams and angle batch frames
+PRIORITY_NAMES = ["safety", "control", "motion"]
+
+MOTION_COMMANDS = ("ANGLE", "MOTOR", "TICK")
+
+def classify_command(cmd_str):
+    """
+    Priority class for a text command such as "B TORQUE 0" or "L ANGLE 3 90". "MOTOR 0" is motion like any
+    other speed (a waddle or slider crossing zero); callers that mean a stop pass priority=PRIORITY_SAFETY.
+    """
+    parts = cmd_str.split()
+    if parts and parts[0] in ('L', 'R', 'B'):
+        parts = parts[1:]
+    if not parts:
+        return PRIORITY_CONTROL
+    cmd = parts[0].upper()
+    if cmd == "STOP" or (cmd == "TORQUE" and parts[1:2] == ["0"]):
+        return PRIORITY_SAFETY
+    if cmd in MOTION_COMMANDS:
+        return PRIORITY_MOTION
+    return PRIORITY_CONTROL
+
+class PriorityTxQueue:
+    """Thread-safe write queue with one FIFO lane per priority class and enqueue-to-wire latency tracking."""
+
+    def __init__(self, history=1000):
+        self.cond = threading.Condition()
+        self.lanes = [deque() for _ in PRIORITY_NAMES]
+        self.latencies = [deque(maxlen=history) for _ in PRIORITY_NAMES]
+        self.flushed_count = 0
+
+    def put(self, data, priority=PRIORITY_MOTION, on_sent=None):
+        """on_sent(t_wire) is called by the writer right after this item reaches the port."""
+        with self.cond:
+            if priority == PRIORITY_SAFETY:
+                # Pending motion would undo the stop: drop it before the stop goes out
+                self.flushed_count += len(self.lanes[PRIORITY_MOTION])
+                self.lanes[PRIORITY_MOTION].clear()
+            self.lanes[priority].append((time.monotonic(), data, on_sent))
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Returns (priority, enqueue_time, data, on_sent) from the highest non-empty lane, or None on timeout."""
+        with self.cond:
+            if not any(self.lanes):
+                self.cond.wait(timeout)
+            for priority, lane in enumerate(self.lanes):
+                if lane:
+                    t_enqueued, data, on_sent = lane.popleft()
+                    return priority, t_enqueued, data, on_sent
+        return None
+
+    def wake(self):
+        with self.cond:
+            self.cond.notify_all()
+
+    def record_sent(self, priority, t_enqueued, now=None):
+        now = time.monotonic() if now is None else now
+        self.latencies[priority].append(now - t_enqueued)
+
+    def pending(self):
+        with self.cond:
+            return [len(lane) for lane in self.lanes]
+
+    def clear(self):
+        with self.cond:
+            for lane in self.lanes:
+                lane.clear()
+
+    def latency_stats(self):
+        """Enqueue-to-wire latency in milliseconds per class: {name: (mean, p99, max)}."""
+        stats = {}
+        for name, samples in zip(PRIORITY_NAMES, self.latencies):
+            ms = sorted(v * 1000.0 for v in list(samples))
+            stats[name] = (sum(ms) / len(ms), percentile(ms, 99), ms[-1]) if ms else (0.0, 0.0, 0.0)
+        return stats
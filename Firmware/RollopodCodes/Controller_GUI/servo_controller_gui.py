@@ -8,13 +8,39 @@
 
 import sys
 import time
-import json
+STARTUP_T0 = time.perf_counter()  # Taken before the heavy imports so --profile-startup can time them
+import argparse
+import threading
 import os
-import math
 import serial
 import serial.tools.list_ports
 from PyQt6 import QtWidgets, QtCore, QtGui
 
+# Ensure local imports work
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rollopod_protocol import PROTO_QUERY, SEQ_MIN_VERSION, format_angle_command
+from rollopod_tx import DEFAULT_FLUSH_HZ, DEFAULT_DEADBAND_DEG, PRIORITY_NAMES
+from rollopod_core import BridgeLink, resolve_motor_speeds
+from rollopod_acks import histogram_labels
+from rollopod_gait import WaddleGait, ControlLoopThread, WAVEFORM_SHAPES, parse_harmonics
+from rollopod_stabilizer import (
+    PitchStabilizer, StabilizedGait, save_trace, step_metrics,
+    DEFAULT_KP, DEFAULT_KI, DEFAULT_KD, DEFAULT_OUTPUT_LIMIT, DEFAULT_SLEW_PER_S
+)
+from rollopod_leg_gait import LegGaitGenerator, GAIT_NAMES, JOINT_NAMES
+from rollopod_pose import PoseTransition, TransformationPlanner, TrajectoryPlayer, joint_role
+from rollopod_gaittable import GaitUpload, GaitTableError, compile_gait_cycle, check_gait_cycle, UPLOAD_DONE
+from rollopod_record import CommandRecorder, CommandReplayer, load_log, MAX_RECORDING_S
+from rollopod_telemetry import TelemetryHistory
+from rollopod_serial import SERIAL_READ_TIMEOUT_S
+from rollopod_calibration import CalibrationTable, parse_points, format_points
+from rollopod_profile import (
+    ProfileStore, PROFILE_EXT, LEGACY_EXT, profile_path, SECTION_SETTINGS, SECTION_POSES, SECTION_GAIT_PRESETS, SECTION_CALIBRATION_SETS, STANDING_POSE
+)
+from rollopod_console import ConsoleBuffer, KIND_TX, KIND_TELEMETRY, DEFAULT_CONSOLE_LINES, DEFAULT_CONSOLE_FLUSH_MS
+STARTUP_IMPORT_S = time.perf_counter() - STARTUP_T0
+
 # -------------------------------------------------------------------------------
 # 20 HEXAPOD LEG SERVOS DEFINITION (10 Left Side + 10 Right Side)
 # -------------------------------------------------------------------------------
@@ -43,6 +69,24 @@ LEG_SERVOS = [
     "Right Rear Tibia"
 ]
 
+# DASHBOARD LEG GROUPS (Leg Control view, one sub-box per leg)
+LEFT_LEG_CATEGORIES = [
+    ("Left Front Leg", ["Left Front Coxa", "Left Front Femur", "Left Front Tibia"]),
+    ("Left Middle Leg", ["Left Middle Coxa", "Left Middle Femur", "Left Middle Patella", "Left Middle Tibia"]),
+    ("Left Rear Leg", ["Left Rear Coxa", "Left Rear Femur", "Left Rear Tibia"])
+]
+RIGHT_LEG_CATEGORIES = [
+    ("Right Front Leg", ["Right Front Coxa", "Right Front Femur", "Right Front Tibia"]),
+    ("Right Middle Leg", ["Right Middle Coxa", "Right Middle Femur", "Right Middle Patella", "Right Middle Tibia"]),
+    ("Right Rear Leg", ["Right Rear Coxa", "Right Rear Femur", "Right Rear Tibia"])
+]
+
+# DASHBOARD PAGES (Left Board / Right Board / PCA Channels share one page, Leg Control has its own)
+LEG_PAGE = "legs"
+BOARD_PAGE = "boards"
+
+PROFILE_SAVE_DEBOUNCE_MS = 500
+
 # DEFAULT ROLLING POSE ANGLES FROM HARDWARE CALIBRATION
 DEFAULT_ROLLING_POSE = {
     "L:CH 00": 152.0, "L:CH 01": 0.0,   "L:CH 02": 180.0,
@@ -62,11 +106,16 @@ class NoWheelSlider(QtWidgets.QSlider):
 class ClickRefreshComboBox(QtWidgets.QComboBox):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.extra_ports = []   # Ports list_ports cannot see (e.g. the emulator's pty), from --port
+
+    def port_list(self):
+        ports = [p.device for p in serial.tools.list_ports.comports()]
+        return ports + [p for p in self.extra_ports if p not in ports]
 
     def showPopup(self):
         current_text = self.currentText()
         self.clear()
-        ports = [p.device for p in serial.tools.list_ports.comports()]
+        ports = self.port_list()
         self.addItems(ports)
         if current_text in ports:
             self.setCurrentText(current_text)
@@ -74,38 +123,99 @@ class ClickRefreshComboBox(QtWidgets.QComboBox):
             self.setCurrentIndex(0)
         super().showPopup()
 
+# LIVE SCROLLING PITCH PLOT (Repainted at display rate from the telemetry ring buffers)
+class PitchPlotWidget(QtWidgets.QWidget):
+    def __init__(self, window_s=10.0, parent=None):
+        super().__init__(parent)
+        self.window_s = window_s
+        self.range_deg = 30.0
+        self.series = []   # [(QColor, t array, pitch array), ...]
+        self.now = 0.0
+        self.setMinimumHeight(110)
+
+    def set_series(self, series, now):
+        self.series = series
+        self.now = now
+        # Auto-scale in 15° steps so the axis does not breathe on every frame
+        peak = max((float(abs(p).max()) for _, _, p in series if len(p)), default=0.0)
+        self.range_deg = max(15.0, 15.0 * int(peak / 15.0 + 1))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        w, h = self.width(), self.height()
+        painter.fillRect(0, 0, w, h, QtGui.QColor("#0E1018"))
+
+        painter.setPen(QtGui.QPen(QtGui.QColor("#24293E"), 1))
+        for frac in (0.25, 0.5, 0.75):
+            painter.drawLine(0, int(h * frac), w, int(h * frac))
+        painter.setPen(QtGui.QColor("#8E98B0"))
+        painter.setFont(QtGui.QFont("Consolas", 7))
+        painter.drawText(4, 10, f"+{self.range_deg:.0f}°")
+        painter.drawText(4, h - 3, f"-{self.range_deg:.0f}°  ({self.window_s:.0f}s)")
+
+        for color, t, pitch in self.series:
+            if len(t) < 2:
+                continue
+            xs = (1.0 - (self.now - t) / self.window_s) * w
+            ys = (0.5 - pitch / (2.0 * self.range_deg)) * h
+            path = QtGui.QPainterPath(QtCore.QPointF(xs[0], ys[0]))
+            for x, y in zip(xs[1:].tolist(), ys[1:].tolist()):
+                path.lineTo(x, y)
+            painter.setPen(QtGui.QPen(color, 1.5))
+            painter.drawPath(path)
+        painter.end()
+
 # BACKGROUND SERIAL WORKER THREAD WITH DUAL MPU TELEMETRY PARSING
-class SerialWorkerThread(QtCore.QThread):
+class SerialWorkerThread(QtCore.QThread, BridgeLink):
+    """Qt front end of the bridge pipeline: a reader QThread plus a writer thread around BridgeLink."""
     data_received = QtCore.pyqtSignal(str)
     status_changed = QtCore.pyqtSignal(bool, str)
-    telemetry_left_pitch = QtCore.pyqtSignal(float)
-    telemetry_right_pitch = QtCore.pyqtSignal(float)
+    protocol_changed = QtCore.pyqtSignal(str, int)
 
-    def __init__(self, port_name, baud_rate=115200):
-        super().__init__()
+    def __init__(self, port_name, baud_rate=115200, flush_hz=DEFAULT_FLUSH_HZ):
+        QtCore.QThread.__init__(self)
+        BridgeLink.__init__(self, flush_hz)
         self.port_name = port_name
         self.baud_rate = baud_rate
         self.running = False
         self.ser = None
+        self.writer = None
 
     def stop(self):
         self.running = False
+        self.tx_queue.wake()
         self.wait(1000)
 
-    def send_command(self, cmd_str):
-        if self.ser and self.ser.is_open:
-            try:
-                if not cmd_str.endswith('\n'):
-                    cmd_str += '\n'
-                self.ser.write(cmd_str.encode('utf-8'))
-            except Exception as e:
-                print(f"[SERIAL TX ERROR] {e}")
+    def on_line(self, line):
+        # Without a console buffer each line is delivered as its own signal
+        if self.console is None:
+            self.data_received.emit(line)
+
+    def on_protocol(self, protocol, version):
+        self.protocol_changed.emit(protocol, version)
+
+    def on_delivery_failed(self, entry):
+        if self.console is not None:
+            self.console.append(entry.describe())
+        else:
+            self.data_received.emit(entry.describe())
+
+    def write_loop(self):
+        # Writer side of the worker: drains the priority queue and owns the coalescer flush schedule
+        while self.running:
+            self.pump_tx(self.ser.write, self.tx_timeout())
 
     def run(self):
         self.running = True
         try:
-            self.ser = serial.Serial(self.port_name, self.baud_rate, timeout=0.05)
+            self.ser = serial.Serial(self.port_name, self.baud_rate, timeout=SERIAL_READ_TIMEOUT_S)
             self.status_changed.emit(True, f"Connected to {self.port_name} @ {self.baud_rate}")
+            self.writer = threading.Thread(target=self.write_loop, daemon=True)
+            self.writer.start()
+            # Protocol handshake: legacy bridges never answer and we stay on text commands
+            self.send_command(PROTO_QUERY)
         except Exception as e:
             self.status_changed.emit(False, f"Connection Failed: {e}")
             self.running = False
@@ -113,42 +223,54 @@ class SerialWorkerThread(QtCore.QThread):
 
         while self.running:
             try:
-                if self.ser and self.ser.in_waiting > 0:
-                    line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        self.data_received.emit(line)
-                        
-                        # Parse MPU telemetry stream for Left and Right Slaves
-                        if "MPU_DATA" in line:
-                            parts = line.split()
-                            is_left = "[LEFT]" in line or "LEFT" in line
-                            is_right = "[RIGHT]" in line or "RIGHT" in line
-                            
-                            for i, p in enumerate(parts):
-                                if p == "MPU_DATA" and i + 1 < len(parts):
-                                    try:
-                                        pitch = float(parts[i + 1])
-                                        if is_left:
-                                            self.telemetry_left_pitch.emit(pitch)
-                                        elif is_right:
-                                            self.telemetry_right_pitch.emit(pitch)
-                                        else:
-                                            self.telemetry_left_pitch.emit(pitch)
-                                            self.telemetry_right_pitch.emit(pitch)
-                                    except ValueError:
-                                        pass
-                else:
-                    time.sleep(0.002)
+                # Bulk read: blocks until the first byte (or the timeout), then takes everything buffered
+                data = self.ser.read(max(1, self.ser.in_waiting))
+                if not data:
+                    self.rx_rate.tick()
+                    continue
+                self.feed(data)
             except Exception as e:
                 self.status_changed.emit(False, f"Read Error: {e}")
                 break
 
+        self.running = False
+        self.tx_queue.wake()
+        if self.writer:
+            self.writer.join(1.0)
         if self.ser and self.ser.is_open:
             try:
                 self.ser.close()
             except Exception:
                 pass
 
+# SHARED CARD STYLESHEET (Installed once on the main window instead of per card / per child widget)
+CARD_STYLESHEET = """
+    QFrame#ChannelCard { background-color: #171A26; border: 1px solid #23273A; border-radius: 6px; }
+    QFrame#ChannelCard:hover { background-color: #1C2030; }
+    QFrame#ChannelCard[board="L"]:hover { border-color: #00E5FF; }
+    QFrame#ChannelCard[board="R"]:hover { border-color: #FF9100; }
+    QFrame#ChannelCard[board="L"] QLabel#CardTitle { color: #00E5FF; font-weight: 800; font-size: 11px; }
+    QFrame#ChannelCard[board="R"] QLabel#CardTitle { color: #FF9100; font-weight: 800; font-size: 11px; }
+    QComboBox#CardServo { background-color: #0F111A; color: #00E676; font-weight: bold; font-size: 10px; border: 1px solid #202436; border-radius: 4px; padding: 1px 2px; }
+    QPushButton#CardWiggle, QPushButton#CardSaveStand, QPushButton#CardGoStand { background-color: #202436; border: 1px solid #2B3148; border-radius: 4px; padding: 1px; font-size: 10px; }
+    QPushButton#CardWiggle { color: #00E5FF; }
+    QPushButton#CardWiggle:hover { background-color: #00E5FF; color: #12141E; }
+    QPushButton#CardSaveStand { color: #00E676; }
+    QPushButton#CardSaveStand:hover { background-color: #00E676; color: #12141E; }
+    QPushButton#CardGoStand { color: #FF9100; }
+    QPushButton#CardGoStand:hover { background-color: #FF9100; color: #12141E; }
+    QPushButton#CardStep { padding: 1px 0px; font-weight: bold; font-size: 11px; background-color: #1F2335; }
+    QLabel#CardAngle { color: #FFFFFF; font-weight: bold; font-size: 13px; font-family: 'Consolas', 'Courier New'; margin-left: 2px; }
+    QSpinBox#CardAngleSpin { background-color: #0F111A; color: #00E5FF; font-weight: bold; font-size: 11px; border: 1px solid #202436; border-radius: 4px; padding: 1px; }
+    QFrame#ChannelCard QSlider::groove:horizontal { height: 5px; background: #0F111A; border: 1px solid #0B0C12; border-radius: 2px; }
+    QFrame#ChannelCard[board="L"] QSlider::sub-page:horizontal { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #00E5FF, stop:1 #00E676); border-radius: 2px; }
+    QFrame#ChannelCard[board="R"] QSlider::sub-page:horizontal { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #FF9100, stop:1 #00E676); border-radius: 2px; }
+    QFrame#ChannelCard[board="L"] QSlider::handle:horizontal { background: #FFFFFF; border: 2px solid #00E5FF; width: 14px; margin-top: -5px; margin-bottom: -5px; border-radius: 7px; }
+    QFrame#ChannelCard[board="R"] QSlider::handle:horizontal { background: #FFFFFF; border: 2px solid #FF9100; width: 14px; margin-top: -5px; margin-bottom: -5px; border-radius: 7px; }
+    QFrame#ChannelCard QSlider::handle:horizontal:hover { background: #00E676; border-color: #FFFFFF; }
+    QFrame#ChannelCard QSlider::tick-mark:horizontal { border: 1px solid #30374E; height: 3px; }
+"""
+
 # SINGLE SERVO CHANNEL CARD (Compact Modern Soft UI Design with Individual Standing Save)
 class ServoChannelCard(QtWidgets.QFrame):
     angle_changed = QtCore.pyqtSignal(str, int, float)
@@ -162,7 +284,6 @@ class ServoChannelCard(QtWidgets.QFrame):
         self.channel = channel
         self.current_angle = 90.0
         self.stand_angle = 90.0  # Individual Standing Pose Angle
-        self.last_send_time = 0.0
         self.is_selected = False
         self.assigned_servo = "Unassigned"
         self.init_ui()
@@ -171,19 +292,9 @@ class ServoChannelCard(QtWidgets.QFrame):
         return f"{self.board}:CH {self.channel:02d}"
 
     def init_ui(self):
+        # Styling comes from CARD_STYLESHEET on the main window; the board property selects the accent colour
         self.setObjectName("ChannelCard")
-        border_color = "#00E5FF" if self.board == 'L' else "#FF9100"
-        self.setStyleSheet(f"""
-            QFrame#ChannelCard {{
-                background-color: #171A26;
-                border: 1px solid #23273A;
-                border-radius: 6px;
-            }}
-            QFrame#ChannelCard:hover {{
-                border-color: {border_color};
-                background-color: #1C2030;
-            }}
-        """)
+        self.setProperty("board", self.board)
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(6, 5, 6, 5)
@@ -194,92 +305,42 @@ class ServoChannelCard(QtWidgets.QFrame):
         header_layout.setSpacing(3)
         
         self.lbl_title = QtWidgets.QLabel(self.get_card_id())
-        color_code = "#00E5FF" if self.board == 'L' else "#FF9100"
-        self.lbl_title.setStyleSheet(f"color: {color_code}; font-weight: 800; font-size: 11px;")
+        self.lbl_title.setObjectName("CardTitle")
         header_layout.addWidget(self.lbl_title)
 
         self.cmb_servo = QtWidgets.QComboBox()
+        self.cmb_servo.setObjectName("CardServo")
         self.cmb_servo.addItem("Unassigned")
         self.cmb_servo.addItems(LEG_SERVOS)
-        self.cmb_servo.setStyleSheet("""
-            QComboBox {
-                background-color: #0F111A;
-                color: #00E676;
-                font-weight: bold;
-                font-size: 10px;
-                border: 1px solid #202436;
-                border-radius: 4px;
-                padding: 1px 2px;
-            }
-        """)
         self.cmb_servo.currentIndexChanged.connect(self.on_servo_combo_changed)
         header_layout.addWidget(self.cmb_servo, stretch=1)
 
         # Wiggle Button
         self.btn_wiggle = QtWidgets.QPushButton("🔍")
+        self.btn_wiggle.setObjectName("CardWiggle")
         self.btn_wiggle.setFixedWidth(22)
         self.btn_wiggle.setToolTip("Wiggle servo ±4° to identify hardware channel")
-        self.btn_wiggle.setStyleSheet("""
-            QPushButton {
-                background-color: #202436;
-                color: #00E5FF;
-                border: 1px solid #2B3148;
-                border-radius: 4px;
-                padding: 1px;
-                font-size: 10px;
-            }
-            QPushButton:hover {
-                background-color: #00E5FF;
-                color: #12141E;
-            }
-        """)
         self.btn_wiggle.clicked.connect(self.on_wiggle_clicked)
         header_layout.addWidget(self.btn_wiggle)
 
         # Individual Standing Pose Save Button
         self.btn_save_stand = QtWidgets.QPushButton("📌")
+        self.btn_save_stand.setObjectName("CardSaveStand")
         self.btn_save_stand.setFixedWidth(22)
         self.btn_save_stand.setToolTip("Save current slider value as Standing Pose angle for this servo")
-        self.btn_save_stand.setStyleSheet("""
-            QPushButton {
-                background-color: #202436;
-                color: #00E676;
-                border: 1px solid #2B3148;
-                border-radius: 4px;
-                padding: 1px;
-                font-size: 10px;
-            }
-            QPushButton:hover {
-                background-color: #00E676;
-                color: #12141E;
-            }
-        """)
         self.btn_save_stand.clicked.connect(self.on_save_stand_clicked)
         header_layout.addWidget(self.btn_save_stand)
 
         # Return to Standing Pose Button
         self.btn_go_stand = QtWidgets.QPushButton("🏠")
+        self.btn_go_stand.setObjectName("CardGoStand")
         self.btn_go_stand.setFixedWidth(22)
         self.btn_go_stand.setToolTip("Move this servo to its saved Standing Pose position")
-        self.btn_go_stand.setStyleSheet("""
-            QPushButton {
-                background-color: #202436;
-                color: #FF9100;
-                border: 1px solid #2B3148;
-                border-radius: 4px;
-                padding: 1px;
-                font-size: 10px;
-            }
-            QPushButton:hover {
-                background-color: #FF9100;
-                color: #12141E;
-            }
-        """)
         self.btn_go_stand.clicked.connect(self.go_to_stand_position)
         header_layout.addWidget(self.btn_go_stand)
 
         self.lbl_angle = QtWidgets.QLabel("90°")
-        self.lbl_angle.setStyleSheet("color: #FFFFFF; font-weight: bold; font-size: 13px; font-family: 'Consolas', 'Courier New'; margin-left: 2px;")
+        self.lbl_angle.setObjectName("CardAngle")
         header_layout.addWidget(self.lbl_angle)
 
         layout.addLayout(header_layout)
@@ -289,8 +350,8 @@ class ServoChannelCard(QtWidgets.QFrame):
         slider_layout.setSpacing(3)
 
         self.btn_dec = QtWidgets.QPushButton("-")
+        self.btn_dec.setObjectName("CardStep")
         self.btn_dec.setFixedWidth(20)
-        self.btn_dec.setStyleSheet("padding: 1px 0px; font-weight: bold; font-size: 11px; background-color: #1F2335;")
         self.btn_dec.clicked.connect(self.decrement_angle)
         slider_layout.addWidget(self.btn_dec)
 
@@ -299,30 +360,22 @@ class ServoChannelCard(QtWidgets.QFrame):
         self.slider.setValue(90)
         self.slider.setTickPosition(QtWidgets.QSlider.TickPosition.TicksBelow)
         self.slider.setTickInterval(30)
-        slider_color = "#00E5FF" if self.board == 'L' else "#FF9100"
-        self.slider.setStyleSheet(f"""
-            QSlider::groove:horizontal {{ height: 5px; background: #0F111A; border: 1px solid #0B0C12; border-radius: 2px; }}
-            QSlider::sub-page:horizontal {{ background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {slider_color}, stop:1 #00E676); border-radius: 2px; }}
-            QSlider::handle:horizontal {{ background: #FFFFFF; border: 2px solid {slider_color}; width: 14px; margin-top: -5px; margin-bottom: -5px; border-radius: 7px; }}
-            QSlider::handle:horizontal:hover {{ background: #00E676; border-color: #FFFFFF; }}
-            QSlider::tick-mark:horizontal {{ border: 1px solid #30374E; height: 3px; }}
-        """)
         self.slider.valueChanged.connect(self.on_slider_moved)
         slider_layout.addWidget(self.slider)
 
         self.btn_inc = QtWidgets.QPushButton("+")
+        self.btn_inc.setObjectName("CardStep")
         self.btn_inc.setFixedWidth(20)
-        self.btn_inc.setStyleSheet("padding: 1px 0px; font-weight: bold; font-size: 11px; background-color: #1F2335;")
         self.btn_inc.clicked.connect(self.increment_angle)
         slider_layout.addWidget(self.btn_inc)
 
         self.spn_angle = QtWidgets.QSpinBox()
+        self.spn_angle.setObjectName("CardAngleSpin")
         self.spn_angle.setRange(0, 180)
         self.spn_angle.setValue(90)
         self.spn_angle.setFixedWidth(44)
         self.spn_angle.setKeyboardTracking(False)
         self.spn_angle.setToolTip("Type angle & press ENTER to set")
-        self.spn_angle.setStyleSheet("background-color: #0F111A; color: #00E5FF; font-weight: bold; font-size: 11px; border: 1px solid #202436; border-radius: 4px; padding: 1px;")
         self.spn_angle.editingFinished.connect(self.on_spinbox_editing_finished)
         slider_layout.addWidget(self.spn_angle)
 
@@ -367,11 +420,7 @@ class ServoChannelCard(QtWidgets.QFrame):
         self.spn_angle.blockSignals(True)
         self.spn_angle.setValue(int(angle))
         self.spn_angle.blockSignals(False)
-
-        now = time.time()
-        if now - self.last_send_time >= 0.02:
-            self.last_send_time = now
-            self.angle_changed.emit(self.board, self.channel, angle)
+        self.angle_changed.emit(self.board, self.channel, angle)
 
     def set_angle(self, angle, emit_signal=True):
         self.slider.blockSignals(True)
@@ -400,6 +449,8 @@ class ServoChannelCard(QtWidgets.QFrame):
 class RollopodMainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
+        self.startup_times = [("imports", STARTUP_IMPORT_S)]
+        self.startup_mark = time.perf_counter()
         self.setWindowTitle("Rollopod Dual ESP32 Controller - Waddling Gait Generator & Dual Telemetry")
         self.resize(1380, 940)
 
@@ -408,21 +459,86 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.realtime_enabled = True
         self.telemetry_active = False
 
-        self.settings_file = "rollopod_servo_profile.json"
+        # v2 profile; the v1 JSON profile is only read to migrate it and stays as it is
+        self.settings_file = "rollopod_servo_profile" + PROFILE_EXT
+        self.profile = ProfileStore(self.settings_file, legacy_path="rollopod_servo_profile" + LEGACY_EXT)
+        # Debounced profile writes: a burst of edits (e.g. pinning stand angles card by card) becomes one save
+        self.profile_save_timer = QtCore.QTimer(self)
+        self.profile_save_timer.setSingleShot(True)
+        self.profile_save_timer.setInterval(PROFILE_SAVE_DEBOUNCE_MS)
+        self.profile_save_timer.timeout.connect(self.flush_profile)
+
+        # Host-side tick calibration (Controller_GUI/settings.json)
+        self.calibration_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+        try:
+            self.calibration = CalibrationTable.load(self.calibration_file)
+        except (OSError, ValueError) as e:
+            print(f"[CALIBRATION] Using firmware defaults ({e})")
+            self.calibration = CalibrationTable()
+        self.send_ticks = False
         self.cards = []
         self.dashboard_view_mode = "Leg Control"
 
-        # Waddling Gait Engine Parameters
+        # Waddling Gait Engine Parameters (gait math + transmit run on a real-time control thread)
         self.waddling = False
-        self.waddle_timer = QtCore.QTimer(self)
-        self.waddle_timer.setInterval(20)  # 50Hz update loop
-        self.waddle_timer.timeout.connect(self.update_waddling_gait)
-        self.waddle_start_time = 0.0
+        self.waddle_gait = WaddleGait()
+        self.waddle_loop = None
+        self.waddle_display_timer = QtCore.QTimer(self)
+        self.waddle_display_timer.setInterval(33)  # ~30Hz display refresh, decoupled from the 50Hz control loop
+        self.waddle_display_timer.timeout.connect(self.update_waddling_display)
         self.waddle_base_speed = 120
         self.waddle_frequency = 2.0  # Hz
         self.waddle_amplitude_pct = 50.0  # %
         self.waddle_ramp_time = 1.0  # Ramp duration in seconds
-        self.waddle_ramp_factor = 0.0
+
+        # Closed-Loop Pitch Stabilizer (runs per telemetry sample in the serial thread, wraps the waddle)
+        self.stabilizer = PitchStabilizer(self.send_stabilizer_command)
+        self.stabilized_waddle = StabilizedGait(self.waddle_gait, self.stabilizer)
+        self.stabilizer_traces_dir = "stabilizer_traces"
+        self.stabilizer_status_timer = QtCore.QTimer(self)
+        self.stabilizer_status_timer.setInterval(200)
+        self.stabilizer_status_timer.timeout.connect(self.update_stabilizer_status)
+
+        # Vectorized Walking Gait Engine (Tripod / Wave / Ripple over the 20 LEG_SERVOS)
+        self.walking = False
+        self.leg_gait = LegGaitGenerator()
+        self.walk_loop = None
+
+        # On-Board Gait Tables (compiled here, uploaded once, played by the slaves themselves)
+        self.gait_upload = None
+        self.onboard_gait_playing = False
+        self.gait_upload_timer = QtCore.QTimer(self)
+        self.gait_upload_timer.setInterval(20)
+        self.gait_upload_timer.timeout.connect(self.poll_gait_upload)
+
+        # Bounded Console (filled from any thread, flushed to the widget in batches)
+        self.console = ConsoleBuffer(DEFAULT_CONSOLE_LINES)
+        self.console_flush_timer = QtCore.QTimer(self)
+        self.console_flush_timer.setInterval(DEFAULT_CONSOLE_FLUSH_MS)
+        self.console_flush_timer.timeout.connect(self.flush_console)
+
+        # MPU Telemetry History (ring buffers filled by the serial thread, drawn at display rate)
+        self.telemetry = TelemetryHistory()
+        self.telemetry_drawn_counts = None
+        self.telemetry_display_timer = QtCore.QTimer(self)
+        self.telemetry_display_timer.setInterval(33)
+        self.telemetry_display_timer.timeout.connect(self.update_telemetry_display)
+
+        # Command Recording & Replay
+        self.recorder = CommandRecorder()
+        self.recordings_dir = "recordings"
+        self.last_recording = ""
+        self.replayer = None
+        self.replay_timer = QtCore.QTimer(self)
+        self.replay_timer.setInterval(100)
+        self.replay_timer.timeout.connect(self.update_replay_status)
+
+        # Pose-to-Pose Minimum-Jerk Transition Engine
+        self.pose_loop = None
+        self.pose_transition_cards = {}
+        self.pose_display_timer = QtCore.QTimer(self)
+        self.pose_display_timer.setInterval(33)
+        self.pose_display_timer.timeout.connect(self.update_pose_transition_display)
 
         self.leg_channel_map = {
             "Left Front Coxa": "L:CH 00", "Left Front Femur": "L:CH 01", "Left Front Tibia": "L:CH 02",
@@ -433,9 +549,22 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             "Right Rear Coxa": "R:CH 07", "Right Rear Femur": "R:CH 08", "Right Rear Tibia": "R:CH 09"
         }
         self.leg_map_combos = {}
+        self.mark_startup("state init")
 
         self.init_ui()
         self.load_profile()
+        self.mark_startup("profile load")
+        self.telemetry_display_timer.start()
+        self.console_flush_timer.start()
+
+    def mark_startup(self, phase):
+        now = time.perf_counter()
+        self.startup_times.append((phase, now - self.startup_mark))
+        self.startup_mark = now
+
+    def startup_report(self):
+        total = sum(t for _, t in self.startup_times)
+        return " | ".join(f"{phase} {t * 1000:.0f}ms" for phase, t in self.startup_times) + f" | total {total * 1000:.0f}ms"
 
     def get_card_by_key(self, key_str):
         if not key_str or key_str == "Unassigned" or ":" not in key_str:
@@ -468,7 +597,7 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             QPushButton { background-color: #1F2335; color: #FFFFFF; border: 1px solid #2B3148; border-radius: 5px; padding: 5px 12px; font-weight: bold; }
             QPushButton:hover { background-color: #272C42; border-color: #00E5FF; }
             QPlainTextEdit { background-color: #0A0C14; border: 1px solid #1A1D2C; border-radius: 6px; font-family: 'Consolas', monospace; font-size: 11px; color: #00E676; }
-        """)
+        """ + CARD_STYLESHEET)
 
         central_widget = QtWidgets.QWidget()
         self.setCentralWidget(central_widget)
@@ -503,13 +632,96 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         top_bar.addWidget(self.lbl_status)
         top_bar.addStretch()
 
-        self.chk_realtime = QtWidgets.QCheckBox("Realtime (50Hz)")
+        self.chk_realtime = QtWidgets.QCheckBox("Realtime")
         self.chk_realtime.setChecked(True)
         self.chk_realtime.setStyleSheet("color: #00E676; font-weight: bold;")
         self.chk_realtime.stateChanged.connect(self.on_realtime_toggled)
         top_bar.addWidget(self.chk_realtime)
+
+        top_bar.addWidget(QtWidgets.QLabel("TX Rate:"))
+        self.spn_tx_rate = QtWidgets.QSpinBox()
+        self.spn_tx_rate.setRange(10, 200)
+        self.spn_tx_rate.setSingleStep(10)
+        self.spn_tx_rate.setSuffix(" Hz")
+        self.spn_tx_rate.setValue(int(DEFAULT_FLUSH_HZ))
+        self.spn_tx_rate.setToolTip("Flush rate for coalesced slider commands (newest value per servo / motor)")
+        self.spn_tx_rate.valueChanged.connect(self.on_tx_rate_changed)
+        top_bar.addWidget(self.spn_tx_rate)
+
+        self.chk_adaptive_rate = QtWidgets.QCheckBox("Adaptive")
+        self.chk_adaptive_rate.setToolTip("Throttle slider flushes and gait loops to what the ESP-NOW link sustains, estimated from "
+                                          "ACKs, [LINK FAIL] reports and telemetry gaps (TX Rate is the ceiling)")
+        self.chk_adaptive_rate.setStyleSheet("font-size: 10px;")
+        self.chk_adaptive_rate.setChecked(True)
+        self.chk_adaptive_rate.toggled.connect(self.on_adaptive_rate_toggled)
+        top_bar.addWidget(self.chk_adaptive_rate)
+
+        self.lbl_link_rate = QtWidgets.QLabel("")
+        self.lbl_link_rate.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        top_bar.addWidget(self.lbl_link_rate)
+
+        top_bar.addWidget(QtWidgets.QLabel("Deadband:"))
+        self.spn_deadband = QtWidgets.QDoubleSpinBox()
+        self.spn_deadband.setRange(0.0, 5.0)
+        self.spn_deadband.setSingleStep(0.1)
+        self.spn_deadband.setDecimals(1)
+        self.spn_deadband.setSuffix("°")
+        self.spn_deadband.setValue(DEFAULT_DEADBAND_DEG)
+        self.spn_deadband.setToolTip("Skip servo updates smaller than this since the last angle sent (0 = send everything). Full state is resent every 2 s.")
+        self.spn_deadband.valueChanged.connect(self.on_deadband_changed)
+        top_bar.addWidget(self.spn_deadband)
+
+        self.chk_seq_acks = QtWidgets.QCheckBox("Seq/ACK")
+        self.chk_seq_acks.setToolTip("Sequence-number L/R/B commands and match the slaves' ACKs for round-trip latency and loss (bridge v3+)")
+        self.chk_seq_acks.setStyleSheet("font-size: 10px;")
+        self.chk_seq_acks.toggled.connect(self.on_seq_acks_toggled)
+        top_bar.addWidget(self.chk_seq_acks)
+
+        self.lbl_ack_stats = QtWidgets.QLabel("")
+        self.lbl_ack_stats.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        top_bar.addWidget(self.lbl_ack_stats)
+
+        self.lbl_tx_stats = QtWidgets.QLabel("TX: 0 sent | 0 coalesced")
+        self.lbl_tx_stats.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        top_bar.addWidget(self.lbl_tx_stats)
+
+        self.lbl_tx_latency = QtWidgets.QLabel("")
+        self.lbl_tx_latency.setToolTip("Enqueue-to-wire latency per TX priority class: mean / p99 (ms)")
+        self.lbl_tx_latency.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        top_bar.addWidget(self.lbl_tx_latency)
+
+        # Command recorder & replayer
+        top_bar.addSpacing(10)
+        self.btn_record = QtWidgets.QPushButton("⏺ REC")
+        self.btn_record.setCheckable(True)
+        self.btn_record.setToolTip("Record every command sent to the bridge into a timestamped binary log")
+        self.btn_record.setStyleSheet("QPushButton { background-color: #24293E; color: #E1E4EC; font-weight: bold; } QPushButton:checked { background-color: #FF0055; color: #FFFFFF; }")
+        self.btn_record.toggled.connect(self.toggle_recording)
+        top_bar.addWidget(self.btn_record)
+
+        self.btn_replay = QtWidgets.QPushButton("▶ Replay")
+        self.btn_replay.setToolTip("Replay a recorded command log with deadline scheduling")
+        self.btn_replay.clicked.connect(self.toggle_replay)
+        top_bar.addWidget(self.btn_replay)
+
+        self.spn_replay_speed = QtWidgets.QDoubleSpinBox()
+        self.spn_replay_speed.setRange(0.25, 4.0)
+        self.spn_replay_speed.setSingleStep(0.25)
+        self.spn_replay_speed.setValue(1.0)
+        self.spn_replay_speed.setSuffix("x")
+        self.spn_replay_speed.setToolTip("Replay speed (1.0x = recorded timing)")
+        top_bar.addWidget(self.spn_replay_speed)
+
+        self.lbl_replay = QtWidgets.QLabel("")
+        self.lbl_replay.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        top_bar.addWidget(self.lbl_replay)
         main_layout.addLayout(top_bar)
 
+        self.tx_stats_timer = QtCore.QTimer(self)
+        self.tx_stats_timer.setInterval(500)
+        self.tx_stats_timer.timeout.connect(self.update_tx_stats)
+        self.tx_stats_timer.start()
+
         # COMPACT COLLAPSIBLE LIVE SERIAL LOG STREAM
         box_log = QtWidgets.QGroupBox("LIVE SERIAL LOG STREAM")
         box_log.setFixedHeight(95)
@@ -517,14 +729,26 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         log_layout.setContentsMargins(6, 12, 6, 6)
         self.txt_console = QtWidgets.QPlainTextEdit()
         self.txt_console.setReadOnly(True)
-        self.txt_console.setMaximumBlockCount(80)
+        self.txt_console.setMaximumBlockCount(DEFAULT_CONSOLE_LINES)
+        self.txt_console.setUndoRedoEnabled(False)
         log_layout.addWidget(self.txt_console)
 
+        # Console filters act before buffering, so hidden lines never reach the widget
+        self.chk_log_tx = QtWidgets.QCheckBox("TX Echo")
+        self.chk_log_tx.setChecked(True)
+        self.chk_log_tx.setStyleSheet("font-size: 10px;")
+        self.chk_log_tx.toggled.connect(lambda on: self.console.set_visible(KIND_TX, on))
+        self.chk_log_telem = QtWidgets.QCheckBox("Telemetry")
+        self.chk_log_telem.setChecked(True)
+        self.chk_log_telem.setStyleSheet("font-size: 10px;")
+        self.chk_log_telem.toggled.connect(lambda on: self.console.set_visible(KIND_TELEMETRY, on))
+
         btn_clear_log = QtWidgets.QPushButton("🧹 Clear Log")
         btn_clear_log.setFixedWidth(80)
         btn_clear_log.setStyleSheet("padding: 2px 6px; font-size: 10px;")
-        btn_clear_log.clicked.connect(lambda: self.txt_console.clear())
+        btn_clear_log.clicked.connect(self.clear_console)
         log_header_layout = QtWidgets.QHBoxLayout()
+        log_header_layout.addWidget(self.chk_log_tx); log_header_layout.addWidget(self.chk_log_telem)
         log_header_layout.addStretch(); log_header_layout.addWidget(btn_clear_log)
         log_layout.addLayout(log_header_layout)
         main_layout.addWidget(box_log)
@@ -532,19 +756,36 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.tabs = QtWidgets.QTabWidget()
         main_layout.addWidget(self.tabs)
 
+        self.mark_startup("window chrome")
+
         self.tab_dashboard = QtWidgets.QWidget()
         self.init_dashboard_tab()
         self.tabs.addTab(self.tab_dashboard, "🎛️ Master Control Dashboard")
+        self.mark_startup("dashboard tab")
 
+        # Waddling and calibration tabs are built on first visit (see ensure_tab_built)
         self.tab_waddling = QtWidgets.QWidget()
-        self.init_waddling_tab()
         self.tabs.addTab(self.tab_waddling, "🚶 Waddling Gait Generator")
 
         self.tab_calibration = QtWidgets.QWidget()
-        self.init_calibration_tab()
         self.tabs.addTab(self.tab_calibration, "⚙️ Servo Assignment & Profiles")
 
+        self.pending_tabs = {self.tab_waddling: self.init_waddling_tab, self.tab_calibration: self.init_calibration_tab}
+        self.tabs.currentChanged.connect(lambda index: self.ensure_tab_built(self.tabs.widget(index)))
+
         self.scan_ports()
+        self.mark_startup("port scan")
+
+    def ensure_tab_built(self, tab):
+        builder = self.pending_tabs.pop(tab, None)
+        if builder is None:
+            return
+        t0 = time.perf_counter()
+        builder()
+        if tab is self.tab_calibration:
+            self.sync_leg_map_combos()
+            self.refresh_profile_lists()
+        self.log_console(f"[STARTUP] Built '{self.tabs.tabText(self.tabs.indexOf(tab))}' tab on first visit in {(time.perf_counter() - t0) * 1000:.0f} ms")
 
     def init_dashboard_tab(self):
         layout = QtWidgets.QHBoxLayout(self.tab_dashboard)
@@ -607,18 +848,107 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         btn_preset_all90.clicked.connect(self.set_all_servos_90)
         mode_bar.addWidget(btn_preset_all90)
 
+        mode_bar.addSpacing(10)
+        lbl_transition = QtWidgets.QLabel("TRANSITION:")
+        lbl_transition.setStyleSheet("font-weight: bold; color: #8E98B0; font-size: 11px;")
+        mode_bar.addWidget(lbl_transition)
+
+        self.spn_pose_duration = QtWidgets.QDoubleSpinBox()
+        self.spn_pose_duration.setRange(0.0, 5.0)
+        self.spn_pose_duration.setSingleStep(0.25)
+        self.spn_pose_duration.setValue(1.0)
+        self.spn_pose_duration.setSuffix(" s")
+        self.spn_pose_duration.setToolTip("Minimum-jerk transition time for pose presets (0 = instant jump)")
+        mode_bar.addWidget(self.spn_pose_duration)
+
+        self.spn_pose_rate = QtWidgets.QSpinBox()
+        self.spn_pose_rate.setRange(10, 200)
+        self.spn_pose_rate.setSingleStep(10)
+        self.spn_pose_rate.setValue(50)
+        self.spn_pose_rate.setSuffix(" Hz")
+        self.spn_pose_rate.setToolTip("Intermediate frame rate for pose transitions")
+        mode_bar.addWidget(self.spn_pose_rate)
+
         mode_bar.addStretch()
         left_layout.addLayout(mode_bar)
 
+        # TRANSFORMATION BAR: STAGED WALK <-> ROLL SEQUENCE UNDER PER-JOINT SPEED LIMITS
+        transform_bar = QtWidgets.QHBoxLayout()
+        lbl_transform = QtWidgets.QLabel("TRANSFORM:")
+        lbl_transform.setStyleSheet("font-weight: bold; color: #8E98B0; font-size: 11px;")
+        transform_bar.addWidget(lbl_transform)
+
+        btn_walk_to_roll = QtWidgets.QPushButton("🔄 Walk → Roll")
+        btn_walk_to_roll.setToolTip("Staged Standing Pose → Rolling Pose sequence (coxa, then femur/patella, then tibia)")
+        btn_walk_to_roll.setStyleSheet("background-color: #00E5FF; color: #12141E; font-size: 11px; font-weight: bold;")
+        btn_walk_to_roll.clicked.connect(lambda: self.run_transformation(to_rolling=True))
+        transform_bar.addWidget(btn_walk_to_roll)
+
+        btn_roll_to_walk = QtWidgets.QPushButton("🦿 Roll → Walk")
+        btn_roll_to_walk.setToolTip("Staged Rolling Pose → Standing Pose sequence (reverse stage order)")
+        btn_roll_to_walk.setStyleSheet("background-color: #00E676; color: #12141E; font-size: 11px; font-weight: bold;")
+        btn_roll_to_walk.clicked.connect(lambda: self.run_transformation(to_rolling=False))
+        transform_bar.addWidget(btn_roll_to_walk)
+
+        transform_bar.addSpacing(10)
+        self.transform_speed_spins = {}
+        for role, default in (("Coxa", 90), ("Femur", 90), ("Tibia", 120)):
+            lbl_role = QtWidgets.QLabel(f"{role}:")
+            lbl_role.setStyleSheet("color: #8E98B0; font-size: 11px;")
+            transform_bar.addWidget(lbl_role)
+            spn = QtWidgets.QSpinBox()
+            spn.setRange(10, 600)
+            spn.setSingleStep(10)
+            spn.setValue(default)
+            spn.setSuffix(" °/s")
+            spn.setToolTip(f"Maximum {role.lower()} joint speed during transformation" + (" (also used for Patella)" if role == "Femur" else ""))
+            transform_bar.addWidget(spn)
+            self.transform_speed_spins[role] = spn
+
+        self.lbl_transform_status = QtWidgets.QLabel("")
+        self.lbl_transform_status.setStyleSheet("color: #8E98B0; font-size: 11px;")
+        transform_bar.addWidget(self.lbl_transform_status)
+        transform_bar.addStretch()
+        left_layout.addLayout(transform_bar)
+
+        # NAMED POSE LIBRARY (kept in memory by the profile store, so switching poses never touches the disk)
+        pose_bar = QtWidgets.QHBoxLayout()
+        lbl_poses = QtWidgets.QLabel("POSES:")
+        lbl_poses.setStyleSheet("font-weight: bold; color: #8E98B0; font-size: 11px;")
+        pose_bar.addWidget(lbl_poses)
+
+        self.cmb_pose = QtWidgets.QComboBox()
+        self.cmb_pose.setMinimumWidth(160)
+        pose_bar.addWidget(self.cmb_pose)
+
+        btn_pose_go = QtWidgets.QPushButton("▶ Go")
+        btn_pose_go.setToolTip("Move to the selected saved pose (uses the transition settings above)")
+        btn_pose_go.clicked.connect(self.apply_named_pose)
+        pose_bar.addWidget(btn_pose_go)
+
+        btn_pose_save = QtWidgets.QPushButton("💾 Save As…")
+        btn_pose_save.setToolTip("Store the current slider angles of all 32 channels as a named pose")
+        btn_pose_save.clicked.connect(self.save_named_pose)
+        pose_bar.addWidget(btn_pose_save)
+
+        btn_pose_delete = QtWidgets.QPushButton("🗑")
+        btn_pose_delete.setToolTip("Delete the selected pose")
+        btn_pose_delete.clicked.connect(self.delete_named_pose)
+        pose_bar.addWidget(btn_pose_delete)
+        pose_bar.addStretch()
+        left_layout.addLayout(pose_bar)
+
         scroll_area = QtWidgets.QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         scroll_area.setStyleSheet("QScrollArea { border: none; background: transparent; }")
 
-        self.dashboard_cards_widget = QtWidgets.QWidget()
-        self.dashboard_cards_layout = QtWidgets.QVBoxLayout(self.dashboard_cards_widget)
-        self.dashboard_cards_layout.setContentsMargins(0, 0, 0, 0)
-        self.dashboard_cards_layout.setSpacing(10)
+        # One page per view mode, built on first use and kept; switching only re-seats the cards
+        self.dashboard_stack = QtWidgets.QStackedWidget()
+        self.dashboard_pages = {}
+        self.dashboard_placement = None
+        self.dashboard_layout_cards = {}   # layout -> [(card, grid position), ...] currently seated there
+        self.dashboard_card_homes = {}     # card -> layout it currently sits in
 
         for ch in range(16):
             card = ServoChannelCard(board='L', channel=ch)
@@ -636,7 +966,7 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             card.stand_saved.connect(self.on_card_stand_saved)
             self.cards.append(card)
 
-        scroll_area.setWidget(self.dashboard_cards_widget)
+        scroll_area.setWidget(self.dashboard_stack)
         left_layout.addWidget(scroll_area)
         layout.addWidget(left_pane, stretch=3)
 
@@ -689,6 +1019,14 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
 
         mpu_layout.addLayout(gauges_layout)
 
+        self.pitch_plot = PitchPlotWidget(window_s=10.0)
+        mpu_layout.addWidget(self.pitch_plot)
+
+        self.lbl_telem_rate = QtWidgets.QLabel("L: 0.0 Hz | R: 0.0 Hz")
+        self.lbl_telem_rate.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.lbl_telem_rate.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        mpu_layout.addWidget(self.lbl_telem_rate)
+
         telem_btn_layout = QtWidgets.QHBoxLayout()
         self.btn_telem_toggle = QtWidgets.QPushButton("📡 Telemetry ON")
         self.btn_telem_toggle.setStyleSheet("background-color: #1F2335; color: #00E676; border-color: #00E676; font-size: 10px;")
@@ -727,7 +1065,7 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
 
         btn_torque_all_off = QtWidgets.QPushButton("🛑 ALL TORQUE OFF (12V OFF)")
         btn_torque_all_off.setStyleSheet("background-color: #FF0055; color: #FFFFFF; font-size: 11px; font-weight: bold; padding: 5px;")
-        btn_torque_all_off.clicked.connect(lambda: self.send_command("B TORQUE 0"))
+        btn_torque_all_off.clicked.connect(lambda: self.send_command("B TORQUE 0", stop=True))
         torque_layout.addWidget(btn_torque_all_off)
         right_layout.addWidget(box_torque)
 
@@ -897,6 +1235,25 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.slider_w_amp.valueChanged.connect(self.on_waddle_param_changed)
         ctrl_layout.addWidget(self.slider_w_amp)
 
+        # Differential Waveform Shape (Wavetable) + Custom Fourier Harmonics
+        h_wave = QtWidgets.QHBoxLayout()
+        lbl_wave_title = QtWidgets.QLabel("Differential Waveform:")
+        lbl_wave_title.setStyleSheet("font-weight: bold; font-size: 12px; color: #FFFFFF;")
+        h_wave.addWidget(lbl_wave_title)
+
+        self.cmb_w_waveform = QtWidgets.QComboBox()
+        self.cmb_w_waveform.addItems(WAVEFORM_SHAPES)
+        self.cmb_w_waveform.currentTextChanged.connect(self.on_waddle_waveform_changed)
+        h_wave.addWidget(self.cmb_w_waveform)
+
+        self.txt_w_harmonics = QtWidgets.QLineEdit("1:1.0, 3:0.3")
+        self.txt_w_harmonics.setToolTip("Custom Fourier harmonics as k:amp or k:amp:phase_deg, comma separated (press ENTER to apply)")
+        self.txt_w_harmonics.setStyleSheet("background-color: #0F111A; color: #00E676; font-family: 'Consolas'; border: 1px solid #202436; border-radius: 4px; padding: 2px;")
+        self.txt_w_harmonics.setEnabled(False)
+        self.txt_w_harmonics.editingFinished.connect(lambda: self.on_waddle_waveform_changed(self.cmb_w_waveform.currentText()))
+        h_wave.addWidget(self.txt_w_harmonics, stretch=1)
+        ctrl_layout.addLayout(h_wave)
+
         # 4. Configurable Acceleration Ramp Time Control (0.1s - 5.0s)
         h_ramp = QtWidgets.QHBoxLayout()
         lbl_r_title = QtWidgets.QLabel("Acceleration Ramp Duration (s):")
@@ -940,7 +1297,11 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         gait_action_layout.addWidget(btn_stop_waddle)
         ctrl_layout.addLayout(gait_action_layout)
 
-        layout.addWidget(box_ctrl, stretch=2)
+        left_col = QtWidgets.QVBoxLayout()
+        left_col.setSpacing(10)
+        left_col.addWidget(box_ctrl)
+        left_col.addWidget(self.init_walking_gait_box())
+        layout.addLayout(left_col, stretch=2)
 
         # RIGHT PANE: REALTIME VISUAL OSCILLOSCOPE GAUGES
         box_vis = QtWidgets.QGroupBox("📊 Realtime Differential Sine Speed Meters")
@@ -972,7 +1333,266 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.txt_waddle_info.setPlainText("Waddling Gait Generator Idle.\nPress 'START WADDLING GAIT' to begin differential sine oscillation.")
         vis_layout.addWidget(self.txt_waddle_info)
 
-        layout.addWidget(box_vis, stretch=1)
+        # Control Loop Timing Jitter
+        self.lbl_waddle_jitter = QtWidgets.QLabel("Loop Jitter: mean -- | p99 -- | max --")
+        self.lbl_waddle_jitter.setStyleSheet("color: #8E98B0; font-weight: bold; font-size: 11px; font-family: 'Consolas';")
+        vis_layout.addWidget(self.lbl_waddle_jitter)
+
+        right_col = QtWidgets.QVBoxLayout()
+        right_col.setSpacing(10)
+        right_col.addWidget(box_vis)
+        right_col.addWidget(self.init_stabilizer_box())
+        layout.addLayout(right_col, stretch=1)
+
+    def init_stabilizer_box(self):
+        box_stab = QtWidgets.QGroupBox("🎯 Pitch Stabilizer (Closed-Loop PID on MPU Telemetry)")
+        stab_layout = QtWidgets.QGridLayout(box_stab)
+        stab_layout.setContentsMargins(14, 18, 14, 14)
+        stab_layout.setSpacing(8)
+
+        self.chk_stabilizer = QtWidgets.QCheckBox("Enable (corrects motor speeds per pitch sample)")
+        self.chk_stabilizer.setStyleSheet("color: #00E676; font-weight: bold;")
+        self.chk_stabilizer.toggled.connect(self.on_stabilizer_toggled)
+        stab_layout.addWidget(self.chk_stabilizer, 0, 0, 1, 4)
+
+        def spin(label, row, col, lo, hi, value, step, decimals=1, suffix=""):
+            stab_layout.addWidget(QtWidgets.QLabel(label), row, col)
+            box = QtWidgets.QDoubleSpinBox()
+            box.setRange(lo, hi)
+            box.setDecimals(decimals)
+            box.setSingleStep(step)
+            box.setValue(value)
+            box.setSuffix(suffix)
+            box.valueChanged.connect(self.push_stabilizer_params)
+            stab_layout.addWidget(box, row, col + 1)
+            return box
+
+        self.spn_stab_kp = spin("Kp:", 1, 0, 0.0, 100.0, DEFAULT_KP, 0.5)
+        self.spn_stab_ki = spin("Ki:", 1, 2, 0.0, 200.0, DEFAULT_KI, 1.0)
+        self.spn_stab_kd = spin("Kd:", 2, 0, 0.0, 20.0, DEFAULT_KD, 0.1, decimals=2)
+        self.spn_stab_setpoint = spin("Setpoint:", 2, 2, -45.0, 45.0, 0.0, 0.5, suffix="°")
+        self.spn_stab_limit = spin("Limit:", 3, 0, 0.0, 255.0, DEFAULT_OUTPUT_LIMIT, 5.0, decimals=0)
+        self.spn_stab_slew = spin("Slew:", 3, 2, 0.0, 5000.0, DEFAULT_SLEW_PER_S, 50.0, decimals=0, suffix="/s")
+
+        self.chk_stab_reverse = QtWidgets.QCheckBox("Reverse action")
+        self.chk_stab_reverse.setToolTip("Tick if driving forward pitches the shell negative")
+        self.chk_stab_reverse.toggled.connect(self.push_stabilizer_params)
+        stab_layout.addWidget(self.chk_stab_reverse, 4, 0, 1, 2)
+
+        self.spn_stab_step = spin("Step:", 4, 2, -20.0, 20.0, 2.0, 0.5, suffix="°")
+        self.btn_stab_step = QtWidgets.QPushButton("📈 Run Step Test")
+        self.btn_stab_step.setStyleSheet("background-color: #1F2335; color: #E040FB; border: 1px solid #E040FB; font-weight: bold;")
+        self.btn_stab_step.clicked.connect(self.run_stabilizer_step_test)
+        stab_layout.addWidget(self.btn_stab_step, 5, 0, 1, 4)
+
+        self.lbl_stab_status = QtWidgets.QLabel("Sample→Cmd: p50 -- | p99 -- | max -- | compute --")
+        self.lbl_stab_status.setStyleSheet("color: #8E98B0; font-weight: bold; font-size: 11px; font-family: 'Consolas';")
+        self.lbl_stab_status.setWordWrap(True)
+        stab_layout.addWidget(self.lbl_stab_status, 6, 0, 1, 4)
+        self.push_stabilizer_params()
+        return box_stab
+
+    def init_walking_gait_box(self):
+        box_walk = QtWidgets.QGroupBox("🦿 Walking Gait Generator (Tripod / Wave / Ripple, 20 Leg Servos)")
+        walk_layout = QtWidgets.QGridLayout(box_walk)
+        walk_layout.setContentsMargins(14, 18, 14, 14)
+        walk_layout.setSpacing(8)
+
+        walk_layout.addWidget(QtWidgets.QLabel("Gait Pattern:"), 0, 0)
+        self.cmb_walk_gait = QtWidgets.QComboBox()
+        self.cmb_walk_gait.addItems(GAIT_NAMES)
+        self.cmb_walk_gait.currentTextChanged.connect(self.on_walk_param_changed)
+        walk_layout.addWidget(self.cmb_walk_gait, 0, 1)
+
+        walk_layout.addWidget(QtWidgets.QLabel("Cycle Freq:"), 0, 2)
+        self.spn_walk_freq = QtWidgets.QDoubleSpinBox()
+        self.spn_walk_freq.setRange(0.1, 2.0)
+        self.spn_walk_freq.setSingleStep(0.1)
+        self.spn_walk_freq.setValue(0.5)
+        self.spn_walk_freq.setSuffix(" Hz")
+        self.spn_walk_freq.valueChanged.connect(self.on_walk_param_changed)
+        walk_layout.addWidget(self.spn_walk_freq, 0, 3)
+
+        walk_layout.addWidget(QtWidgets.QLabel("Stride (±°):"), 1, 0)
+        self.spn_walk_stride = QtWidgets.QSpinBox()
+        self.spn_walk_stride.setRange(0, 45)
+        self.spn_walk_stride.setValue(20)
+        self.spn_walk_stride.valueChanged.connect(self.on_walk_param_changed)
+        walk_layout.addWidget(self.spn_walk_stride, 1, 1)
+
+        walk_layout.addWidget(QtWidgets.QLabel("Lift (°):"), 1, 2)
+        self.spn_walk_lift = QtWidgets.QSpinBox()
+        self.spn_walk_lift.setRange(0, 60)
+        self.spn_walk_lift.setValue(25)
+        self.spn_walk_lift.valueChanged.connect(self.on_walk_param_changed)
+        walk_layout.addWidget(self.spn_walk_lift, 1, 3)
+
+        walk_layout.addWidget(QtWidgets.QLabel("Stream Rate:"), 2, 0)
+        self.spn_walk_rate = QtWidgets.QSpinBox()
+        self.spn_walk_rate.setRange(20, 200)
+        self.spn_walk_rate.setSingleStep(10)
+        self.spn_walk_rate.setValue(100)
+        self.spn_walk_rate.setSuffix(" Hz")
+        self.spn_walk_rate.setToolTip("Control loop rate (applied on next start)")
+        walk_layout.addWidget(self.spn_walk_rate, 2, 1)
+
+        self.btn_start_walk = QtWidgets.QPushButton("🦿 START WALKING")
+        self.btn_start_walk.setStyleSheet("background-color: #00E5FF; color: #12141E; font-size: 12px; font-weight: bold; padding: 8px;")
+        self.btn_start_walk.clicked.connect(self.toggle_walking_gait)
+        walk_layout.addWidget(self.btn_start_walk, 2, 2, 1, 2)
+
+        self.lbl_walk_status = QtWidgets.QLabel("Walking Gait Idle (base pose = saved Standing Pose)")
+        self.lbl_walk_status.setStyleSheet("color: #8E98B0; font-size: 11px; font-family: 'Consolas';")
+        walk_layout.addWidget(self.lbl_walk_status, 3, 0, 1, 4)
+
+        self.btn_onboard_gait = QtWidgets.QPushButton("📤 UPLOAD && PLAY ON SLAVES")
+        self.btn_onboard_gait.setToolTip("Compile one gait cycle into keyframe tables, upload them to both slaves once and "
+                                         "let the slaves play the gait locally (bridge protocol v5+)")
+        self.btn_onboard_gait.setStyleSheet("background-color: #7C4DFF; color: #FFFFFF; font-size: 12px; font-weight: bold; padding: 8px;")
+        self.btn_onboard_gait.clicked.connect(self.toggle_onboard_gait)
+        walk_layout.addWidget(self.btn_onboard_gait, 4, 0, 1, 4)
+
+        self.lbl_gait_table = QtWidgets.QLabel("On-Board Gait: none loaded")
+        self.lbl_gait_table.setStyleSheet("color: #8E98B0; font-size: 11px; font-family: 'Consolas';")
+        self.lbl_gait_table.setWordWrap(True)
+        walk_layout.addWidget(self.lbl_gait_table, 5, 0, 1, 4)
+        return box_walk
+
+    def on_walk_param_changed(self, *_):
+        self.leg_gait.set_gait(self.cmb_walk_gait.currentText())
+        self.leg_gait.frequency = self.spn_walk_freq.value()
+        self.leg_gait.stride_deg = float(self.spn_walk_stride.value())
+        self.leg_gait.lift_deg = float(self.spn_walk_lift.value())
+
+    def send_gait_batch(self, pairs, reliable=False):
+        # Called from the control thread: write straight to the worker, no widget access
+        worker = self.worker_thread
+        if worker and self.is_connected and self.realtime_enabled:
+            worker.send_angle_batch(pairs, reliable=reliable)
+
+    def prepare_leg_gait(self):
+        # Base pose: each leg servo's saved standing angle on its mapped card
+        base = []
+        for name in JOINT_NAMES:
+            card = self.get_card_by_key(self.leg_channel_map.get(name, "Unassigned"))
+            base.append(card.stand_angle if card else 90.0)
+        self.leg_gait.set_base_pose(base)
+        self.leg_gait.set_channel_map(self.leg_channel_map)
+        self.on_walk_param_changed()
+
+    def toggle_walking_gait(self):
+        if not self.walking:
+            self.cancel_pose_transition()
+            if self.waddling:
+                self.stop_waddling_gait()
+            if self.onboard_gait_playing or self.gait_upload:
+                self.stop_onboard_gait()
+            self.prepare_leg_gait()
+
+            self.walking = True
+            self.walk_loop = ControlLoopThread(self.leg_gait, self.send_gait_batch, period_s=1.0 / self.spn_walk_rate.value(),
+                                               rate_limit_fn=self.stream_rate_limit)
+            self.walk_loop.start()
+            self.waddle_display_timer.start()
+            self.btn_start_walk.setText("⏹ STOP WALKING")
+            self.btn_start_walk.setStyleSheet("background-color: #FF0055; color: #FFFFFF; font-size: 12px; font-weight: bold; padding: 8px;")
+            self.log_console(f"[GAIT] Started {self.leg_gait.gait} walking gait @ {self.spn_walk_rate.value()} Hz over {len(self.leg_gait.targets)} mapped servos")
+        else:
+            self.stop_walking_gait()
+
+    def stop_walking_gait(self):
+        if not self.walking:
+            return
+        self.walking = False
+        if self.walk_loop:
+            self.walk_loop.stop()
+            self.walk_loop = None
+        if not self.waddling:
+            self.waddle_display_timer.stop()
+        self.btn_start_walk.setText("🦿 START WALKING")
+        self.btn_start_walk.setStyleSheet("background-color: #00E5FF; color: #12141E; font-size: 12px; font-weight: bold; padding: 8px;")
+        self.lbl_walk_status.setText("Walking Gait Stopped")
+        self.log_console("[GAIT] Stopped walking gait")
+
+    def toggle_onboard_gait(self):
+        if self.onboard_gait_playing or self.gait_upload:
+            self.stop_onboard_gait()
+            return
+        worker = self.worker_thread
+        if not (worker and self.is_connected):
+            self.log_console("[GAIT TABLE] Not connected")
+            return
+        if not worker.gait_tables_supported():
+            self.log_console(f"[GAIT TABLE] Bridge protocol v{worker.protocol_version} cannot take gait tables (needs v5)")
+            return
+        self.cancel_pose_transition()
+        if self.walking:
+            self.stop_walking_gait()
+        if self.waddling:
+            self.stop_waddling_gait()
+        self.prepare_leg_gait()
+        try:
+            tables = compile_gait_cycle(self.leg_gait)
+        except GaitTableError as e:
+            self.log_console(f"[GAIT TABLE ERROR] {e}")
+            return
+        if not tables:
+            self.log_console("[GAIT TABLE] No leg servos are mapped")
+            return
+        errors = check_gait_cycle(tables, self.leg_gait)
+        summary = []
+        for board, table in tables.items():
+            max_err, rms_err = errors[board]
+            summary.append(f"{board}: {len(table.frames)} keyframes, {len(table.encode())} B, max err {max_err:.2f}°")
+            self.log_console(f"[GAIT TABLE] {board}: {len(table.channels)} channels, {len(table.frames)} keyframes, "
+                             f"{len(table.encode())} bytes, error vs generator max {max_err:.2f}° / rms {rms_err:.2f}°")
+        self.gait_upload = GaitUpload(worker, tables)
+        worker.line_callbacks.append(self.gait_upload.on_line)
+        self.gait_upload.start()
+        self.gait_upload_timer.start()
+        self.btn_onboard_gait.setText("⏹ CANCEL UPLOAD")
+        self.lbl_gait_table.setText(f"On-Board Gait: uploading {self.leg_gait.gait} ({' | '.join(summary)})")
+
+    def poll_gait_upload(self):
+        upload = self.gait_upload
+        if upload is None:
+            self.gait_upload_timer.stop()
+            return
+        upload.poll()
+        if not upload.done:
+            return
+        self.finish_gait_upload()
+        if upload.state != UPLOAD_DONE:
+            self.log_console(f"[GAIT TABLE] Upload failed: {upload.error}")
+            self.lbl_gait_table.setText(f"On-Board Gait: upload failed ({upload.error})")
+            self.btn_onboard_gait.setText("📤 UPLOAD && PLAY ON SLAVES")
+            return
+        boards = "B" if len(upload.data) > 1 else next(iter(upload.data))
+        self.worker_thread.send_command(f"{boards} GAIT_PLAY 100", reliable=True)
+        self.onboard_gait_playing = True
+        self.btn_onboard_gait.setText("⏹ STOP ON-BOARD GAIT")
+        self.log_console(f"[GAIT TABLE] Uploaded {upload.total_bytes} bytes in {upload.elapsed_s():.2f}s, "
+                         f"playing {self.leg_gait.gait} on the slaves")
+        self.lbl_gait_table.setText(f"On-Board Gait: {self.leg_gait.gait} @ {self.leg_gait.frequency:.1f} Hz playing on "
+                                    f"the slaves ({upload.total_bytes} B uploaded in {upload.elapsed_s():.2f}s)")
+
+    def finish_gait_upload(self):
+        self.gait_upload_timer.stop()
+        if self.gait_upload and self.worker_thread and self.gait_upload.on_line in self.worker_thread.line_callbacks:
+            self.worker_thread.line_callbacks.remove(self.gait_upload.on_line)
+        self.gait_upload = None
+
+    def stop_onboard_gait(self):
+        if self.gait_upload:
+            self.gait_upload.fail("cancelled")
+            self.finish_gait_upload()
+        if self.worker_thread and self.is_connected:
+            self.worker_thread.send_command("B GAIT_STOP", reliable=True)
+        if self.onboard_gait_playing:
+            self.log_console("[GAIT TABLE] Stopped on-board gait")
+        self.onboard_gait_playing = False
+        self.btn_onboard_gait.setText("📤 UPLOAD && PLAY ON SLAVES")
+        self.lbl_gait_table.setText("On-Board Gait: stopped (table stays loaded on the slaves)")
 
     def set_waddle_freq_preset(self, hz):
         self.slider_w_freq.setValue(int(hz * 10))
@@ -992,13 +1612,112 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.lbl_w_freq_val.setText(f"{self.waddle_frequency:.1f} Hz")
         self.lbl_w_amp_val.setText(f"{int(self.waddle_amplitude_pct)}%")
         self.lbl_w_ramp_val.setText(f"{self.waddle_ramp_time:.1f} s")
+        self.push_waddle_params()
+
+    def on_waddle_waveform_changed(self, shape):
+        self.txt_w_harmonics.setEnabled(shape == "Custom Fourier")
+        harmonics = None
+        if shape == "Custom Fourier":
+            try:
+                harmonics = parse_harmonics(self.txt_w_harmonics.text())
+            except ValueError as e:
+                self.log_console(f"[GAIT] Invalid harmonics: {e}")
+                return
+        # Table swap keeps the oscillator phase, so this is safe while the gait is running
+        self.waddle_gait.set_waveform(shape, harmonics)
+        self.log_console(f"[GAIT] Waddle waveform set to {shape}")
+
+    def push_waddle_params(self):
+        # Plain attribute writes: picked up by the control thread on its next tick
+        self.waddle_gait.base_speed = self.waddle_base_speed
+        self.waddle_gait.frequency = self.waddle_frequency
+        self.waddle_gait.amplitude_pct = self.waddle_amplitude_pct
+        self.waddle_gait.ramp_time = self.waddle_ramp_time
+        self.stabilized_waddle.invert_left = self.chk_invert_l_motor.isChecked()
+        self.stabilized_waddle.invert_right = self.chk_invert_r_motor.isChecked()
+
+    def send_gait_command(self, cmd_str):
+        # Called from the control thread: write straight to the worker, no widget access
+        worker = self.worker_thread
+        if worker and self.is_connected and self.realtime_enabled:
+            worker.send_command(cmd_str)
+
+    # ---------------------------------------------------------------------------
+    # PITCH STABILIZER
+    # ---------------------------------------------------------------------------
+    def send_stabilizer_command(self, cmd_str, on_sent=None, priority=None, stop=False):
+        # Called from the serial thread per telemetry sample: no widget access
+        worker = self.worker_thread
+        if worker and self.is_connected and self.realtime_enabled:
+            worker.send_command(cmd_str, priority, on_sent, stop=stop)
+
+    def push_stabilizer_params(self):
+        self.stabilizer.set_gains(kp=self.spn_stab_kp.value(), ki=self.spn_stab_ki.value(), kd=self.spn_stab_kd.value(),
+                                  output_limit=self.spn_stab_limit.value(), slew_per_s=self.spn_stab_slew.value())
+        self.stabilizer.setpoint = self.spn_stab_setpoint.value()
+        self.stabilizer.direction = -1.0 if self.chk_stab_reverse.isChecked() else 1.0
+
+    def on_stabilizer_toggled(self, checked):
+        self.stabilizer.enabled = checked
+        if checked:
+            if not self.telemetry_active and self.is_connected:
+                self.toggle_telemetry()
+            self.stabilizer_status_timer.start()
+            self.log_console("[STABILIZER] Enabled: pitch samples now correct the waddle's motor speeds")
+        else:
+            if self.stabilizer.engaged and not self.waddling:
+                self.stabilizer.disengage()
+                self.send_command("B MOTOR 0", stop=True)
+            self.stabilizer_status_timer.stop()
+            self.log_console("[STABILIZER] Disabled: waddle runs open loop")
+
+    def run_stabilizer_step_test(self):
+        if not self.is_connected:
+            self.log_console("[STABILIZER] Connect first: the step test drives the motors")
+            return
+        if self.stabilizer.step_running():
+            return
+        if not self.chk_stabilizer.isChecked():
+            self.chk_stabilizer.setChecked(True)
+        step = self.spn_stab_step.value()
+        self.stabilizer.start_step_test(step)
+        self.log_console(f"[STABILIZER] Step test: {step:+.1f}° on the pitch setpoint"
+                         f"{'' if self.waddling else ' (standing, motors driven by the loop only)'}")
+
+    def update_stabilizer_status(self):
+        p50, p99, lat_max, comp_p50, comp_p99 = self.stabilizer.latency_stats()
+        corr = self.stabilizer.correction
+        self.lbl_stab_status.setText(
+            f"Sample→Cmd: p50 {p50:.1f}ms | p99 {p99:.1f}ms | max {lat_max:.1f}ms | compute p50 {comp_p50:.3f}ms p99 {comp_p99:.3f}ms\n"
+            f"Corrections: L {corr['L']:+.1f} | R {corr['R']:+.1f} | sent {self.stabilizer.corrections_sent}"
+            f"{' | STEP TEST RUNNING' if self.stabilizer.step_running() else ''}"
+        )
+        finished = self.stabilizer.take_finished_trace()
+        if finished:
+            rows, info = finished
+            os.makedirs(self.stabilizer_traces_dir, exist_ok=True)
+            path = os.path.join(self.stabilizer_traces_dir, time.strftime("step_%Y%m%d_%H%M%S.csv"))
+            try:
+                save_trace(path, rows, info)
+            except OSError as e:
+                self.log_console(f"[STABILIZER ERROR] {e}")
+                return
+            fmt = lambda v, unit: "--" if v is None else f"{v:.2f}{unit}"
+            for board in ("L", "R"):
+                m = step_metrics(rows, info, board)
+                self.log_console(f"[STABILIZER] Step {board}: rise {fmt(m['rise_s'], 's')} | overshoot "
+                                 f"{fmt(m['overshoot_pct'], '%')} | settle {fmt(m['settle_s'], 's')}")
+            self.log_console(f"[STABILIZER] Step trace ({len(rows)} samples) saved to {path}")
 
     def toggle_waddling_gait(self):
         if not self.waddling:
+            self.stop_walking_gait()
             self.waddling = True
-            self.waddle_start_time = time.time()
-            self.waddle_ramp_factor = 0.0
-            self.waddle_timer.start()
+            self.push_waddle_params()
+            self.waddle_loop = ControlLoopThread(self.stabilized_waddle, self.send_gait_command, period_s=0.02,
+                                                 rate_limit_fn=self.stream_rate_limit)
+            self.waddle_loop.start()
+            self.waddle_display_timer.start()
             self.btn_start_waddle.setText("⏸ PAUSE WADDLING GAIT")
             self.btn_start_waddle.setStyleSheet("background-color: #FF9100; color: #12141E; font-size: 14px; font-weight: bold; padding: 12px;")
             self.log_console(f"[GAIT] Started Waddling Gait (Ramp = {self.waddle_ramp_time:.1f}s)")
@@ -1007,7 +1726,11 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
 
     def stop_waddling_gait(self):
         self.waddling = False
-        self.waddle_timer.stop()
+        if self.waddle_loop:
+            self.waddle_loop.stop()
+            self.waddle_loop = None
+        if not self.walking:
+            self.waddle_display_timer.stop()
         self.btn_start_waddle.setText("🚀 START WADDLING GAIT")
         self.btn_start_waddle.setStyleSheet("background-color: #00E676; color: #12141E; font-size: 14px; font-weight: bold; padding: 12px;")
         self.stop_all_motors()
@@ -1016,35 +1739,22 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.txt_waddle_info.setPlainText("Waddling Gait Stopped. Motors safely reset to 0.")
         self.log_console("[GAIT] Stopped Waddling Gait")
 
-    def update_waddling_gait(self):
-        if not self.waddling:
+    def update_waddling_display(self):
+        if self.walk_loop:
+            st = self.walk_loop.snapshot()
+            if st:
+                load_mean, load_max, load_frac = self.walk_loop.load_stats()
+                jit_mean, jit_p99, jit_max = self.walk_loop.jitter_stats()
+                self.lbl_walk_status.setText(
+                    f"{st['gait']} | phase {st['phase']:.2f} | {st['channels']} ch | tick {load_mean:.3f}ms (max {load_max:.2f}ms, {load_frac*100:.1f}% load)\n"
+                    f"Loop Jitter: mean {jit_mean:.2f}ms | p99 {jit_p99:.2f}ms | max {jit_max:.2f}ms | overruns {self.walk_loop.overruns}"
+                )
+        if not self.waddle_loop:
             return
-
-        t = time.time() - self.waddle_start_time
-
-        # Ramp up factor smoothly over user-configured waddle_ramp_time seconds (50Hz update loop = 0.02s per step)
-        if self.waddle_ramp_time > 0.0:
-            ramp_step = 0.02 / self.waddle_ramp_time
-        else:
-            ramp_step = 1.0
-
-        if self.waddle_ramp_factor < 1.0:
-            self.waddle_ramp_factor = min(1.0, self.waddle_ramp_factor + ramp_step)
-
-        # Differential Sine Wave Calculation
-        max_diff_amp = abs(self.waddle_base_speed) if self.waddle_base_speed != 0 else 128.0
-        diff_val = (self.waddle_amplitude_pct / 100.0) * max_diff_amp * math.sin(2.0 * math.pi * self.waddle_frequency * t)
-        
-        target_l_speed = (self.waddle_base_speed + diff_val) * self.waddle_ramp_factor
-        target_r_speed = (self.waddle_base_speed - diff_val) * self.waddle_ramp_factor
-
-        # Clamp speeds
-        l_speed = max(-255, min(255, int(round(target_l_speed))))
-        r_speed = max(-255, min(255, int(round(target_r_speed))))
-
-        # Apply Direction Inversion Polarity
-        eff_l_speed = -l_speed if self.chk_invert_l_motor.isChecked() else l_speed
-        eff_r_speed = -r_speed if self.chk_invert_r_motor.isChecked() else r_speed
+        st = self.waddle_loop.snapshot()
+        if not st:
+            return
+        l_speed, r_speed = st["l_speed"], st["r_speed"]
 
         # Update Visual Bar Gauges
         self.bar_l_motor.setValue(l_speed)
@@ -1054,16 +1764,18 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
 
         # Update Info Log
         self.txt_waddle_info.setPlainText(
-            f"Waddling Gait Active ({self.waddle_frequency:.1f}Hz @ {int(self.waddle_amplitude_pct)}% Amp | Ramp: {self.waddle_ramp_factor*100:.0f}%)\n"
-            f"T = {t:.2f}s | Ramp Target: {self.waddle_ramp_time:.1f}s | Sine Diff: {diff_val:+.1f}\n"
-            f"Left Motor Power : {l_speed:+} (Tx: {eff_l_speed:+})\n"
-            f"Right Motor Power: {r_speed:+} (Tx: {eff_r_speed:+})"
+            f"Waddling Gait Active ({self.waddle_frequency:.1f}Hz @ {int(self.waddle_amplitude_pct)}% Amp | Ramp: {st['ramp_factor']*100:.0f}%)\n"
+            f"T = {st['t']:.2f}s | Ramp Target: {self.waddle_ramp_time:.1f}s | {self.waddle_gait.waveform} Diff: {st['diff_val']:+.1f}\n"
+            f"Left Motor Power : {l_speed:+} (Tx: {st['eff_l_speed']:+})\n"
+            f"Right Motor Power: {r_speed:+} (Tx: {st['eff_r_speed']:+})\n"
+            f"Pitch Loop: L {'closed' if st['closed_loop'][0] else 'open'} ({st['l_correction']:+.1f}) | "
+            f"R {'closed' if st['closed_loop'][1] else 'open'} ({st['r_correction']:+.1f})"
         )
 
-        # Transmit Motor Commands over Serial
-        if self.is_connected and self.realtime_enabled:
-            self.send_command(f"L MOTOR {eff_l_speed}")
-            self.send_command(f"R MOTOR {eff_r_speed}")
+        jit_mean, jit_p99, jit_max = self.waddle_loop.jitter_stats()
+        self.lbl_waddle_jitter.setText(
+            f"Loop Jitter: mean {jit_mean:.2f}ms | p99 {jit_p99:.2f}ms | max {jit_max:.2f}ms | overruns {self.waddle_loop.overruns}"
+        )
 
     def get_mode_btn_style(self):
         return """
@@ -1083,39 +1795,126 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             }
         """
 
+    def apply_pose(self, card_angles, name="Pose"):
+        self.cancel_pose_transition()
+        duration = self.spn_pose_duration.value()
+        if duration <= 0.0 or not (self.is_connected and self.worker_thread and self.realtime_enabled):
+            # Instant jump: update cards silently, then transmit the whole pose as one batch
+            pairs = []
+            for card, angle in card_angles:
+                card.set_angle(angle, emit_signal=False)
+                pairs.append((card.board, card.channel, float(angle)))
+            self.send_angle_batch(pairs, reliable=True)
+            return
+
+        start, target = {}, {}
+        self.pose_transition_cards = {}
+        for card, angle in card_angles:
+            key = (card.board, card.channel)
+            start[key] = card.current_angle
+            target[key] = float(angle)
+            self.pose_transition_cards[key] = card
+        transition = PoseTransition(start, target, duration, name)
+        self.pose_loop = ControlLoopThread(transition, self.send_gait_batch, period_s=1.0 / self.spn_pose_rate.value(),
+                                           rate_limit_fn=self.stream_rate_limit)
+        self.pose_loop.start()
+        self.pose_display_timer.start()
+        self.log_console(f"[POSE] {name}: {len(target)} servos, {duration:.2f}s minimum-jerk @ {self.spn_pose_rate.value()} Hz")
+
+    def sync_cards_to_pose_snapshot(self):
+        st = self.pose_loop.snapshot() if self.pose_loop else {}
+        for key, angle in st.get("angles", {}).items():
+            card = self.pose_transition_cards.get(key)
+            if card:
+                card.set_angle(angle, emit_signal=False)
+        return st
+
+    def update_pose_transition_display(self):
+        if not self.pose_loop:
+            self.pose_display_timer.stop()
+            return
+        st = self.sync_cards_to_pose_snapshot()
+        if not self.pose_loop.is_alive():
+            self.pose_display_timer.stop()
+            if st.get("done"):
+                self.log_console(f"[POSE] {st['name']} transition complete")
+            self.pose_loop = None
+
+    def cancel_pose_transition(self):
+        # Any new servo command preempts a running transition from wherever it has reached
+        if not self.pose_loop:
+            return
+        self.pose_loop.stop()
+        st = self.sync_cards_to_pose_snapshot()
+        self.pose_display_timer.stop()
+        self.pose_loop = None
+        if st and not st.get("done"):
+            self.log_console(f"[POSE] {st['name']} transition cancelled at {st['progress']*100:.0f}%")
+
+    def run_transformation(self, to_rolling=True):
+        # Standing and rolling poses over the channels the rolling calibration covers
+        cards = [c for c in self.cards if c.get_card_id() in DEFAULT_ROLLING_POSE]
+        stand = {(c.board, c.channel): c.stand_angle for c in cards}
+        rolling = {(c.board, c.channel): DEFAULT_ROLLING_POSE[c.get_card_id()] for c in cards}
+        start, target = (stand, rolling) if to_rolling else (rolling, stand)
+        name = "Walk → Roll" if to_rolling else "Roll → Walk"
+
+        key_to_servo = {v: k for k, v in self.leg_channel_map.items() if v != "Unassigned"}
+        roles = {(c.board, c.channel): joint_role(key_to_servo.get(c.get_card_id(), "")) for c in cards}
+
+        limits = {role: spn.value() for role, spn in self.transform_speed_spins.items()}
+        limits["Patella"] = limits["Femur"]
+        stage_order = [["Coxa"], ["Femur", "Patella"], ["Tibia"], ["Other"]]
+        if not to_rolling:
+            stage_order.reverse()
+        planner = TransformationPlanner(limits, stage_order, rate_hz=self.spn_pose_rate.value())
+        trajectory, cache_hit = planner.plan_cached(start, target, roles)
+        stages = ", ".join(f"{'/'.join(r)} {d:.2f}s" for r, _, d in trajectory.stages)
+        self.log_console(f"[TRANSFORM] {name}: {trajectory.duration_s:.2f}s ({stages}) "
+                         f"{'loaded from cache' if cache_hit else 'planned & cached'}")
+        self.lbl_transform_status.setText(f"{name}: {trajectory.duration_s:.2f}s {'(cached)' if cache_hit else ''}")
+
+        self.cancel_pose_transition()
+        card_by_key = {(c.board, c.channel): c for c in cards}
+        if not (self.is_connected and self.worker_thread and self.realtime_enabled):
+            # Offline: just show the final pose on the cards
+            for key, angle in target.items():
+                card_by_key[key].set_angle(angle, emit_signal=False)
+            return
+
+        self.pose_transition_cards = card_by_key
+        current = {key: card.current_angle for key, card in card_by_key.items()}
+        player = TrajectoryPlayer(trajectory, current, name)
+        self.pose_loop = ControlLoopThread(player, self.send_gait_batch, period_s=1.0 / trajectory.rate_hz,
+                                           rate_limit_fn=self.stream_rate_limit)
+        self.pose_loop.start()
+        self.pose_display_timer.start()
+
     def set_left_servos_stand(self):
-        left_cards = [c for c in self.cards if c.board == 'L']
-        for c in left_cards:
-            c.go_to_stand_position()
+        self.apply_pose([(c, c.stand_angle) for c in self.cards if c.board == 'L'], "Left Standing Pose")
         self.log_console("[SYSTEM] Sent saved Standing Pose to all 16 Left Board Servos")
 
     def set_right_servos_stand(self):
-        right_cards = [c for c in self.cards if c.board == 'R']
-        for c in right_cards:
-            c.go_to_stand_position()
+        self.apply_pose([(c, c.stand_angle) for c in self.cards if c.board == 'R'], "Right Standing Pose")
         self.log_console("[SYSTEM] Sent saved Standing Pose to all 16 Right Board Servos")
 
     def set_all_servos_stand(self):
-        for c in self.cards:
-            c.go_to_stand_position()
+        self.apply_pose([(c, c.stand_angle) for c in self.cards], "Standing Pose")
         self.log_console("[SYSTEM] Sent saved Standing Pose to ALL 32 Servos across Left & Right Boards")
 
     def set_all_servos_90(self):
-        for c in self.cards:
-            c.set_angle(90.0, emit_signal=True)
+        self.apply_pose([(c, 90.0) for c in self.cards], "90° Neutral")
         self.log_console("[SYSTEM] Reset ALL 32 Servos to 90° default neutral position")
 
     def set_rolling_pose(self):
-        for card in self.cards:
-            cid = card.get_card_id()
-            if cid in DEFAULT_ROLLING_POSE:
-                card.set_angle(DEFAULT_ROLLING_POSE[cid], emit_signal=True)
+        self.apply_pose([(c, DEFAULT_ROLLING_POSE[c.get_card_id()]) for c in self.cards if c.get_card_id() in DEFAULT_ROLLING_POSE], "Rolling Pose")
         self.log_console("[SYSTEM] Sent Calibrated Rolling Pose to Servos")
 
     def on_card_stand_saved(self, board, channel, stand_angle):
         cid = f"{board}:CH {channel:02d}"
         self.log_console(f"[STAND] Saved Standing Pose for {cid}: {int(stand_angle)}°")
-        self.save_profile()
+        self.profile.put_entry(SECTION_POSES, STANDING_POSE, {card.get_card_id(): card.stand_angle for card in self.cards})
+        self.schedule_profile_save()
 
     def on_channel_selected(self, board, channel):
         self.wiggle_servo(board, channel)
@@ -1201,27 +2000,142 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         leg_layout.addLayout(btn_box)
         layout.addWidget(box_leg_map, stretch=2)
 
+        box_cal = QtWidgets.QGroupBox("🎚️ Host Tick Calibration (settings.json)")
+        cal_layout = QtWidgets.QGridLayout(box_cal)
+        cal_layout.setContentsMargins(12, 16, 12, 12)
+        cal_layout.setSpacing(8)
+
+        cal_layout.addWidget(QtWidgets.QLabel("Board:"), 0, 0)
+        self.cmb_cal_board = QtWidgets.QComboBox()
+        self.cmb_cal_board.addItems(["L", "R"])
+        self.cmb_cal_board.currentTextChanged.connect(self.load_calibration_fields)
+        cal_layout.addWidget(self.cmb_cal_board, 0, 1)
+
+        cal_layout.addWidget(QtWidgets.QLabel("Channel:"), 1, 0)
+        self.spn_cal_channel = QtWidgets.QSpinBox()
+        self.spn_cal_channel.setRange(0, 15)
+        self.spn_cal_channel.valueChanged.connect(self.load_calibration_fields)
+        cal_layout.addWidget(self.spn_cal_channel, 1, 1)
+
+        cal_layout.addWidget(QtWidgets.QLabel("Tick @ 0°:"), 2, 0)
+        self.spn_cal_min = QtWidgets.QSpinBox()
+        self.spn_cal_min.setRange(0, 4095)
+        cal_layout.addWidget(self.spn_cal_min, 2, 1)
+
+        cal_layout.addWidget(QtWidgets.QLabel("Tick @ 180°:"), 3, 0)
+        self.spn_cal_max = QtWidgets.QSpinBox()
+        self.spn_cal_max.setRange(0, 4095)
+        cal_layout.addWidget(self.spn_cal_max, 3, 1)
+
+        cal_layout.addWidget(QtWidgets.QLabel("Curve points:"), 4, 0)
+        self.txt_cal_points = QtWidgets.QLineEdit()
+        self.txt_cal_points.setPlaceholderText("optional, e.g. 0:102, 90:300, 180:512")
+        self.txt_cal_points.setToolTip("Multi-point angle:tick curve, interpolated piecewise-linearly (overrides min/max)")
+        cal_layout.addWidget(self.txt_cal_points, 4, 1)
+
+        btn_cal_apply = QtWidgets.QPushButton("✅ Apply & Save Channel")
+        btn_cal_apply.setToolTip("Rebuild this channel's lookup table, save settings.json and send CAL to the slave")
+        btn_cal_apply.clicked.connect(self.apply_channel_calibration)
+        cal_layout.addWidget(btn_cal_apply, 5, 0, 1, 2)
+
+        self.chk_send_ticks = QtWidgets.QCheckBox("Send pre-resolved TICKs")
+        self.chk_send_ticks.setToolTip("Convert angles to PCA9685 ticks on the host so streams skip the slave-side float math")
+        self.chk_send_ticks.toggled.connect(self.on_send_ticks_toggled)
+        cal_layout.addWidget(self.chk_send_ticks, 6, 0, 1, 2)
+
+        self.lbl_cal_preview = QtWidgets.QLabel("")
+        self.lbl_cal_preview.setStyleSheet("color: #8E98B0; font-size: 10px; font-family: 'Consolas';")
+        cal_layout.addWidget(self.lbl_cal_preview, 7, 0, 1, 2)
+        cal_layout.setRowStretch(8, 1)
+        layout.addWidget(box_cal, stretch=1)
+        self.load_calibration_fields()
+
         box_prof = QtWidgets.QGroupBox("JSON Profile Management")
         prof_layout = QtWidgets.QVBoxLayout(box_prof)
         prof_layout.setContentsMargins(12, 16, 12, 12)
         prof_layout.setSpacing(10)
         prof_layout.addWidget(QtWidgets.QLabel("PROFILE MANAGEMENT:"))
 
-        btn_save = QtWidgets.QPushButton("💾 Save Profile JSON")
+        btn_save = QtWidgets.QPushButton("💾 Save Profile")
         btn_save.clicked.connect(self.save_profile)
         prof_layout.addWidget(btn_save)
 
-        btn_load = QtWidgets.QPushButton("📂 Load Profile JSON")
+        btn_load = QtWidgets.QPushButton("📂 Load Profile")
         btn_load.clicked.connect(self.load_profile_dialog)
         prof_layout.addWidget(btn_load)
 
+        prof_layout.addWidget(QtWidgets.QLabel("GAIT PRESETS (waddle + walking parameters):"))
+        self.cmb_gait_preset = QtWidgets.QComboBox()
+        prof_layout.addWidget(self.cmb_gait_preset)
+        gait_btns = QtWidgets.QHBoxLayout()
+        btn_gait_load = QtWidgets.QPushButton("📂 Load Preset")
+        btn_gait_load.clicked.connect(self.load_gait_preset)
+        gait_btns.addWidget(btn_gait_load)
+        btn_gait_save = QtWidgets.QPushButton("💾 Save As…")
+        btn_gait_save.clicked.connect(self.save_gait_preset)
+        gait_btns.addWidget(btn_gait_save)
+        prof_layout.addLayout(gait_btns)
+
+        prof_layout.addWidget(QtWidgets.QLabel("CALIBRATION SETS (host tick tables):"))
+        self.cmb_cal_set = QtWidgets.QComboBox()
+        prof_layout.addWidget(self.cmb_cal_set)
+        cal_set_btns = QtWidgets.QHBoxLayout()
+        btn_cal_set_load = QtWidgets.QPushButton("📂 Activate Set")
+        btn_cal_set_load.setToolTip("Replace the live calibration with this set and write it to settings.json")
+        btn_cal_set_load.clicked.connect(self.load_calibration_set)
+        cal_set_btns.addWidget(btn_cal_set_load)
+        btn_cal_set_save = QtWidgets.QPushButton("💾 Save As…")
+        btn_cal_set_save.clicked.connect(self.save_calibration_set)
+        cal_set_btns.addWidget(btn_cal_set_save)
+        prof_layout.addLayout(cal_set_btns)
+
         prof_layout.addStretch()
         layout.addWidget(box_prof, stretch=1)
 
+    def load_calibration_fields(self, *_):
+        board, channel = self.cmb_cal_board.currentText(), self.spn_cal_channel.value()
+        entry = self.calibration.entries[(board, channel)]
+        self.spn_cal_min.setValue(entry["tick_min"])
+        self.spn_cal_max.setValue(entry["tick_max"])
+        self.txt_cal_points.setText(format_points(entry.get("points")))
+        self.update_calibration_preview()
+
+    def update_calibration_preview(self):
+        board, channel = self.cmb_cal_board.currentText(), self.spn_cal_channel.value()
+        ticks = [self.calibration.angle_to_tick(board, channel, a) for a in (0, 45, 90, 135, 180)]
+        self.lbl_cal_preview.setText("0/45/90/135/180° → " + "/".join(str(t) for t in ticks))
+
+    def apply_channel_calibration(self):
+        board, channel = self.cmb_cal_board.currentText(), self.spn_cal_channel.value()
+        try:
+            points = parse_points(self.txt_cal_points.text())
+        except ValueError as e:
+            self.log_console(f"[CALIBRATION] Invalid curve: {e}")
+            return
+        tick_min, tick_max = self.spn_cal_min.value(), self.spn_cal_max.value()
+        # Only this channel's table is rebuilt; the worker shares the same CalibrationTable object
+        self.calibration.set_channel(board, channel, tick_min, tick_max, points)
+        self.update_calibration_preview()
+        try:
+            self.calibration.save(self.calibration_file)
+        except OSError as e:
+            self.log_console(f"[CALIBRATION ERROR] {e}")
+        # Keep the slave's own (linear) angle mapping in step for plain ANGLE commands: curve end points
+        slave_min = self.calibration.angle_to_tick(board, channel, 0.0)
+        slave_max = self.calibration.angle_to_tick(board, channel, 180.0)
+        self.send_command(f"{board} CAL {channel} {slave_min} {slave_max}")
+        self.log_console(f"[CALIBRATION] {board}:CH {channel:02d} -> {tick_min}-{tick_max}"
+                         + (f" ({len(points)}-point curve)" if points else ""))
+
+    def on_send_ticks_toggled(self, checked):
+        self.send_ticks = checked
+        if self.worker_thread:
+            self.worker_thread.send_ticks = checked
+        self.log_console(f"[CALIBRATION] {'Sending host-calibrated TICKs' if checked else 'Sending angles (slave-side conversion)'}")
+
     def scan_ports(self):
         self.cmb_port.clear()
-        ports = [p.device for p in serial.tools.list_ports.comports()]
-        self.cmb_port.addItems(ports)
+        self.cmb_port.addItems(self.cmb_port.port_list())
 
     def toggle_connection(self):
         if not self.is_connected:
@@ -1231,13 +2145,25 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.warning(self, "Port Error", "Please select a valid COM port.")
                 return
 
-            self.worker_thread = SerialWorkerThread(port_name=port, baud_rate=baud)
+            self.worker_thread = SerialWorkerThread(port_name=port, baud_rate=baud, flush_hz=self.spn_tx_rate.value())
             self.worker_thread.data_received.connect(self.on_serial_data_received)
             self.worker_thread.status_changed.connect(self.on_connection_status_changed)
-            self.worker_thread.telemetry_left_pitch.connect(self.on_telemetry_left_pitch_received)
-            self.worker_thread.telemetry_right_pitch.connect(self.on_telemetry_right_pitch_received)
+            self.worker_thread.telemetry = self.telemetry
+            self.worker_thread.console = self.console
+            self.worker_thread.deadband.set_deadband(self.spn_deadband.value())
+            self.worker_thread.calibration = self.calibration
+            self.worker_thread.send_ticks = self.send_ticks
+            self.worker_thread.protocol_changed.connect(self.on_protocol_changed)
+            self.worker_thread.recorder = self.recorder
+            self.worker_thread.telemetry_callbacks.append(self.stabilizer.on_sample)
+            self.worker_thread.sequence_commands = self.chk_seq_acks.isChecked()
+            self.worker_thread.set_adaptive_rate(self.chk_adaptive_rate.isChecked())
             self.worker_thread.start()
         else:
+            if self.gait_upload:
+                self.finish_gait_upload()
+                self.btn_onboard_gait.setText("📤 UPLOAD && PLAY ON SLAVES")
+            self.onboard_gait_playing = False
             if self.worker_thread:
                 self.worker_thread.stop()
                 self.worker_thread = None
@@ -1273,13 +2199,28 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
     def on_serial_data_received(self, line):
         self.log_console(line)
 
-    def on_telemetry_left_pitch_received(self, pitch):
-        sign = "+" if pitch >= 0 else ""
-        self.lbl_pitch_left.setText(f"{sign}{pitch:.2f}°")
+    def on_protocol_changed(self, protocol, version):
+        self.log_console(f"[SYSTEM] Bridge protocol: {protocol.upper()} v{version} (batched pose frames enabled)")
 
-    def on_telemetry_right_pitch_received(self, pitch):
-        sign = "+" if pitch >= 0 else ""
-        self.lbl_pitch_right.setText(f"{sign}{pitch:.2f}°")
+    def update_telemetry_display(self):
+        # Display-rate poll of the ring buffers: nothing is redrawn unless a new sample arrived
+        counts = tuple(buf.count for buf in self.telemetry.buffers.values())
+        if counts == self.telemetry_drawn_counts:
+            return
+        self.telemetry_drawn_counts = counts
+
+        now = time.monotonic()
+        series = []
+        for board, label, color in (("L", self.lbl_pitch_left, "#00E5FF"), ("R", self.lbl_pitch_right, "#FF9100")):
+            buf = self.telemetry.buffers[board]
+            latest = buf.latest()
+            if latest is not None:
+                label.setText(f"{latest[1]:+.2f}°")
+            t, pitch = buf.snapshot(self.pitch_plot.window_s, now)
+            series.append((QtGui.QColor(color), t, pitch))
+        self.pitch_plot.set_series(series, now)
+        self.lbl_telem_rate.setText(f"L: {self.telemetry.buffers['L'].rate_hz(now=now):.1f} Hz | "
+                                    f"R: {self.telemetry.buffers['R'].rate_hz(now=now):.1f} Hz")
 
     def toggle_telemetry(self):
         if self.telemetry_active:
@@ -1294,21 +2235,192 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             self.btn_telem_toggle.setStyleSheet("background-color: #1F2335; color: #00E676; border-color: #00E676;")
 
     def log_console(self, text):
-        self.txt_console.appendPlainText(text)
+        self.console.append(text)
+
+    def flush_console(self):
+        # One widget update per tick, however many lines arrived since the last one
+        lines = self.console.drain()
+        if lines:
+            self.txt_console.appendPlainText("\n".join(lines))
+
+    def clear_console(self):
+        self.console.clear()
+        self.txt_console.clear()
+
+    def send_command(self, cmd_str, stop=False):
+        if self.is_connected and self.worker_thread:
+            self.worker_thread.send_command(cmd_str, stop=stop)
+            if self.console.accepts(KIND_TX):
+                self.log_console(f"> {cmd_str}")
+
+    def send_angle_batch(self, pairs, reliable=False):
+        if pairs and self.is_connected and self.worker_thread and self.realtime_enabled:
+            self.worker_thread.send_angle_batch(pairs, reliable=reliable)
+            if self.console.accepts(KIND_TX):
+                self.log_console(f"> ANGLE BATCH x{len(pairs)} [{self.worker_thread.protocol}]")
 
-    def send_command(self, cmd_str):
+    def queue_angle(self, board, channel, angle):
         if self.is_connected and self.worker_thread:
-            self.worker_thread.send_command(cmd_str)
-            self.log_console(f"> {cmd_str}")
+            self.worker_thread.queue_angle(board, channel, angle)
+            if self.console.accepts(KIND_TX):
+                self.log_console(f"> {format_angle_command(board, channel, angle)}")
+
+    def queue_motor(self, board, speed):
+        if self.is_connected and self.worker_thread:
+            self.worker_thread.queue_motor(board, speed)
+            if self.console.accepts(KIND_TX):
+                self.log_console(f"> {board} MOTOR {speed}")
+
+    def toggle_recording(self, checked):
+        if checked:
+            os.makedirs(self.recordings_dir, exist_ok=True)
+            path = os.path.join(self.recordings_dir, time.strftime("rollopod_%Y%m%d_%H%M%S.rplg"))
+            try:
+                self.recorder.start(path)
+            except OSError as e:
+                self.log_console(f"[RECORD ERROR] {e}")
+                self.btn_record.blockSignals(True)
+                self.btn_record.setChecked(False)
+                self.btn_record.blockSignals(False)
+                return
+            self.last_recording = path
+            self.log_console(f"[RECORD] Recording commands to {path}")
+        else:
+            count = self.recorder.stop()
+            self.log_console(f"[RECORD] Stopped: {count} commands saved to {self.recorder.path}")
+            if self.recorder.limit_reached:
+                self.log_console(f"[RECORD] The log ended at its {MAX_RECORDING_S / 60:.1f} min limit; "
+                                 "later commands were not recorded")
+
+    def toggle_replay(self):
+        if self.replayer and self.replayer.is_alive():
+            self.replayer.stop()
+            self.update_replay_status()
+            return
+        if not (self.is_connected and self.worker_thread):
+            self.log_console("[REPLAY] Connect to the bridge before replaying a recording")
+            return
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Command Recording", self.last_recording or self.recordings_dir, "Rollopod Recordings (*.rplg)")
+        if not file_path:
+            return
+        try:
+            records = load_log(file_path)
+        except (OSError, ValueError) as e:
+            self.log_console(f"[REPLAY ERROR] {e}")
+            return
+
+        # Replays own the bridge: stop live generators first
+        if self.waddling:
+            self.stop_waddling_gait()
+        if self.walking:
+            self.stop_walking_gait()
+        self.cancel_pose_transition()
+
+        speed = self.spn_replay_speed.value()
+        self.replayer = CommandReplayer(records, self.worker_thread.send_command, speed)
+        self.replayer.start()
+        self.replay_timer.start()
+        self.btn_replay.setText("⏹ Stop Replay")
+        duration = records[-1][0] / speed if records else 0.0
+        self.log_console(f"[REPLAY] {os.path.basename(file_path)}: {len(records)} commands over {duration:.2f}s at {speed:.2f}x")
+
+    def update_replay_status(self):
+        if not self.replayer:
+            self.replay_timer.stop()
+            return
+        mean_ms, p99_ms, max_ms = self.replayer.drift_stats()
+        self.lbl_replay.setText(f"Replay {self.replayer.progress*100:.0f}% | drift {mean_ms:.2f}/{p99_ms:.2f}/{max_ms:.2f} ms")
+        if not self.replayer.is_alive():
+            self.replay_timer.stop()
+            self.btn_replay.setText("▶ Replay")
+            self.log_console(f"[REPLAY] Done: {self.replayer.sent}/{len(self.replayer.records)} commands, "
+                             f"send drift mean {mean_ms:.3f} ms, p99 {p99_ms:.3f} ms, max {max_ms:.3f} ms")
+            self.replayer = None
+
+    def on_deadband_changed(self, deg):
+        if self.worker_thread:
+            self.worker_thread.deadband.set_deadband(deg)
+
+    def on_tx_rate_changed(self, hz):
+        if self.worker_thread:
+            self.worker_thread.set_flush_rate(hz)
+
+    def on_adaptive_rate_toggled(self, checked):
+        if self.worker_thread:
+            self.worker_thread.set_adaptive_rate(checked)
+
+    def stream_rate_limit(self):
+        # Called from control threads
+        worker = self.worker_thread
+        return worker.stream_rate_limit() if worker else None
+
+    def on_seq_acks_toggled(self, checked):
+        if self.worker_thread:
+            self.worker_thread.sequence_commands = checked
+            if checked and self.worker_thread.protocol_version < SEQ_MIN_VERSION:
+                self.log_console(f"[SYSTEM] Bridge protocol v{self.worker_thread.protocol_version} has no sequenced commands "
+                                 f"(needs v{SEQ_MIN_VERSION}); commands stay unsequenced")
+        if not checked:
+            self.lbl_ack_stats.setText("")
+
+    def update_tx_stats(self):
+        if self.worker_thread:
+            stats = self.worker_thread.coalescer.stats()
+            rx = self.worker_thread.rx_rate
+            db = self.worker_thread.deadband.stats()
+            self.lbl_tx_stats.setText(f"TX: {stats['sent']} sent | {stats['dropped']} coalesced | "
+                                      f"deadband saved {db['window_saved'] / 1024.0:.1f} kB ({db['window_saved_frac'] * 100:.0f}%) /60s | "
+                                      f"RX: {rx.bytes_per_s / 1024.0:.1f} kB/s, {rx.lines_per_s:.0f} lines/s")
+            latency = self.worker_thread.tx_queue.latency_stats()
+            self.lbl_tx_latency.setText("Lat " + " ".join(f"{name[0].upper()}:{latency[name][0]:.1f}/{latency[name][1]:.1f}"
+                                                          for name in PRIORITY_NAMES))
+            if self.worker_thread.reliable_active():
+                rel = self.worker_thread.reliable.stats()
+                self.lbl_tx_stats.setText(self.lbl_tx_stats.text() +
+                                          f" | REL: {rel['delivered']} acked, {rel['retransmits']} retx, "
+                                          f"{rel['failed']} failed, {rel['pending']} pending")
+                self.lbl_tx_stats.setToolTip(f"Reliable delivery (stops, final pose frames): first send → ACK "
+                                             f"p50 {rel['p50_ms']:.1f} / p99 {rel['p99_ms']:.1f} / max {rel['max_ms']:.1f} ms, "
+                                             f"{rel['superseded']} superseded by newer commands")
+            if self.worker_thread.sequence_commands:
+                self.update_ack_stats()
+            self.update_link_rate()
+
+    def update_link_rate(self):
+        link = self.worker_thread.link_rate.stats()
+        mode = "adaptive" if self.worker_thread.adaptive_rate else "fixed"
+        rate = link["rate_hz"] if self.worker_thread.adaptive_rate else self.worker_thread.flush_hz
+        self.lbl_link_rate.setText(f"Link: {rate:.0f} Hz ({mode}) | loss {link['loss_pct']:.1f}% | {link['latency_ms']:.1f} ms")
+        sources = ", ".join(f"{name} {pct:.1f}%" for name, pct in link["sources"].items()) or "no traffic"
+        self.lbl_link_rate.setToolTip(f"Streaming rate {link['min_hz']:.0f}-{link['max_hz']:.0f} Hz, "
+                                      f"{link['increases']} steps up / {link['decreases']} back-offs\n"
+                                      f"Last window loss by source: {sources}\n"
+                                      f"Latency = worst of motion queue wait and command round trip")
+
+    def update_ack_stats(self):
+        acks = self.worker_thread.acks
+        acks.expire()
+        stats = acks.stats()
+        self.lbl_ack_stats.setText(" ".join(f"{board}: RTT {st['p50_ms']:.1f}/{st['p99_ms']:.1f}ms loss {st['loss_pct']:.1f}%"
+                                            for board, st in stats.items()))
+        labels = histogram_labels()
+        lines = ["Round trip host→bridge→slave→host (p50 / p99 / max ms)"]
+        for board, st in stats.items():
+            lines.append(f"{board}: {st['p50_ms']:.1f} / {st['p99_ms']:.1f} / {st['max_ms']:.1f} | sent {st['sent']} acked {st['acked']} "
+                         f"lost {st['lost']} late {st['late']} pending {st['pending']}")
+            lines.append("   " + "  ".join(f"{label}:{count}" for label, count in zip(labels, st["histogram"]) if count))
+        self.lbl_ack_stats.setToolTip("\n".join(lines))
 
     def on_realtime_toggled(self, state):
         self.realtime_enabled = (state == QtCore.Qt.CheckState.Checked.value)
 
     def on_channel_angle_changed(self, board, channel, angle):
+        self.cancel_pose_transition()
         if self.realtime_enabled:
-            self.send_command(f"{board} ANGLE {channel} {int(angle)}")
+            self.queue_angle(board, channel, angle)
 
     def on_motor_dir_invert_changed(self, state):
+        self.push_waddle_params()
         if not self.waddling:
             self.on_l_motor_slider_moved(self.slider_l_motor.value())
             if not self.chk_sync_motors.isChecked():
@@ -1316,49 +2428,42 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
 
     def on_l_motor_slider_moved(self, raw_speed):
         if self.waddling: return
-        eff_l_speed = -raw_speed if self.chk_invert_l_motor.isChecked() else raw_speed
         self.lbl_l_motor_speed.setText(f"Speed: {raw_speed} ({'Inv' if self.chk_invert_l_motor.isChecked() else 'Nor'})")
-        
+        right = None
         if self.chk_sync_motors.isChecked():
             self.slider_r_motor.blockSignals(True)
             self.slider_r_motor.setValue(raw_speed)
-            eff_r_speed = -raw_speed if self.chk_invert_r_motor.isChecked() else raw_speed
             self.lbl_r_motor_speed.setText(f"Speed: {raw_speed} ({'Inv' if self.chk_invert_r_motor.isChecked() else 'Nor'})")
             self.slider_r_motor.blockSignals(False)
-            
-            if self.realtime_enabled:
-                if eff_l_speed == eff_r_speed:
-                    self.send_command(f"B MOTOR {eff_l_speed}")
-                else:
-                    self.send_command(f"L MOTOR {eff_l_speed}")
-                    self.send_command(f"R MOTOR {eff_r_speed}")
-        else:
-            if self.realtime_enabled:
-                self.send_command(f"L MOTOR {eff_l_speed}")
+            right = raw_speed
+        if self.realtime_enabled:
+            self.queue_motor_speeds(raw_speed, right)
 
     def on_r_motor_slider_moved(self, raw_speed):
         if self.waddling: return
-        eff_r_speed = -raw_speed if self.chk_invert_r_motor.isChecked() else raw_speed
         self.lbl_r_motor_speed.setText(f"Speed: {raw_speed} ({'Inv' if self.chk_invert_r_motor.isChecked() else 'Nor'})")
-        
+        left = None
         if self.chk_sync_motors.isChecked():
             self.slider_l_motor.blockSignals(True)
             self.slider_l_motor.setValue(raw_speed)
-            eff_l_speed = -raw_speed if self.chk_invert_l_motor.isChecked() else raw_speed
             self.lbl_l_motor_speed.setText(f"Speed: {raw_speed} ({'Inv' if self.chk_invert_l_motor.isChecked() else 'Nor'})")
             self.slider_l_motor.blockSignals(False)
-            
-            if self.realtime_enabled:
-                if eff_l_speed == eff_r_speed:
-                    self.send_command(f"B MOTOR {eff_l_speed}")
-                else:
-                    self.send_command(f"L MOTOR {eff_l_speed}")
-                    self.send_command(f"R MOTOR {eff_r_speed}")
-        else:
-            if self.realtime_enabled:
-                self.send_command(f"R MOTOR {eff_r_speed}")
+            left = raw_speed
+        if self.realtime_enabled:
+            self.queue_motor_speeds(left, raw_speed)
+
+    def queue_motor_speeds(self, left, right):
+        # Inversion and the single-'B' collapse for equal speeds live in rollopod_core
+        for board, speed in resolve_motor_speeds(left, right, self.chk_invert_l_motor.isChecked(),
+                                                 self.chk_invert_r_motor.isChecked()):
+            self.queue_motor(board, speed)
 
     def stop_all_motors(self):
+        # Stop closed-loop corrections first, or the next pitch sample would restart the motors
+        self.stabilizer.disengage()
+        if self.replayer and self.replayer.is_alive():
+            # A motor stop always wins over a running replay
+            self.replayer.stop()
         self.slider_l_motor.blockSignals(True)
         self.slider_r_motor.blockSignals(True)
         self.slider_l_motor.setValue(0)
@@ -1367,7 +2472,8 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.lbl_r_motor_speed.setText("Speed: 0")
         self.slider_l_motor.blockSignals(False)
         self.slider_r_motor.blockSignals(False)
-        self.send_command("B MOTOR 0")
+        # Safety class: jumps the TX queue and flushes pending motion (queued and coalesced) before going out
+        self.send_command("B MOTOR 0", stop=True)
 
     def set_dashboard_view_mode(self, mode_name):
         self.dashboard_view_mode = mode_name
@@ -1377,204 +2483,163 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
         self.btn_mode_all.setChecked(mode_name == "PCA Channels")
         self.sync_leg_channel_ui()
 
-    def rebuild_dashboard_cards_layout(self):
-        if not hasattr(self, 'dashboard_cards_layout'):
-            return
+    def build_dashboard_page(self, mode_name):
+        """Builds the static group boxes for one dashboard page. Cards are seated later by dashboard_card_slots()."""
+        page = QtWidgets.QWidget()
+        page_layout = QtWidgets.QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        page_layout.setSpacing(10)
+        slots = {}
 
-        for card in self.cards:
-            card.setParent(None)
-
-        while self.dashboard_cards_layout.count():
-            item = self.dashboard_cards_layout.takeAt(0)
-            if item.widget():
-                w = item.widget()
-                w.setParent(None)
-                w.deleteLater()
-            elif item.layout():
-                l = item.layout()
-                while l.count():
-                    child = l.takeAt(0)
-                    if child.widget() and child.widget() not in self.cards:
-                        child.widget().setParent(None)
-                        child.widget().deleteLater()
-
-        if self.dashboard_view_mode == "Leg Control":
+        if mode_name == LEG_PAGE:
             split_container = QtWidgets.QWidget()
             split_layout = QtWidgets.QHBoxLayout(split_container)
             split_layout.setContentsMargins(0, 0, 0, 0)
             split_layout.setSpacing(8)
 
-            # Left Side Legs Pane
-            left_side_box = QtWidgets.QGroupBox("🔴 LEFT SIDE LEGS")
-            left_side_box.setStyleSheet("""
-                QGroupBox {
-                    background-color: #121520;
-                    border: 1px solid #00E5FF;
-                    border-radius: 8px;
-                    margin-top: 8px;
-                    font-weight: bold;
-                    color: #00E5FF;
-                    font-size: 11px;
-                }
-                QGroupBox::title { subcontrol-origin: margin; left: 8px; padding: 0 4px; }
-            """)
-            left_leg_layout = QtWidgets.QVBoxLayout(left_side_box)
-            left_leg_layout.setContentsMargins(6, 12, 6, 6)
-            left_leg_layout.setSpacing(6)
-
-            LEFT_LEG_CATEGORIES = [
-                ("Left Front Leg", ["Left Front Coxa", "Left Front Femur", "Left Front Tibia"]),
-                ("Left Middle Leg", ["Left Middle Coxa", "Left Middle Femur", "Left Middle Patella", "Left Middle Tibia"]),
-                ("Left Rear Leg", ["Left Rear Coxa", "Left Rear Femur", "Left Rear Tibia"])
-            ]
-
-            assigned_card_keys = set()
-
-            for sub_title, s_list in LEFT_LEG_CATEGORIES:
-                sub_box = QtWidgets.QGroupBox(sub_title)
-                sub_box.setStyleSheet("QGroupBox { background-color: #161A28; border: 1px solid #23273A; border-radius: 6px; font-weight: bold; color: #FFFFFF; font-size: 11px; }")
-                sub_layout = QtWidgets.QVBoxLayout(sub_box)
-                sub_layout.setContentsMargins(4, 10, 4, 4)
-                sub_layout.setSpacing(4)
-                for s_name in s_list:
-                    key_str = self.leg_channel_map.get(s_name, "Unassigned")
-                    card = self.get_card_by_key(key_str)
-                    if card:
-                        assigned_card_keys.add(key_str)
-                        card.setParent(sub_box)
-                        card.update_card_title("Leg Control")
-                        card.setVisible(True)
-                        sub_layout.addWidget(card)
-                left_leg_layout.addWidget(sub_box)
-
-            split_layout.addWidget(left_side_box, stretch=1)
-
-            # Right Side Legs Pane
-            right_side_box = QtWidgets.QGroupBox("🟢 RIGHT SIDE LEGS")
-            right_side_box.setStyleSheet("""
-                QGroupBox {
-                    background-color: #121520;
-                    border: 1px solid #FF9100;
-                    border-radius: 8px;
-                    margin-top: 8px;
-                    font-weight: bold;
-                    color: #FF9100;
-                    font-size: 11px;
-                }
-                QGroupBox::title { subcontrol-origin: margin; left: 8px; padding: 0 4px; }
-            """)
-            right_leg_layout = QtWidgets.QVBoxLayout(right_side_box)
-            right_leg_layout.setContentsMargins(6, 12, 6, 6)
-            right_leg_layout.setSpacing(6)
-
-            RIGHT_LEG_CATEGORIES = [
-                ("Right Front Leg", ["Right Front Coxa", "Right Front Femur", "Right Front Tibia"]),
-                ("Right Middle Leg", ["Right Middle Coxa", "Right Middle Femur", "Right Middle Patella", "Right Middle Tibia"]),
-                ("Right Rear Leg", ["Right Rear Coxa", "Right Rear Femur", "Right Rear Tibia"])
-            ]
-
-            for sub_title, s_list in RIGHT_LEG_CATEGORIES:
-                sub_box = QtWidgets.QGroupBox(sub_title)
-                sub_box.setStyleSheet("QGroupBox { background-color: #161A28; border: 1px solid #23273A; border-radius: 6px; font-weight: bold; color: #FFFFFF; font-size: 11px; }")
-                sub_layout = QtWidgets.QVBoxLayout(sub_box)
-                sub_layout.setContentsMargins(4, 10, 4, 4)
-                sub_layout.setSpacing(4)
-                for s_name in s_list:
-                    key_str = self.leg_channel_map.get(s_name, "Unassigned")
-                    card = self.get_card_by_key(key_str)
-                    if card:
-                        assigned_card_keys.add(key_str)
-                        card.setParent(sub_box)
-                        card.update_card_title("Leg Control")
-                        card.setVisible(True)
-                        sub_layout.addWidget(card)
-                right_leg_layout.addWidget(sub_box)
-
-            split_layout.addWidget(right_side_box, stretch=1)
-            self.dashboard_cards_layout.addWidget(split_container)
-
-            unassigned_cards = [c for c in self.cards if c.get_card_id() not in assigned_card_keys]
-            if unassigned_cards:
-                box_spare = QtWidgets.QGroupBox("⚪ SPARE / UNASSIGNED PCA CHANNELS")
-                box_spare.setStyleSheet("QGroupBox { background-color: #141724; border: 1px solid #23273A; border-radius: 8px; margin-top: 8px; font-weight: bold; color: #8E98B0; font-size: 11px; }")
-                spare_grid = QtWidgets.QGridLayout(box_spare)
-                spare_grid.setContentsMargins(6, 12, 6, 6); spare_grid.setSpacing(4)
-                for idx, card in enumerate(unassigned_cards):
-                    r = idx // 2
-                    c = idx % 2
-                    card.setParent(box_spare)
-                    card.update_card_title("Leg Control")
-                    card.setVisible(True)
-                    spare_grid.addWidget(card, r, c)
-                self.dashboard_cards_layout.addWidget(box_spare)
-
-        elif self.dashboard_view_mode in ["Left Board", "Right Board"]:
-            target_board = 'L' if self.dashboard_view_mode == "Left Board" else 'R'
-            box_board = QtWidgets.QGroupBox(f"🎛️ {'LEFT' if target_board=='L' else 'RIGHT'} ESP32 SLAVE BOARD CHANNELS ({target_board}:CH 00-15)")
-            color_code = "#00E5FF" if target_board == 'L' else "#FF9100"
-            box_board.setStyleSheet(f"""
-                QGroupBox {{
-                    background-color: #141724;
-                    border: 1px solid #23273A;
-                    border-radius: 8px;
-                    margin-top: 8px;
-                    font-weight: bold;
-                    color: {color_code};
-                    font-size: 12px;
-                }}
-                QGroupBox::title {{ subcontrol-origin: margin; left: 10px; padding: 0 4px; }}
-            """)
-            board_grid = QtWidgets.QGridLayout(box_board)
-            board_grid.setContentsMargins(6, 12, 6, 6)
-            board_grid.setSpacing(4)
-
-            board_cards = [c for c in self.cards if c.board == target_board]
-            for ch, card in enumerate(board_cards):
-                card.setParent(box_board)
-                card.update_card_title(self.dashboard_view_mode)
-                card.setVisible(True)
-                r = ch // 2
-                c = ch % 2
-                board_grid.addWidget(card, r, c)
-
-            self.dashboard_cards_layout.addWidget(box_board)
+            for side_title, color_code, categories in (("🔴 LEFT SIDE LEGS", "#00E5FF", LEFT_LEG_CATEGORIES),
+                                                       ("🟢 RIGHT SIDE LEGS", "#FF9100", RIGHT_LEG_CATEGORIES)):
+                side_box = QtWidgets.QGroupBox(side_title)
+                side_box.setStyleSheet(f"""
+                    QGroupBox {{
+                        background-color: #121520;
+                        border: 1px solid {color_code};
+                        border-radius: 8px;
+                        margin-top: 8px;
+                        font-weight: bold;
+                        color: {color_code};
+                        font-size: 11px;
+                    }}
+                    QGroupBox::title {{ subcontrol-origin: margin; left: 8px; padding: 0 4px; }}
+                """)
+                side_layout = QtWidgets.QVBoxLayout(side_box)
+                side_layout.setContentsMargins(6, 12, 6, 6)
+                side_layout.setSpacing(6)
+
+                for sub_title, s_list in categories:
+                    sub_box = QtWidgets.QGroupBox(sub_title)
+                    sub_box.setStyleSheet("QGroupBox { background-color: #161A28; border: 1px solid #23273A; border-radius: 6px; font-weight: bold; color: #FFFFFF; font-size: 11px; }")
+                    sub_layout = QtWidgets.QVBoxLayout(sub_box)
+                    sub_layout.setContentsMargins(4, 10, 4, 4)
+                    sub_layout.setSpacing(4)
+                    for s_name in s_list:
+                        slots[s_name] = sub_layout
+                    side_layout.addWidget(sub_box)
+
+                split_layout.addWidget(side_box, stretch=1)
+            page_layout.addWidget(split_container)
+
+            box_spare = QtWidgets.QGroupBox("⚪ SPARE / UNASSIGNED PCA CHANNELS")
+            box_spare.setStyleSheet("QGroupBox { background-color: #141724; border: 1px solid #23273A; border-radius: 8px; margin-top: 8px; font-weight: bold; color: #8E98B0; font-size: 11px; }")
+            spare_grid = QtWidgets.QGridLayout(box_spare)
+            spare_grid.setContentsMargins(6, 12, 6, 6); spare_grid.setSpacing(4)
+            slots["spare_box"] = box_spare
+            slots["spare_grid"] = spare_grid
+            page_layout.addWidget(box_spare)
 
         else:
+            # Shared by Left Board / Right Board / PCA Channels: the cards never move between these three views
             all_container = QtWidgets.QWidget()
             all_layout = QtWidgets.QHBoxLayout(all_container)
             all_layout.setContentsMargins(0, 0, 0, 0)
             all_layout.setSpacing(8)
 
-            # Left Board Column
-            box_left_all = QtWidgets.QGroupBox("⬅️ LEFT BOARD CHANNELS (L:CH 00-15)")
-            box_left_all.setStyleSheet("QGroupBox { background-color: #141724; border: 1px solid #00E5FF; border-radius: 8px; font-weight: bold; color: #00E5FF; font-size: 11px; }")
-            grid_l = QtWidgets.QGridLayout(box_left_all)
-            grid_l.setContentsMargins(4, 12, 4, 4); grid_l.setSpacing(4)
+            for board, color_code in (('L', "#00E5FF"), ('R', "#FF9100")):
+                box = QtWidgets.QGroupBox()
+                box.setStyleSheet(f"QGroupBox {{ background-color: #141724; border: 1px solid {color_code}; border-radius: 8px; font-weight: bold; color: {color_code}; font-size: 11px; }}")
+                grid = QtWidgets.QGridLayout(box)
+                grid.setContentsMargins(4, 12, 4, 4); grid.setSpacing(4)
+                slots[board] = grid
+                slots[board + "_box"] = box
+                all_layout.addWidget(box, stretch=1)
 
-            for ch, card in enumerate([c for c in self.cards if c.board == 'L']):
-                card.setParent(box_left_all)
-                card.update_card_title("PCA Channels")
-                card.setVisible(True)
-                grid_l.addWidget(card, ch // 2, ch % 2)
+            page_layout.addWidget(all_container)
 
-            all_layout.addWidget(box_left_all, stretch=1)
+        page_layout.addStretch()
+        return page, slots
 
-            # Right Board Column
-            box_right_all = QtWidgets.QGroupBox("➡️ RIGHT BOARD CHANNELS (R:CH 00-15)")
-            box_right_all.setStyleSheet("QGroupBox { background-color: #141724; border: 1px solid #FF9100; border-radius: 8px; font-weight: bold; color: #FF9100; font-size: 11px; }")
-            grid_r = QtWidgets.QGridLayout(box_right_all)
-            grid_r.setContentsMargins(4, 12, 4, 4); grid_r.setSpacing(4)
+    def dashboard_card_slots(self, page_name, slots):
+        """[(card, layout, grid_position_or_None), ...] in display order for the given page."""
+        placement = []
+        if page_name == LEG_PAGE:
+            assigned_card_keys = set()
+            for categories in (LEFT_LEG_CATEGORIES, RIGHT_LEG_CATEGORIES):
+                for _, s_list in categories:
+                    for s_name in s_list:
+                        key_str = self.leg_channel_map.get(s_name, "Unassigned")
+                        card = self.get_card_by_key(key_str)
+                        if card and key_str not in assigned_card_keys:
+                            assigned_card_keys.add(key_str)
+                            placement.append((card, slots[s_name], None))
+            unassigned_cards = [c for c in self.cards if c.get_card_id() not in assigned_card_keys]
+            for idx, card in enumerate(unassigned_cards):
+                placement.append((card, slots["spare_grid"], (idx // 2, idx % 2)))
+        else:
+            for card in self.cards:
+                if card.board in slots:
+                    placement.append((card, slots[card.board], (card.channel // 2, card.channel % 2)))
+        return placement
 
-            for ch, card in enumerate([c for c in self.cards if c.board == 'R']):
-                card.setParent(box_right_all)
-                card.update_card_title("PCA Channels")
+    def rebuild_dashboard_cards_layout(self):
+        if not hasattr(self, 'dashboard_stack'):
+            return
+        mode_name = self.dashboard_view_mode
+        page_name = LEG_PAGE if mode_name == "Leg Control" else BOARD_PAGE
+
+        if page_name not in self.dashboard_pages:
+            page, slots = self.build_dashboard_page(page_name)
+            self.dashboard_pages[page_name] = (page, slots)
+            self.dashboard_stack.addWidget(page)
+        page, slots = self.dashboard_pages[page_name]
+
+        placement = self.dashboard_card_slots(page_name, slots)
+        if (page_name, placement) != self.dashboard_placement:
+            self.seat_dashboard_cards(slots, placement)
+            self.dashboard_placement = (page_name, placement)
+
+        if page_name == BOARD_PAGE:
+            if mode_name == "PCA Channels":
+                slots["L_box"].setTitle("⬅️ LEFT BOARD CHANNELS (L:CH 00-15)")
+                slots["R_box"].setTitle("➡️ RIGHT BOARD CHANNELS (R:CH 00-15)")
+            else:
+                for board, side in (('L', "LEFT"), ('R', "RIGHT")):
+                    slots[board + "_box"].setTitle(f"🎛️ {side} ESP32 SLAVE BOARD CHANNELS ({board}:CH 00-15)")
+            slots["L_box"].setVisible(mode_name != "Right Board")
+            slots["R_box"].setVisible(mode_name != "Left Board")
+
+        # Pages that are not showing must not size the stack (QStackedLayout skips Ignored policies)
+        for other, _ in self.dashboard_pages.values():
+            policy = QtWidgets.QSizePolicy.Policy.Preferred if other is page else QtWidgets.QSizePolicy.Policy.Ignored
+            other.setSizePolicy(policy, policy)
+        self.dashboard_stack.setCurrentWidget(page)
+
+    def seat_dashboard_cards(self, slots, placement):
+        # Only layouts whose contents changed are re-seated; Qt reparents a moved card into its new page
+        wanted = {lay: [] for lay in slots.values() if isinstance(lay, QtWidgets.QLayout)}
+        for card, lay, pos in placement:
+            wanted[lay].append((card, pos))
+        changed = [lay for lay, items in wanted.items() if self.dashboard_layout_cards.get(lay, []) != items]
+
+        for lay in changed:
+            for card, _ in self.dashboard_layout_cards.pop(lay, []):
+                lay.removeWidget(card)
+                self.dashboard_card_homes.pop(card, None)
+        for lay in changed:
+            for card, pos in wanted[lay]:
+                home = self.dashboard_card_homes.get(card)
+                if home is not None:
+                    home.removeWidget(card)
+                    self.dashboard_layout_cards[home] = [item for item in self.dashboard_layout_cards[home] if item[0] is not card]
+                if pos is None:
+                    lay.addWidget(card)
+                else:
+                    lay.addWidget(card, pos[0], pos[1])
                 card.setVisible(True)
-                grid_r.addWidget(card, ch // 2, ch % 2)
+                self.dashboard_card_homes[card] = lay
+            self.dashboard_layout_cards[lay] = wanted[lay]
 
-            all_layout.addWidget(box_right_all, stretch=1)
-            self.dashboard_cards_layout.addWidget(all_container)
-
-        self.dashboard_cards_layout.addStretch()
+        if "spare_box" in slots:
+            slots["spare_box"].setVisible(bool(wanted[slots["spare_grid"]]))
 
     def on_card_servo_assignment_changed(self, board, channel, servo_name):
         card_id = f"{board}:CH {channel:02d}"
@@ -1618,6 +2683,10 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
             card.set_assigned_servo(assigned_name)
             card.update_card_title(self.dashboard_view_mode)
 
+        self.sync_leg_map_combos()
+        self.rebuild_dashboard_cards_layout()
+
+    def sync_leg_map_combos(self):
         for s_name, cmb in self.leg_map_combos.items():
             key_str = self.leg_channel_map.get(s_name, "Unassigned")
             cmb.blockSignals(True)
@@ -1628,71 +2697,223 @@ class RollopodMainWindow(QtWidgets.QMainWindow):
                 cmb.setCurrentIndex(cmb.findText("Unassigned"))
             cmb.blockSignals(False)
 
-        self.rebuild_dashboard_cards_layout()
-
     def save_profile(self):
-        standing_dict = {card.get_card_id(): card.stand_angle for card in self.cards}
-        data = {
-            "leg_channels": self.leg_channel_map,
-            "standing_angles": standing_dict,
+        settings = self.profile.section(SECTION_SETTINGS)
+        settings.update({
+            "leg_channels": dict(self.leg_channel_map),
             "invert_left_motor": self.chk_invert_l_motor.isChecked(),
             "invert_right_motor": self.chk_invert_r_motor.isChecked(),
             "sync_motors": self.chk_sync_motors.isChecked()
-        }
-        try:
-            with open(self.settings_file, "w") as f:
-                json.dump(data, f, indent=4)
+        })
+        self.profile.mark_dirty(SECTION_SETTINGS)
+        self.profile.put_entry(SECTION_POSES, STANDING_POSE, {card.get_card_id(): card.stand_angle for card in self.cards})
+        if self.flush_profile():
             self.log_console(f"[PROFILE] Saved dual profile & standing pose angles to {self.settings_file}")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Save Error", str(e))
 
-    def load_profile(self):
-        if not os.path.exists(self.settings_file):
-            # Populate default rolling pose angles without emitting signals
-            for card in self.cards:
-                cid = card.get_card_id()
-                if cid in DEFAULT_ROLLING_POSE:
-                    card.set_angle(DEFAULT_ROLLING_POSE[cid], emit_signal=False)
-            self.sync_leg_channel_ui()
-            return
+    def schedule_profile_save(self):
+        # Restarting the single-shot timer coalesces every change inside the debounce window into one write
+        self.profile_save_timer.start()
+
+    def flush_profile(self):
+        self.profile_save_timer.stop()
         try:
-            with open(self.settings_file, "r") as f:
-                data = json.load(f)
-            if "leg_channels" in data:
-                self.leg_channel_map.update(data["leg_channels"])
-            if "standing_angles" in data:
-                for card in self.cards:
-                    cid = card.get_card_id()
-                    if cid in data["standing_angles"]:
-                        card.stand_angle = float(data["standing_angles"][cid])
-                        card.btn_save_stand.setToolTip(f"Standing position saved: {int(card.stand_angle)}°")
-            # Set default angles cleanly WITHOUT emitting serial signals on load!
-            for card in self.cards:
-                cid = card.get_card_id()
-                if cid in DEFAULT_ROLLING_POSE:
-                    card.set_angle(DEFAULT_ROLLING_POSE[cid], emit_signal=False)
-            if "invert_left_motor" in data:
-                self.chk_invert_l_motor.setChecked(data["invert_left_motor"])
-            if "invert_right_motor" in data:
-                self.chk_invert_r_motor.setChecked(data["invert_right_motor"])
-            if "sync_motors" in data:
-                self.chk_sync_motors.setChecked(data["sync_motors"])
-            self.sync_leg_channel_ui()
-            self.log_console(f"[PROFILE] Loaded profile from {self.settings_file}")
-        except Exception as e:
+            self.profile.save()
+            return True
+        except OSError as e:
+            self.log_console(f"[PROFILE ERROR] Could not save {self.settings_file}: {e}")
+            return False
+
+    def load_profile(self, source=None):
+        try:
+            self.profile.load(source)
+        except (OSError, ValueError) as e:
             print(f"Error loading profile: {e}")
+        # Set default angles cleanly WITHOUT emitting serial signals on load!
+        for card in self.cards:
+            cid = card.get_card_id()
+            if cid in DEFAULT_ROLLING_POSE:
+                card.set_angle(DEFAULT_ROLLING_POSE[cid], emit_signal=False)
+
+        # Only the settings section and the standing pose are needed at startup
+        settings = self.profile.section(SECTION_SETTINGS)
+        if "leg_channels" in settings:
+            self.leg_channel_map.update(settings["leg_channels"])
+        standing = self.profile.get_entry(SECTION_POSES, STANDING_POSE, {})
+        for card in self.cards:
+            cid = card.get_card_id()
+            if cid in standing:
+                card.stand_angle = float(standing[cid])
+                card.btn_save_stand.setToolTip(f"Standing position saved: {int(card.stand_angle)}°")
+        if "invert_left_motor" in settings:
+            self.chk_invert_l_motor.setChecked(settings["invert_left_motor"])
+        if "invert_right_motor" in settings:
+            self.chk_invert_r_motor.setChecked(settings["invert_right_motor"])
+        if "sync_motors" in settings:
+            self.chk_sync_motors.setChecked(settings["sync_motors"])
+        self.sync_leg_channel_ui()
+        self.refresh_profile_lists()
+        if self.profile.source:
+            self.log_console(f"[PROFILE] Loaded profile from {self.profile.source}"
+                             + (f" (left as is, saved as v2 to {self.settings_file})" if self.profile.migrated else ""))
 
     def load_profile_dialog(self):
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Profile JSON", "", "JSON Files (*.json)")
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Profile", "", f"Rollopod Profiles (*{PROFILE_EXT});;Legacy JSON Profiles (*{LEGACY_EXT})")
         if file_path:
-            self.settings_file = file_path
-            self.load_profile()
+            self.flush_profile()
+            self.settings_file = profile_path(file_path)
+            self.profile = ProfileStore(self.settings_file)
+            self.load_profile(file_path)
+
+    def refresh_profile_lists(self):
+        combos = [(self.cmb_pose, SECTION_POSES)]
+        if hasattr(self, 'cmb_gait_preset'):
+            combos += [(self.cmb_gait_preset, SECTION_GAIT_PRESETS), (self.cmb_cal_set, SECTION_CALIBRATION_SETS)]
+        for cmb, section in combos:
+            current = cmb.currentText()
+            cmb.blockSignals(True)
+            cmb.clear()
+            cmb.addItems(self.profile.names(section))
+            idx = cmb.findText(current)
+            if idx >= 0:
+                cmb.setCurrentIndex(idx)
+            cmb.blockSignals(False)
+
+    def ask_entry_name(self, title, default=""):
+        name, ok = QtWidgets.QInputDialog.getText(self, title, "Name:", text=default)
+        name = name.strip()
+        return name if ok and name else None
+
+    # ---------------------------------------------------------------------------
+    # NAMED POSES / GAIT PRESETS / CALIBRATION SETS
+    # ---------------------------------------------------------------------------
+    def apply_named_pose(self):
+        name = self.cmb_pose.currentText()
+        angles = self.profile.get_entry(SECTION_POSES, name)
+        if not angles:
+            return
+        card_angles = [(card, float(a)) for card, a in ((self.get_card_by_key(cid), a) for cid, a in angles.items()) if card]
+        self.apply_pose(card_angles, name)
+        self.log_console(f"[POSE] Sent saved pose '{name}' ({len(card_angles)} servos)")
+
+    def save_named_pose(self):
+        name = self.ask_entry_name("Save Pose", self.cmb_pose.currentText())
+        if not name:
+            return
+        self.profile.put_entry(SECTION_POSES, name, {card.get_card_id(): card.current_angle for card in self.cards})
+        if name == STANDING_POSE:
+            for card in self.cards:
+                card.stand_angle = card.current_angle
+                card.btn_save_stand.setToolTip(f"Standing position saved: {int(card.stand_angle)}°")
+        self.schedule_profile_save()
+        self.refresh_profile_lists()
+        self.cmb_pose.setCurrentText(name)
+        self.log_console(f"[POSE] Saved pose '{name}'")
+
+    def delete_named_pose(self):
+        name = self.cmb_pose.currentText()
+        if not name or name == STANDING_POSE:
+            self.log_console("[POSE] The Standing pose backs the per-card 📌 buttons and cannot be deleted")
+            return
+        self.profile.delete_entry(SECTION_POSES, name)
+        self.schedule_profile_save()
+        self.refresh_profile_lists()
+        self.log_console(f"[POSE] Deleted pose '{name}'")
+
+    def save_gait_preset(self):
+        name = self.ask_entry_name("Save Gait Preset", self.cmb_gait_preset.currentText())
+        if not name:
+            return
+        self.ensure_tab_built(self.tab_waddling)
+        preset = {
+            "waddle_base": self.slider_w_base.value(), "waddle_freq_x10": self.slider_w_freq.value(),
+            "waddle_amp": self.slider_w_amp.value(), "waddle_ramp_x10": self.slider_w_ramp.value(),
+            "waveform": self.cmb_w_waveform.currentText(), "harmonics": self.txt_w_harmonics.text(),
+            "walk_gait": self.cmb_walk_gait.currentText(), "walk_freq": self.spn_walk_freq.value(),
+            "walk_stride": self.spn_walk_stride.value(), "walk_lift": self.spn_walk_lift.value(),
+            "walk_rate": self.spn_walk_rate.value()
+        }
+        self.profile.put_entry(SECTION_GAIT_PRESETS, name, preset)
+        self.schedule_profile_save()
+        self.refresh_profile_lists()
+        self.cmb_gait_preset.setCurrentText(name)
+        self.log_console(f"[PROFILE] Saved gait preset '{name}'")
+
+    def load_gait_preset(self):
+        name = self.cmb_gait_preset.currentText()
+        preset = self.profile.get_entry(SECTION_GAIT_PRESETS, name)
+        if not preset:
+            return
+        self.ensure_tab_built(self.tab_waddling)
+        # Widget setters fire the usual change handlers, which push the values to the gait engines
+        self.txt_w_harmonics.setText(preset.get("harmonics", self.txt_w_harmonics.text()))
+        self.cmb_w_waveform.setCurrentText(preset.get("waveform", self.cmb_w_waveform.currentText()))
+        self.slider_w_base.setValue(preset.get("waddle_base", self.slider_w_base.value()))
+        self.slider_w_freq.setValue(preset.get("waddle_freq_x10", self.slider_w_freq.value()))
+        self.slider_w_amp.setValue(preset.get("waddle_amp", self.slider_w_amp.value()))
+        self.slider_w_ramp.setValue(preset.get("waddle_ramp_x10", self.slider_w_ramp.value()))
+        self.cmb_walk_gait.setCurrentText(preset.get("walk_gait", self.cmb_walk_gait.currentText()))
+        self.spn_walk_freq.setValue(preset.get("walk_freq", self.spn_walk_freq.value()))
+        self.spn_walk_stride.setValue(preset.get("walk_stride", self.spn_walk_stride.value()))
+        self.spn_walk_lift.setValue(preset.get("walk_lift", self.spn_walk_lift.value()))
+        self.spn_walk_rate.setValue(preset.get("walk_rate", self.spn_walk_rate.value()))
+        self.log_console(f"[PROFILE] Loaded gait preset '{name}'")
+
+    def save_calibration_set(self):
+        name = self.ask_entry_name("Save Calibration Set", self.cmb_cal_set.currentText())
+        if not name:
+            return
+        self.profile.put_entry(SECTION_CALIBRATION_SETS, name, self.calibration.to_settings())
+        self.schedule_profile_save()
+        self.refresh_profile_lists()
+        self.cmb_cal_set.setCurrentText(name)
+        self.log_console(f"[CALIBRATION] Saved calibration set '{name}'")
+
+    def load_calibration_set(self):
+        name = self.cmb_cal_set.currentText()
+        data = self.profile.get_entry(SECTION_CALIBRATION_SETS, name)
+        if not data:
+            return
+        self.calibration = CalibrationTable.from_settings(data)
+        if self.worker_thread:
+            self.worker_thread.calibration = self.calibration
+        try:
+            self.calibration.save(self.calibration_file)
+        except OSError as e:
+            self.log_console(f"[CALIBRATION ERROR] {e}")
+        self.load_calibration_fields()
+        self.log_console(f"[CALIBRATION] Activated calibration set '{name}' (send CAL per channel to update slave-side mapping)")
+
+    def closeEvent(self, event):
+        # Pending debounced profile edits must not be lost on exit
+        self.flush_profile()
+        super().closeEvent(event)
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Rollopod dual ESP32 controller GUI")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print import, widget construction and profile-load times once the window is up")
+    parser.add_argument("--port", default=None,
+                        help="Extra serial port to offer and preselect, e.g. the pty printed by rollopod_emulator.py")
+    args, qt_args = parser.parse_known_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
     app.setStyle("Fusion")
     window = RollopodMainWindow()
+    if args.port:
+        window.cmb_port.extra_ports.append(args.port)
+        window.scan_ports()
+        window.cmb_port.setCurrentText(args.port)
     window.show()
+
+    def report_startup():
+        # Runs on the first event-loop pass, i.e. after the window has been laid out and painted once
+        window.mark_startup("first paint")
+        report = window.startup_report()
+        window.log_console(f"[STARTUP] {report}")
+        if args.profile_startup:
+            print("[STARTUP] " + report.replace(" | ", "\n[STARTUP] "))
+    QtCore.QTimer.singleShot(0, report_startup)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -152,7 +152,7 @@ uint8_t masterMac[6];
 bool hasMasterMac = false;
 bool telemetryEnabled = false;
 unsigned long lastTelemetryTime = 0;
-const unsigned long TELEMETRY_INTERVAL = 100; // 100 ms interval (10 Hz)
+const unsigned long TELEMETRY_INTERVAL = 20; // 20 ms interval (50 Hz, GUI keeps ring-buffered history)
 
 // ============================================================
 // Data Structures for ESP-NOW (Match exactly with master)
@@ -173,6 +173,75 @@ typedef struct telemetry_struct {
   float pitch;
 } telemetry_struct;
 
+// Sequenced Master -> Slave Command (host "#<seq> " prefix): acknowledged with "ACK <seq>" once applied
+typedef struct seq_cmd_struct {
+  cmd_struct cmd;
+  uint32_t seq;
+} seq_cmd_struct;
+
+// Recently applied sequenced commands: a host retransmission (same seq, same contents) is only ACKed again.
+// Sequenced streaming can cycle the main ring in well under SEQ_DEDUP_WINDOW_MS, so commands that must not run
+// twice (RESET, gait upload and playback steps) get a ring of their own that streaming never overwrites
+#define SEQ_DEDUP_SLOTS 32
+#define SEQ_STATEFUL_SLOTS 16
+#define SEQ_DEDUP_WINDOW_MS 5000
+
+struct SeqRecord {
+  uint32_t seq;
+  cmd_struct cmd;
+  unsigned long appliedAt;
+};
+
+SeqRecord recentSeqs[SEQ_DEDUP_SLOTS];
+int recentSeqNext = 0;
+SeqRecord statefulSeqs[SEQ_STATEFUL_SLOTS];
+int statefulSeqNext = 0;
+
+// ============================================================
+// Gait Table Player (tables compiled and uploaded by Controller_GUI/rollopod_gaittable.py)
+// Upload: GAIT_BEGIN <bytes>, table_chunk_struct slices (each ACKed), GAIT_COMMIT <crc32>
+// Layout (little-endian): "GT", version, channels N, keyframes F (u16), loop_start (u16),
+// loop_count (u16, 0 = forever), flags (bit 0 = loop), reserved, then N x (channel, min u16,
+// span u16) in 0.1 deg, then F x (duration_ms u16, N x q u8): angle = (min + span * q / 255) / 10
+// Keyframe k moves linearly to k + 1 over its duration; a looping table's last keyframe moves
+// back to loop_start. GAIT_PLAY <speed %> plays it from the start, GAIT_STOP holds the servos.
+// ============================================================
+#define GAIT_TABLE_MAX 4096
+#define GAIT_TABLE_VERSION 1
+#define GAIT_HEADER_SIZE 12
+#define GAIT_CHANNEL_SIZE 5
+#define GAIT_FLAG_LOOP 0x01
+#define GAIT_TICK_MS 10
+#define TABLE_CHUNK_MAX 192
+
+typedef struct table_chunk_struct {
+  char tag[4];            // "GTBL"
+  uint16_t offset;
+  uint8_t length;
+  uint8_t reserved;
+  uint32_t seq;
+  uint8_t data[TABLE_CHUNK_MAX];
+} table_chunk_struct;
+
+table_chunk_struct myChunk;
+uint8_t gaitTable[GAIT_TABLE_MAX];
+uint16_t gaitUploadSize = 0;   // Announced by GAIT_BEGIN; 0 = no upload in progress
+uint32_t gaitChunkMask = 0;    // One bit per TABLE_CHUNK_MAX slice received
+bool gaitLoaded = false;
+uint16_t gaitTableSize = 0;
+uint32_t gaitCrc = 0;
+uint8_t gaitChannels = 0;
+uint16_t gaitFrames = 0;
+uint16_t gaitLoopStart = 0;
+uint16_t gaitLoopCount = 0;
+bool gaitLoop = false;
+uint32_t gaitIntroMs = 0;
+uint32_t gaitLoopMs = 0;
+volatile bool gaitPlaying = false;
+int gaitSpeedPct = 100;
+float gaitClockMs = 0.0;
+unsigned long gaitLastTick = 0;
+
 cmd_struct myCmd;
 telemetry_struct myData;
 
@@ -196,6 +265,11 @@ void initESPNow();
 void onDataRecv(const esp_now_recv_info *recvInfo, const uint8_t *data,
                 int len);
 void sendResponse(const char *response, const uint8_t *mac_addr);
+void sendAck(uint32_t seq, const uint8_t *mac_addr);
+bool isDuplicateSeq(uint32_t seq, const cmd_struct *cmd);
+bool findSeq(const SeqRecord *records, int count, uint32_t seq, const cmd_struct *cmd);
+bool isStatefulCommand(const cmd_struct *cmd);
+void rememberSeq(uint32_t seq, const cmd_struct *cmd);
 void printMacAddress();
 
 void setServoPWM(uint8_t channel, uint16_t tickValue);
@@ -215,6 +289,11 @@ void updateMPU();
 void setMotorSpeed(int speed);
 void setTorque(int state);
 void sendTelemetry();
+void receiveTableChunk(const uint8_t *data, const uint8_t *senderMac);
+const char *commitGaitTable(uint32_t crc);
+void sendGaitStatus(const uint8_t *senderMac);
+bool playGaitFrame();
+uint32_t crc32Ieee(const uint8_t *data, int len);
 
 void setup() {
   // Initialize LED_BUILTIN pin
@@ -305,6 +384,19 @@ void loop() {
     sendTelemetry();
   }
 
+  // Local gait playback: the scaled clock advances with real time, servos follow the table
+  if (gaitPlaying && millis() - gaitLastTick >= GAIT_TICK_MS) {
+    unsigned long now = millis();
+    gaitClockMs += (now - gaitLastTick) * gaitSpeedPct / 100.0f;
+    gaitLastTick = now;
+    if (playGaitFrame()) {
+      gaitPlaying = false;
+      if (hasMasterMac) {
+        sendResponse("GAIT DONE", masterMac);
+      }
+    }
+  }
+
   // Non-blocking Slave LED state machine update
   updateSlaveLed();
 
@@ -350,9 +442,24 @@ void onDataRecv(const uint8_t *srcMac, const uint8_t *data, int len) {
                   masterMac[4], masterMac[5]);
   }
 
+  // Gait table slices are told apart from commands by size and tag
+  if (len == sizeof(table_chunk_struct) && memcmp(data, "GTBL", 4) == 0) {
+    receiveTableChunk(data, srcMac);
+    return;
+  }
+
   // Expect structured data packets per RNT strategy
-  if (len == sizeof(cmd_struct)) {
+  if (len == sizeof(cmd_struct) || len == sizeof(seq_cmd_struct)) {
     memcpy(&myCmd, data, sizeof(myCmd));
+    uint32_t seq = 0;
+    if (len == sizeof(seq_cmd_struct)) {
+      memcpy(&seq, data + offsetof(seq_cmd_struct, seq), sizeof(seq));
+    }
+    if (seq != 0 && isDuplicateSeq(seq, &myCmd)) {
+      // Retransmission of a command already applied: our ACK was lost, so just ACK again
+      sendAck(seq, srcMac);
+      return;
+    }
     String cmdStr = String(myCmd.command);
 
     // Only trigger fast-blink burst for explicit user commands, not 2Hz
@@ -363,7 +470,8 @@ void onDataRecv(const uint8_t *srcMac, const uint8_t *data, int len) {
 
     // Reconstruct string to reuse our robust processCommand logic
     if (cmdStr == "MOTOR" || cmdStr == "TORQUE" || cmdStr == "FREQ" ||
-        cmdStr == "GET_CAL" || cmdStr == "TELEMETRY") {
+        cmdStr == "GET_CAL" || cmdStr == "TELEMETRY" || cmdStr == "GAIT_BEGIN" ||
+        cmdStr == "GAIT_COMMIT" || cmdStr == "GAIT_PLAY") {
       cmdStr += " " + String(myCmd.val1);
     } else if (cmdStr == "ANGLE" || cmdStr == "CAL_ALL") {
       cmdStr += " " + String(myCmd.val1) + " " + String(myCmd.val3, 1);
@@ -379,8 +487,70 @@ void onDataRecv(const uint8_t *srcMac, const uint8_t *data, int len) {
     Serial.println(cmdStr);
 
     // Process command
+    if (seq != 0) {
+      rememberSeq(seq, &myCmd);
+    }
     processCommand(cmdStr, srcMac);
+    if (seq != 0) {
+      sendAck(seq, srcMac);
+    }
+  }
+}
+
+bool isDuplicateSeq(uint32_t seq, const cmd_struct *cmd) {
+  return findSeq(recentSeqs, SEQ_DEDUP_SLOTS, seq, cmd) ||
+         findSeq(statefulSeqs, SEQ_STATEFUL_SLOTS, seq, cmd);
+}
+
+bool findSeq(const SeqRecord *records, int count, uint32_t seq, const cmd_struct *cmd) {
+  unsigned long now = millis();
+  for (int i = 0; i < count; i++) {
+    const SeqRecord &rec = records[i];
+    if (rec.seq == seq && now - rec.appliedAt < SEQ_DEDUP_WINDOW_MS &&
+        memcmp(&rec.cmd, cmd, sizeof(cmd_struct)) == 0) {
+      return true;
+    }
+  }
+  return false;
+}
+
+// Commands whose repetition changes state (a second GAIT_BEGIN clears the slices already received)
+bool isStatefulCommand(const cmd_struct *cmd) {
+  static const char *const names[] = {"RESET", "RESET_MPU", "GAIT_BEGIN", "GAIT_COMMIT", "GAIT_PLAY", "GAIT_STOP"};
+  for (size_t i = 0; i < sizeof(names) / sizeof(names[0]); i++) {
+    if (strncmp(cmd->command, names[i], sizeof(cmd->command)) == 0) {
+      return true;
+    }
   }
+  return false;
+}
+
+void rememberSeq(uint32_t seq, const cmd_struct *cmd) {
+  bool stateful = isStatefulCommand(cmd);
+  SeqRecord &rec = stateful ? statefulSeqs[statefulSeqNext] : recentSeqs[recentSeqNext];
+  rec.seq = seq;
+  rec.cmd = *cmd;
+  rec.appliedAt = millis();
+  if (stateful) {
+    statefulSeqNext = (statefulSeqNext + 1) % SEQ_STATEFUL_SLOTS;
+  } else {
+    recentSeqNext = (recentSeqNext + 1) % SEQ_DEDUP_SLOTS;
+  }
+}
+
+// Acknowledge a sequenced command after it has been applied (host measures the round trip)
+void sendAck(uint32_t seq, const uint8_t *mac_addr) {
+  // Commands without a text reply (TICK) may arrive before sendResponse() has added the master as a peer
+  esp_now_peer_info_t peerInfo = {};
+  memcpy(peerInfo.peer_addr, mac_addr, 6);
+  peerInfo.channel = 0;
+  peerInfo.encrypt = false;
+  esp_now_add_peer(&peerInfo);
+
+  memset(&myData, 0, sizeof(myData));
+  strcpy(myData.type, "ACK");
+  snprintf(myData.message, sizeof(myData.message), "ACK %lu", (unsigned long)seq);
+  esp_now_send(mac_addr, (uint8_t *)&myData, sizeof(myData));
 }
 
 // Send response back to master via ESP-NOW using struct
@@ -571,6 +741,9 @@ void processCommand(String command, const uint8_t *senderMac) {
 
   // RESET command
   else if (command == "RESET") {
+    gaitPlaying = false;
+    gaitLoaded = false;
+    gaitUploadSize = 0;
     resetToDefaults();
     sendResponse("OK: Reset to default configuration\n", senderMac);
     printInfo(senderMac);
@@ -640,6 +813,60 @@ void processCommand(String command, const uint8_t *senderMac) {
     }
   }
 
+  // GAIT_BEGIN command: "GAIT_BEGIN <bytes>" starts a table upload (stops playback)
+  else if (command.startsWith("GAIT_BEGIN ")) {
+    int size = command.substring(11).toInt();
+    if (size > 0 && size <= GAIT_TABLE_MAX) {
+      gaitPlaying = false;
+      gaitLoaded = false;
+      gaitChunkMask = 0;
+      gaitUploadSize = size;
+      sprintf(responseBuffer, "OK: Gait upload started (%d bytes)\n", size);
+      sendResponse(responseBuffer, senderMac);
+    } else {
+      sprintf(responseBuffer, "GAIT ERROR Table must be 1-%d bytes\n", GAIT_TABLE_MAX);
+      sendResponse(responseBuffer, senderMac);
+    }
+  }
+
+  // GAIT_COMMIT command: "GAIT_COMMIT <crc32 as int32>" verifies and loads the uploaded table
+  else if (command.startsWith("GAIT_COMMIT ")) {
+    const char *error = commitGaitTable((uint32_t)command.substring(12).toInt());
+    if (error) {
+      sprintf(responseBuffer, "GAIT ERROR %s\n", error);
+      sendResponse(responseBuffer, senderMac);
+    } else {
+      sendGaitStatus(senderMac);
+    }
+  }
+
+  // GAIT_PLAY command: "GAIT_PLAY <speed %>" plays the loaded table from its start
+  else if (command.startsWith("GAIT_PLAY ")) {
+    if (!gaitLoaded) {
+      sendResponse("GAIT ERROR No gait table loaded\n", senderMac);
+    } else {
+      int speed = command.substring(10).toInt();
+      gaitSpeedPct = (speed > 0 && speed <= 1000) ? speed : 100;
+      gaitClockMs = 0.0;
+      gaitLastTick = millis();
+      playGaitFrame();
+      gaitPlaying = true;
+      sprintf(responseBuffer, "OK: Gait playing at %d%%\n", gaitSpeedPct);
+      sendResponse(responseBuffer, senderMac);
+    }
+  }
+
+  // GAIT_STOP command: servos hold where playback left them
+  else if (command == "GAIT_STOP") {
+    gaitPlaying = false;
+    sendResponse("OK: Gait stopped\n", senderMac);
+  }
+
+  // GAIT_INFO command
+  else if (command == "GAIT_INFO") {
+    sendGaitStatus(senderMac);
+  }
+
   // INFO command
   else if (command == "INFO") {
     printInfo(senderMac);
@@ -887,3 +1114,159 @@ void sendTelemetry() {
 
   esp_now_send(masterMac, (uint8_t *)&myData, sizeof(myData));
 }
+
+// ==================== Gait Table Player ====================
+
+static uint16_t readU16(const uint8_t *p) { return p[0] | ((uint16_t)p[1] << 8); }
+
+static const uint8_t *gaitFramePtr(uint16_t frame) {
+  return gaitTable + GAIT_HEADER_SIZE + GAIT_CHANNEL_SIZE * gaitChannels +
+         (uint32_t)frame * (2 + gaitChannels);
+}
+
+// Store one uploaded slice; slices are idempotent, so a retransmission is simply written again
+void receiveTableChunk(const uint8_t *data, const uint8_t *senderMac) {
+  memcpy(&myChunk, data, sizeof(myChunk));
+  if (gaitUploadSize == 0 || myChunk.offset % TABLE_CHUNK_MAX != 0 ||
+      myChunk.length > TABLE_CHUNK_MAX ||
+      myChunk.offset + myChunk.length > gaitUploadSize) {
+    sendResponse("GAIT ERROR Chunk outside the announced table\n", senderMac);
+  } else {
+    memcpy(gaitTable + myChunk.offset, myChunk.data, myChunk.length);
+    gaitChunkMask |= 1UL << (myChunk.offset / TABLE_CHUNK_MAX);
+  }
+  if (myChunk.seq != 0) {
+    sendAck(myChunk.seq, senderMac);
+  }
+}
+
+// Check the assembled upload and load it; returns an error message or NULL
+const char *commitGaitTable(uint32_t crc) {
+  if (gaitUploadSize == 0) {
+    return "No upload in progress";
+  }
+  uint16_t size = gaitUploadSize;
+  int chunks = (size + TABLE_CHUNK_MAX - 1) / TABLE_CHUNK_MAX;
+  uint32_t allChunks = (chunks >= 32) ? 0xFFFFFFFFUL : ((1UL << chunks) - 1);
+  if ((gaitChunkMask & allChunks) != allChunks) {
+    return "Missing chunks";
+  }
+  if (crc32Ieee(gaitTable, size) != crc) {
+    return "CRC mismatch";
+  }
+  if (size < GAIT_HEADER_SIZE || gaitTable[0] != 'G' || gaitTable[1] != 'T') {
+    return "Not a gait table";
+  }
+  if (gaitTable[2] != GAIT_TABLE_VERSION) {
+    return "Unsupported gait table version";
+  }
+  uint8_t channels = gaitTable[3];
+  uint16_t frames = readU16(&gaitTable[4]);
+  uint16_t loopStart = readU16(&gaitTable[6]);
+  if ((uint32_t)GAIT_HEADER_SIZE + GAIT_CHANNEL_SIZE * channels + (uint32_t)frames * (2 + channels) != size) {
+    return "Table size does not match its header";
+  }
+  if (frames == 0 || loopStart >= frames) {
+    return "Table has no frames or loop_start is out of range";
+  }
+  for (int i = 0; i < channels; i++) {
+    if (gaitTable[GAIT_HEADER_SIZE + GAIT_CHANNEL_SIZE * i] >= 16) {
+      return "Channel out of range";
+    }
+  }
+
+  gaitChannels = channels;
+  gaitFrames = frames;
+  gaitLoopStart = loopStart;
+  gaitLoopCount = readU16(&gaitTable[8]);
+  gaitLoop = (gaitTable[10] & GAIT_FLAG_LOOP) != 0;
+  gaitIntroMs = 0;
+  gaitLoopMs = 0;
+  for (uint16_t k = 0; k < frames; k++) {
+    uint16_t duration = readU16(gaitFramePtr(k));
+    if (k < loopStart) {
+      gaitIntroMs += duration;
+    } else {
+      gaitLoopMs += duration;
+    }
+  }
+  gaitTableSize = size;
+  gaitCrc = crc;
+  gaitUploadSize = 0;
+  gaitLoaded = true;
+  return NULL;
+}
+
+void sendGaitStatus(const uint8_t *senderMac) {
+  char buffer[64];
+  if (!gaitLoaded) {
+    sendResponse("GAIT EMPTY\n", senderMac);
+    return;
+  }
+  snprintf(buffer, sizeof(buffer), "GAIT READY %08lX %u %u%s\n", (unsigned long)gaitCrc, gaitFrames,
+           gaitTableSize, gaitPlaying ? " PLAYING" : "");
+  sendResponse(buffer, senderMac);
+}
+
+// Drive every table channel for the current clock; returns true once a finite table has finished
+// (same arithmetic as GaitTableInterpreter in rollopod_gaittable.py)
+bool playGaitFrame() {
+  uint32_t t = (uint32_t)gaitClockMs;
+  uint16_t last = gaitFrames - 1;
+  uint16_t frame = 0;
+  bool hold = false;      // Sit on frame without interpolating
+  bool finished = false;
+
+  if (gaitLoop && t >= gaitIntroMs) {
+    frame = gaitLoopStart;
+    if (gaitLoopMs == 0) {
+      hold = true;
+    } else {
+      uint32_t passes = (t - gaitIntroMs) / gaitLoopMs;
+      t = (t - gaitIntroMs) % gaitLoopMs;
+      if (gaitLoopCount && passes >= gaitLoopCount) {
+        hold = true;
+        finished = true;
+      }
+    }
+  }
+  if (!hold) {
+    while (frame < last && t >= readU16(gaitFramePtr(frame))) {
+      t -= readU16(gaitFramePtr(frame));
+      frame++;
+    }
+    if (frame == last && !gaitLoop) {
+      hold = true;
+      finished = true;
+    }
+  }
+  uint16_t next = hold ? frame : (frame == last ? gaitLoopStart : frame + 1);
+  if (hold) {
+    t = 0;
+  }
+
+  const uint8_t *f0 = gaitFramePtr(frame);
+  const uint8_t *f1 = gaitFramePtr(next);
+  uint16_t duration = readU16(f0);
+  for (int i = 0; i < gaitChannels; i++) {
+    const uint8_t *ch = gaitTable + GAIT_HEADER_SIZE + GAIT_CHANNEL_SIZE * i;
+    float q = f0[2 + i];
+    if (duration) {
+      q += ((int)f1[2 + i] - (int)f0[2 + i]) * (float)t / duration;
+    }
+    setServoAngle(ch[0], (readU16(&ch[1]) + readU16(&ch[3]) * q / 255.0f) / 10.0f);
+  }
+  return finished;
+}
+
+// CRC-32 (IEEE 802.3, as zlib.crc32 on the host)
+uint32_t crc32Ieee(const uint8_t *data, int len) {
+  uint32_t crc = 0xFFFFFFFF;
+  for (int i = 0; i < len; i++) {
+    crc ^= data[i];
+    for (int bit = 0; bit < 8; bit++) {
+      crc = (crc & 1) ? (crc >> 1) ^ 0xEDB88320 : (crc >> 1);
+    }
+  }
+  return ~crc;
+}
@@ -70,12 +70,53 @@ typedef struct telemetry_struct {
   float pitch;
 } telemetry_struct;
 
+// Sequenced Master -> Slave Command (host "#<seq> " prefix, PROTO_VERSION 3+): the slave answers "ACK <seq>"
+typedef struct seq_cmd_struct {
+  cmd_struct cmd;
+  uint32_t seq;
+} seq_cmd_struct;
+
+// Gait Table Chunk (TABLE_CHUNK frames, PROTO_VERSION 5+): one slice of a compiled gait table, ACKed under seq
+#define TABLE_CHUNK_MAX 192
+typedef struct table_chunk_struct {
+  char tag[4];            // "GTBL": tells the slave this is not a cmd_struct
+  uint16_t offset;
+  uint8_t length;
+  uint8_t reserved;
+  uint32_t seq;
+  uint8_t data[TABLE_CHUNK_MAX];
+} table_chunk_struct;
+
 cmd_struct myCmd;
+seq_cmd_struct mySeqCmd;
+table_chunk_struct myChunk;
 telemetry_struct myData;
 
 // Command buffer for receiving Serial data
 String serialBuffer = "";
 
+// ============================================================
+// Binary ANGLE_BATCH / TICK_BATCH Frame Protocol (see Controller_GUI/rollopod_protocol.py)
+// [0xA5 0x5A] [LEN] [TYPE] [COUNT] [COUNT x (ADDR, VALUE LE)] [CRC16 BE]
+// VALUE = angle x10 (ANGLE_BATCH) or host-calibrated PCA9685 tick (TICK_BATCH, v2+)
+// SEQ_ANGLE_BATCH / SEQ_TICK_BATCH (v4+) add a SEQ (uint16 LE) after each VALUE: every channel
+// goes out as a sequenced command, so the host can retransmit final pose frames until ACKed
+// TABLE_CHUNK (v5+): [COUNT = data bytes] [ADDR] [OFFSET LE] [SEQ LE] [DATA], relayed as one table_chunk_struct
+// ============================================================
+#define FRAME_SOF0 0xA5
+#define FRAME_SOF1 0x5A
+#define FRAME_TYPE_ANGLE_BATCH 0x01
+#define FRAME_TYPE_TICK_BATCH 0x02
+#define FRAME_TYPE_SEQ_ANGLE_BATCH 0x03
+#define FRAME_TYPE_SEQ_TICK_BATCH 0x04
+#define FRAME_TYPE_TABLE_CHUNK 0x05
+#define FRAME_TIMEOUT_MS 50
+#define PROTO_VERSION 5
+
+uint8_t frameBuffer[3 + 255 + 2];
+int framePos = 0;
+unsigned long frameStartTime = 0;
+
 // Status tracking
 bool espnowInitialized = false;
 bool leftPeerAdded = false;
@@ -137,6 +178,10 @@ void initESPNow();
 void onDataSent(const wifi_tx_info_t *info, esp_now_send_status_t status);
 void onDataRecv(const esp_now_recv_info *recvInfo, const uint8_t *data, int len);
 void sendCommandToSlave(String command);
+void handleFrameByte(uint8_t b);
+void processBatchFrame(const uint8_t *payload, int len);
+void processTableChunk(const uint8_t *payload, int len);
+uint16_t crc16Ccitt(const uint8_t *data, int len);
 void printMacAddress(const uint8_t *mac);
 bool isMacValid(const uint8_t *mac);
 
@@ -181,9 +226,19 @@ void setup() {
 
 void loop() {
   // Handle Serial input from PC
+  if (framePos > 0 && millis() - frameStartTime > FRAME_TIMEOUT_MS) {
+    framePos = 0; // Drop truncated binary frame
+  }
+
   while (Serial.available() > 0) {
     char c = Serial.read();
 
+    // Binary frames start with 0xA5, which never appears in text commands
+    if (framePos > 0 || ((uint8_t)c == FRAME_SOF0 && serialBuffer.length() == 0)) {
+      handleFrameByte((uint8_t)c);
+      continue;
+    }
+
     if (c == '\n') {
       serialBuffer.trim();
 
@@ -216,7 +271,14 @@ void loop() {
           Serial.println("  R ANGLE 1 180              - Set Right Slave CH 1 to 180 deg");
           Serial.println("  B TORQUE 1                 - Turn ON 12V Power on BOTH Slaves");
           Serial.println("  GET_MAC                    - Show MACs and Connection Status");
+          Serial.println("  PROTO?                     - Query binary frame protocol support");
+          Serial.println("  #<seq> <cmd>               - Sequenced command, each slave replies 'ACK <seq>'");
+          Serial.println("  B GAIT_PLAY 100            - Play the uploaded gait tables at 100% speed");
+          Serial.println("  B GAIT_STOP / L GAIT_INFO  - Stop gait playback / show the loaded table");
           Serial.println("========================================================\n");
+        } else if (serialBuffer.equalsIgnoreCase("PROTO?")) {
+          // Protocol handshake: advertise binary ANGLE_BATCH / TICK_BATCH frame support
+          Serial.printf("PROTO BIN %d\n", PROTO_VERSION);
         } else if (serialBuffer.equalsIgnoreCase("PING")) {
           Serial.println("Bridge OK - pinging both Left & Right slaves...");
           sendCommandToSlave("B INFO");
@@ -344,7 +406,8 @@ void onDataRecv(const uint8_t *srcMac, const uint8_t *incomingData, int len) {
     if (strcmp(myData.type, "MPU") == 0) {
       Serial.printf("%s MPU_DATA %.2f\n", tag, myData.pitch);
     } 
-    else if (strcmp(myData.type, "OK") == 0 || strcmp(myData.type, "ERROR") == 0 || strcmp(myData.type, "INFO") == 0) {
+    else if (strcmp(myData.type, "OK") == 0 || strcmp(myData.type, "ERROR") == 0 || strcmp(myData.type, "INFO") == 0 ||
+             strcmp(myData.type, "ACK") == 0) {
       Serial.printf("%s %s\n", tag, myData.message);
     }
   }
@@ -360,6 +423,16 @@ void sendCommandToSlave(String command) {
   command.trim();
   char targetBoard = 'B'; // Default: Both Slaves
 
+  // Optional host sequence number ("#<seq> L MOTOR 120"): carried to the slave, which acknowledges it
+  uint32_t seq = 0;
+  if (command.startsWith("#")) {
+    int sp = command.indexOf(' ');
+    if (sp == -1) return;
+    seq = command.substring(1, sp).toInt();
+    command = command.substring(sp + 1);
+    command.trim();
+  }
+
   // Parse board target prefix (e.g., "L ANGLE 0 90", "L_ANGLE 0 90", "R ANGLE...", "B TORQUE...")
   if (command.startsWith("L ") || command.startsWith("L_")) {
     targetBoard = 'L';
@@ -385,7 +458,8 @@ void sendCommandToSlave(String command) {
   if (spaceIndex1 != -1) {
     cmd = command.substring(0, spaceIndex1);
     
-    if (cmd == "MOTOR" || cmd == "TORQUE" || cmd == "FREQ" || cmd == "TELEMETRY" || cmd == "GET_CAL") {
+    if (cmd == "MOTOR" || cmd == "TORQUE" || cmd == "FREQ" || cmd == "TELEMETRY" || cmd == "GET_CAL" ||
+        cmd == "GAIT_BEGIN" || cmd == "GAIT_COMMIT" || cmd == "GAIT_PLAY") {
       myCmd.val1 = command.substring(spaceIndex1 + 1).toInt();
     }
     else if (cmd == "ANGLE") {
@@ -411,13 +485,143 @@ void sendCommandToSlave(String command) {
   
   strncpy(myCmd.command, cmd.c_str(), sizeof(myCmd.command) - 1);
 
+  // Unsequenced commands keep the plain cmd_struct size, so older slaves still accept them
+  const uint8_t *packet = (const uint8_t *) &myCmd;
+  size_t packetLen = sizeof(myCmd);
+  if (seq != 0) {
+    mySeqCmd.cmd = myCmd;
+    mySeqCmd.seq = seq;
+    packet = (const uint8_t *) &mySeqCmd;
+    packetLen = sizeof(mySeqCmd);
+  }
+
   // Send packet to target board(s)
   if ((targetBoard == 'L' || targetBoard == 'B') && leftPeerAdded) {
-    esp_now_send(LEFT_SLAVE_MAC, (uint8_t *) &myCmd, sizeof(myCmd));
+    esp_now_send(LEFT_SLAVE_MAC, packet, packetLen);
   }
   if ((targetBoard == 'R' || targetBoard == 'B') && rightPeerAdded) {
-    esp_now_send(RIGHT_SLAVE_MAC, (uint8_t *) &myCmd, sizeof(myCmd));
+    esp_now_send(RIGHT_SLAVE_MAC, packet, packetLen);
+  }
+}
+
+// Feed one byte into the binary frame state machine
+void handleFrameByte(uint8_t b) {
+  if (framePos == 0) {
+    frameStartTime = millis();
+  }
+  frameBuffer[framePos++] = b;
+
+  if (framePos == 2 && b != FRAME_SOF1) {
+    framePos = 0;
+    return;
+  }
+  if (framePos < 3) {
+    return;
+  }
+
+  int payloadLen = frameBuffer[2];
+  int totalLen = 3 + payloadLen + 2;
+  if (framePos < totalLen) {
+    return;
+  }
+
+  uint16_t crcRx = ((uint16_t)frameBuffer[totalLen - 2] << 8) | frameBuffer[totalLen - 1];
+  if (crc16Ccitt(&frameBuffer[2], payloadLen + 1) == crcRx) {
+    processBatchFrame(&frameBuffer[3], payloadLen);
+  } else {
+    Serial.println("[FRAME ERR] CRC mismatch - frame dropped");
+  }
+  framePos = 0;
+}
+
+// Expand an (optionally sequenced) ANGLE_BATCH / TICK_BATCH frame into ANGLE / TICK cmd_structs for the addressed slaves
+void processBatchFrame(const uint8_t *payload, int len) {
+  if (!espnowInitialized || len < 2) {
+    return;
+  }
+  uint8_t frameType = payload[0];
+  if (frameType == FRAME_TYPE_TABLE_CHUNK) {
+    processTableChunk(payload, len);
+    return;
+  }
+  bool isTick = frameType == FRAME_TYPE_TICK_BATCH || frameType == FRAME_TYPE_SEQ_TICK_BATCH;
+  bool isSeq = frameType == FRAME_TYPE_SEQ_ANGLE_BATCH || frameType == FRAME_TYPE_SEQ_TICK_BATCH;
+  if (!isTick && !isSeq && frameType != FRAME_TYPE_ANGLE_BATCH) {
+    Serial.println("[FRAME ERR] Unknown frame type - frame dropped");
+    return;
+  }
+  int stride = isSeq ? 5 : 3;
+  int count = payload[1];
+  if (len != 2 + stride * count) {
+    Serial.println("[FRAME ERR] Payload length mismatch - frame dropped");
+    return;
+  }
+
+  for (int i = 0; i < count; i++) {
+    const uint8_t *pair = &payload[2 + stride * i];
+    bool isRight = (pair[0] & 0x80) != 0;
+    uint16_t value = pair[1] | ((uint16_t)pair[2] << 8);
+
+    memset(&myCmd, 0, sizeof(myCmd));
+    myCmd.val1 = pair[0] & 0x0F;
+    if (isTick) {
+      // Pre-resolved on the host: the slave writes the tick straight to the PCA9685
+      strncpy(myCmd.command, "TICK", sizeof(myCmd.command) - 1);
+      myCmd.val2 = value;
+    } else {
+      strncpy(myCmd.command, "ANGLE", sizeof(myCmd.command) - 1);
+      myCmd.val3 = value / 10.0f;
+    }
+
+    const uint8_t *packet = (const uint8_t *) &myCmd;
+    size_t packetLen = sizeof(myCmd);
+    if (isSeq) {
+      mySeqCmd.cmd = myCmd;
+      mySeqCmd.seq = pair[3] | ((uint16_t)pair[4] << 8);
+      packet = (const uint8_t *) &mySeqCmd;
+      packetLen = sizeof(mySeqCmd);
+    }
+
+    if (isRight && rightPeerAdded) {
+      esp_now_send(RIGHT_SLAVE_MAC, packet, packetLen);
+    } else if (!isRight && leftPeerAdded) {
+      esp_now_send(LEFT_SLAVE_MAC, packet, packetLen);
+    }
+  }
+}
+
+// Relay one gait table chunk to the addressed slave; the slave buffers it and ACKs the seq
+void processTableChunk(const uint8_t *payload, int len) {
+  int count = payload[1];
+  if (len != 7 + count || count > TABLE_CHUNK_MAX) {
+    Serial.println("[FRAME ERR] Payload length mismatch - frame dropped");
+    return;
+  }
+  bool isRight = (payload[2] & 0x80) != 0;
+  memset(&myChunk, 0, sizeof(myChunk));
+  memcpy(myChunk.tag, "GTBL", 4);
+  myChunk.offset = payload[3] | ((uint16_t)payload[4] << 8);
+  myChunk.length = count;
+  myChunk.seq = payload[5] | ((uint16_t)payload[6] << 8);
+  memcpy(myChunk.data, &payload[7], count);
+
+  if (isRight && rightPeerAdded) {
+    esp_now_send(RIGHT_SLAVE_MAC, (const uint8_t *) &myChunk, sizeof(myChunk));
+  } else if (!isRight && leftPeerAdded) {
+    esp_now_send(LEFT_SLAVE_MAC, (const uint8_t *) &myChunk, sizeof(myChunk));
+  }
+}
+
+// CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)
+uint16_t crc16Ccitt(const uint8_t *data, int len) {
+  uint16_t crc = 0xFFFF;
+  for (int i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : (crc << 1);
+    }
   }
+  return crc;
 }
 
 // Print MAC address formatted